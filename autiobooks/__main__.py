@@ -7,9 +7,13 @@ if getattr(sys, 'frozen', False):
     sys.path.insert(0, str(bundle_dir))
 
 # CLI subcommands trigger headless mode; no args or unknown args launch the GUI.
-_CLI_COMMANDS = {'convert', 'list-chapters', 'list-voices'}
+_CLI_COMMANDS = {'convert', 'list-chapters', 'list-voices', 'cache'}
 
 if __name__ == "__main__":
+    # Chapter-parallel TTS uses spawn-context worker processes; frozen
+    # builds must hand control to the child bootstrap before doing anything.
+    import multiprocessing
+    multiprocessing.freeze_support()
     if len(sys.argv) > 1 and sys.argv[1] in _CLI_COMMANDS:
         from autiobooks.cli import main as cli_main
         cli_main()
@@ -5,7 +5,6 @@ import platform
 import time
 import importlib.metadata
 import threading
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Optional
 from PIL import Image, ImageTk
@@ -14,8 +13,10 @@ from .engine import get_gpu_acceleration_available, gen_audio_segments
 from .engine import set_gpu_acceleration, convert_text_to_wav_file
 from .engine import create_m4b, encode_chapter_to_m4a
 from .engine import concat_audio_files, unlink_with_retry
-from .engine import convert_chapters_to_wav
-from .engine import safe_stem, chapter_wav_name
+from .engine import convert_chapters_to_wav, EncodePool, encode_worker_count
+from .engine import (safe_stem, chapter_wav_name, chapter_segment_dir,
+                     clear_segment_checkpoints, synthesis_settings_key,
+                     chapter_unit_wav_names)
 from .runtime import ensure_cuda
 from .epub_parser import (
     get_book, get_book_cached, get_title, get_author, get_cover_image,
@@ -30,7 +31,7 @@ from .dialogs import (
 )
 from .batch_window import show_batch_window as _show_batch_window_impl
 from .chapter_tree import ChapterTreeView
-from .pdf_parser import get_pdf_book
+from .pdf_parser import get_pdf_book_cached
 from .text_processing import normalize_text
 from .config import load_config, save_config
 import pygame.mixer
@@ -386,6 +387,13 @@ def start_gui():
     pref_auto_select = tk.BooleanVar(value=True)
     pref_mark_duplicates = tk.BooleanVar(value=True)
     pref_auto_acronyms = tk.BooleanVar(value=False)
+    pref_encode_workers = tk.IntVar(value=0)
+
+    def get_encode_workers():
+        try:
+            return max(0, pref_encode_workers.get())
+        except tk.TclError:
+            return 0
 
     def show_preferences():
         _show_preferences_impl(
@@ -397,6 +405,7 @@ def start_gui():
                 'auto_select': pref_auto_select,
                 'mark_duplicates': pref_mark_duplicates,
                 'auto_acronyms': pref_auto_acronyms,
+                'encode_workers': pref_encode_workers,
             },
             apply_theme=apply_theme,
             save_current_config=lambda: save_config(get_current_config()),
@@ -509,6 +518,10 @@ def start_gui():
         pref_mark_duplicates.set(config['mark_duplicates'])
     if 'auto_acronyms' in config:
         pref_auto_acronyms.set(config['auto_acronyms'])
+    try:
+        pref_encode_workers.set(max(0, int(config.get('encode_workers', 0))))
+    except (TypeError, ValueError):
+        pass
 
     def get_current_config():
         return {
@@ -532,6 +545,7 @@ def start_gui():
             'auto_select': pref_auto_select.get(),
             'mark_duplicates': pref_mark_duplicates.get(),
             'auto_acronyms': pref_auto_acronyms.get(),
+            'encode_workers': get_encode_workers(),
         }
 
     def on_close():
@@ -558,6 +572,7 @@ def start_gui():
                 'heteronyms': pref_heteronyms,
                 'contractions': pref_contractions,
                 'gpu_acceleration': gpu_acceleration,
+                'encode_workers': pref_encode_workers,
             },
             get_substitutions=lambda: word_substitutions,
             get_phoneme_overrides=lambda: phoneme_overrides,
@@ -754,7 +769,7 @@ def start_gui():
         is_pdf = file_path.lower().endswith('.pdf')
 
         if is_pdf:
-            book, chapters_from_book, book_cover = get_pdf_book(
+            book, chapters_from_book, book_cover = get_pdf_book_cached(
                 file_path, True)
         else:
             book, chapters_from_book, book_cover = get_book_cached(
@@ -851,7 +866,8 @@ def start_gui():
             all_chapter_wav_files = []
             all_chapter_m4a_files = []
             encode_futures = {}  # wav_filename -> (Future, m4a_filename)
-            encode_executor = ThreadPoolExecutor(max_workers=1)
+            encode_executor = EncodePool(
+                encode_worker_count(get_encode_workers()))
             conversion_success = False
             try:
                 chapters_selected = [chapter
@@ -961,8 +977,12 @@ def start_gui():
                         text = f"{title} by {creator}.\n{text}"
                     chapter_texts.append(text)
 
+                settings_key = synthesis_settings_key(
+                    voice, speed, chapter_gap, word_substitutions,
+                    pref_heteronyms.get(), pref_contractions.get(),
+                    phoneme_overrides, pref_auto_acronyms.get())
                 all_chapter_wav_files = [
-                    chapter_wav_name(safe, t, wav_dir)
+                    chapter_wav_name(safe, t, wav_dir, settings_key)
                     for t in chapter_texts
                 ]
                 all_chapter_m4a_files = [
@@ -989,6 +1009,8 @@ def start_gui():
                     on_chapter_error=on_chapter_error)
                 wav_files = result['wav_files']
                 encode_futures = result['encode_futures']
+                all_chapter_wav_files += result['part_wav_files']
+                all_chapter_m4a_files += result['part_enc_files']
 
                 if result['cancelled']:
                     set_status("Cancelled")
@@ -1015,7 +1037,7 @@ def start_gui():
                     converted_titles = []
                     for i, chapter in enumerate(chapters_selected):
                         wav_name = chapter_wav_name(
-                            safe, chapter_texts[i], wav_dir)
+                            safe, chapter_texts[i], wav_dir, settings_key)
                         if wav_name in wav_files:
                             if chapter_titles is not None:
                                 converted_titles.append(chapter_titles[i])
@@ -1028,11 +1050,13 @@ def start_gui():
                                converted_titles or None,
                                progress_callback=assembly_progress,
                                preencoded=True,
+                               known_durations=result['durations'],
                                bitrate=bitrate_combo.get(),
                                vbr=use_vbr.get())
                 else:
                     concat_audio_files(encoded_files, output_path,
-                                       progress_callback=assembly_progress)
+                                       progress_callback=assembly_progress,
+                                       known_durations=result['durations'])
                 set_status("Conversion complete")
                 conversion_success = True
             except Exception as e:
@@ -1095,7 +1119,9 @@ def start_gui():
         # chapter_texts that run_conversion will build so the hash-based
         # wav filenames line up — otherwise the resume prompt would look
         # at the wrong paths and miss cached audio.
-        resume = False
+        # With nothing to resume, resume=True just lets the conversion
+        # pick chapters up from the shared audio cache.
+        resume = True
         filename = Path(file_path).name
         wav_dir = Path(file_path).parent
         resume_stem = safe_stem(Path(filename).stem, wav_dir)
@@ -1107,24 +1133,39 @@ def start_gui():
             if _i == 1 and read_title_author_bool.get():
                 _text = f"{title_override} by {author_override}.\n{_text}"
             resume_chapter_texts.append(_text)
-        existing_wavs = [
-            chapter_wav_name(resume_stem, t, wav_dir)
-            for t in resume_chapter_texts
-            if Path(chapter_wav_name(resume_stem, t, wav_dir)).exists()
+        # Long chapters are synthesized in parts, each with its own wav;
+        # a chapter counts as resumable when any of them exists. A unit
+        # that was interrupted part-way has segment checkpoints but no wav
+        # yet; it counts too.
+        try:
+            resume_gap = float(gap_entry.get())
+        except ValueError:
+            resume_gap = 0.0
+        resume_units = chapter_unit_wav_names(
+            resume_stem, resume_chapter_texts, wav_dir, voice, speed,
+            resume_gap, word_substitutions, pref_heteronyms.get(),
+            pref_contractions.get(), phoneme_overrides,
+            pref_auto_acronyms.get())
+        existing_units = [
+            [wav for wav in wavs
+             if Path(wav).exists() or Path(chapter_segment_dir(wav)).exists()]
+            for wavs in resume_units
         ]
+        existing_wavs = [wav for wavs in existing_units for wav in wavs]
         if existing_wavs:
             answer = messagebox.askyesnocancel(
                 "Previous conversion found",
-                f"{len(existing_wavs)} chapter(s) already converted.\n\n"
+                f"{sum(1 for wavs in existing_units if wavs)} chapter(s) "
+                "already converted.\n\n"
                 "Yes = Resume (skip converted chapters)\n"
                 "No = Start fresh (reconvert all)")
             if answer is None:
                 return  # Cancel
-            if answer:
-                resume = True
-            else:
+            if not answer:
+                resume = False
                 for wav in existing_wavs:
                     Path(wav).unlink(missing_ok=True)
+                    clear_segment_checkpoints(wav)
 
         speed_entry.configure(state='disabled')
         voice_combo.configure(state='disabled')
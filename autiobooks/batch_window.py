@@ -3,18 +3,20 @@ import threading
 import time
 import traceback
 import tkinter as tk
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from tkinter import filedialog, font as tkfont, messagebox, ttk
 
 from .engine import (
     _INTERMEDIATE_EXTS,
     chapter_wav_name,
+    EncodePool,
     concat_audio_files,
     convert_chapters_to_wav,
     create_m4b,
+    encode_worker_count,
     safe_stem,
     set_gpu_acceleration,
+    synthesis_settings_key,
     unlink_with_retry,
 )
 from .epub_parser import get_cover_image
@@ -40,7 +42,8 @@ def show_batch_window(
     batch_queue: shared mutable list of BatchJob objects.
     initial_dir: default output directory string.
     prevent_sleep: context manager that inhibits OS sleep during run.
-    prefs: dict with tk BooleanVars — 'heteronyms', 'contractions'.
+    prefs: dict with tk BooleanVars — 'heteronyms', 'contractions' — and
+        optionally 'gpu_acceleration' and the IntVar 'encode_workers'.
     get_substitutions: callable returning the current word substitutions list.
     get_phoneme_overrides: callable returning the current phoneme override list.
     get_auto_acronyms: callable returning the current auto-acronym bool.
@@ -251,6 +254,11 @@ def show_batch_window(
     ttk.Button(dir_frame, text='Browse',
                command=browse_dir).pack(side=tk.LEFT, padx=3)
 
+    encode_workers_var = prefs.get('encode_workers') or tk.IntVar(value=0)
+    tk.Label(dir_frame, text="Encoders:").pack(side=tk.LEFT, padx=(10, 0))
+    ttk.Spinbox(dir_frame, from_=0, to=32, width=4,
+                textvariable=encode_workers_var).pack(side=tk.LEFT, padx=3)
+
     prog_frame = tk.Frame(bw)
     prog_frame.pack(fill=tk.X, padx=10, pady=5)
     batch_progress = ttk.Progressbar(prog_frame, orient='horizontal',
@@ -289,6 +297,12 @@ def show_batch_window(
             except tk.TclError:
                 user_gpu_pref = None
 
+        try:
+            encode_workers = encode_worker_count(
+                max(0, encode_workers_var.get()))
+        except tk.TclError:
+            encode_workers = encode_worker_count(0)
+
         def run():
             def _restore_buttons():
                 if not bw.winfo_exists():
@@ -417,7 +431,18 @@ def show_batch_window(
                             text = f"{title} by {creator}.\n{text}"
                         chapter_texts.append(text)
 
-                    all_wav = [chapter_wav_name(stem, t, wav_dir)
+                    substitutions = get_substitutions()
+                    phoneme_overrides = (get_phoneme_overrides()
+                                         if get_phoneme_overrides else None)
+                    auto_acronyms = (get_auto_acronyms()
+                                     if get_auto_acronyms else False)
+                    settings_key = synthesis_settings_key(
+                        voice, speed_val, chapter_gap, substitutions,
+                        prefs['heteronyms'].get(),
+                        prefs['contractions'].get(),
+                        phoneme_overrides, auto_acronyms)
+                    all_wav = [chapter_wav_name(stem, t, wav_dir,
+                                                settings_key)
                                for t in chapter_texts]
 
                     def _eta_str():
@@ -466,7 +491,7 @@ def show_batch_window(
                         eta_state['words_done'] += word_counts[i - 1]
                         eta_state['current_step'] += 1
 
-                    encode_executor = ThreadPoolExecutor(max_workers=1)
+                    encode_executor = EncodePool(encode_workers)
                     result = convert_chapters_to_wav(
                         chapter_texts, voice, speed_val, wav_dir,
                         stem, encode_executor,
@@ -474,11 +499,9 @@ def show_batch_window(
                         bitrate=job.bitrate,
                         vbr=job.vbr,
                         chapter_gap=chapter_gap,
-                        substitutions=get_substitutions(),
-                        phoneme_overrides=(get_phoneme_overrides()
-                                           if get_phoneme_overrides else None),
-                        auto_acronyms=(get_auto_acronyms()
-                                       if get_auto_acronyms else False),
+                        substitutions=substitutions,
+                        phoneme_overrides=phoneme_overrides,
+                        auto_acronyms=auto_acronyms,
                         heteronyms=prefs['heteronyms'].get(),
                         contractions=prefs['contractions'].get(),
                         resume=True,
@@ -491,9 +514,13 @@ def show_batch_window(
                     encode_futures = result['encode_futures']
                     # Replace the pre-computed guess with the real enc paths
                     # the engine actually produced (handles format mismatch
-                    # and partial conversions).
+                    # and partial conversions). Split chapters' parts are
+                    # listed separately.
                     all_enc = [enc_name
-                               for _, enc_name in encode_futures.values()]
+                               for _, enc_name in encode_futures.values()
+                               if isinstance(enc_name, str)]
+                    all_enc += result['part_enc_files']
+                    all_wav += result['part_wav_files']
 
                     if result['cancelled']:
                         job.status = "Cancelled"
@@ -519,7 +546,7 @@ def show_batch_window(
                     converted_titles = []
                     for ci, ch in enumerate(selected_chapters):
                         wn = chapter_wav_name(
-                            stem, chapter_texts[ci], wav_dir)
+                            stem, chapter_texts[ci], wav_dir, settings_key)
                         if (wn in wav_files
                                 and chapter_titles is not None):
                             converted_titles.append(
@@ -541,12 +568,14 @@ def show_batch_window(
                             converted_titles or None,
                             progress_callback=assembly_prog,
                             preencoded=True,
+                            known_durations=result['durations'],
                             bitrate=job.bitrate,
                             vbr=job.vbr)
                     else:
                         concat_audio_files(
                             enc_files, output_path,
-                            progress_callback=assembly_prog)
+                            progress_callback=assembly_prog,
+                            known_durations=result['durations'])
 
                     job.status = "Done"
                     jobs_completed += 1
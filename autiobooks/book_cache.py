@@ -0,0 +1,224 @@
+"""On-disk cache of parsed books.
+
+Extracting the chapters of a long EPUB or PDF takes seconds to minutes, and
+used to be repeated by every CLI run, batch job and GUI start. This cache
+keeps the result of each parse under `~/.autiobooks/cache/books`: chapter
+texts, titles, word counts and duplicate hashes, book metadata, and the
+cover as both full-size bytes and a GUI thumbnail.
+
+An entry is named by the book's content hash and the parser's version, and
+records the file's size and mtime. The content hash itself is remembered
+per path in a small index keyed by (size, mtime), so an unchanged book is
+only hashed once and a cache hit costs a stat, a read and a decompress.
+Bumping a parser's PARSER_VERSION orphans its old entries, which then age
+out.
+
+Entries are one file each: a fixed header, zlib-compressed JSON, then the
+raw cover and thumbnail bytes. The cache is bounded by a byte budget
+(config key `book_cache_max_mb`) and evicts least-recently-used entries
+first; an entry's mtime is its last-used time.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+import zlib
+
+from . import cache
+from .cache import CACHE_DIR
+from .config import load_config
+
+
+BOOK_CACHE_DIR = CACHE_DIR / 'books'
+INDEX_NAME = 'index.json'
+
+DEFAULT_MAX_MB = 512
+INDEX_MAX_ENTRIES = 2000
+
+_MAGIC = b'ABBK'
+_FORMAT_VERSION = 1
+# magic, format version, JSON length, cover length, thumbnail length
+_HEADER = struct.Struct('=4sIIII')
+_ENTRY_EXT = '.book'
+
+_lock = threading.Lock()
+
+
+def cache_budget_bytes(config=None):
+    """Return the configured book cache budget in bytes (0 disables it)."""
+    if config is None:
+        config = load_config()
+    return cache.budget_bytes('book_cache_max_mb', DEFAULT_MAX_MB, config)
+
+
+def content_hash(text):
+    """Hash of a chapter's text for duplicate detection (as the CLI and
+    chapter tree compute it: the stripped text)."""
+    return hashlib.md5(text.strip().encode('utf-8')).hexdigest()
+
+
+def chapter_record(file_name, title, text):
+    """Return the cached form of one chapter."""
+    return {
+        'file_name': file_name,
+        'title': title,
+        'text': text,
+        'words': len(text.split()),
+        'hash': content_hash(text),
+    }
+
+
+def file_digest(path):
+    """Return the hex content hash of the file at `path`."""
+    h = hashlib.blake2b(digest_size=20)
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _load_index():
+    try:
+        return json.loads(
+            (BOOK_CACHE_DIR / INDEX_NAME).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(index):
+    path = BOOK_CACHE_DIR / INDEX_NAME
+    if len(index) > INDEX_MAX_ENTRIES:
+        # Oldest first: dicts keep insertion order and updates re-insert.
+        index = dict(list(index.items())[-INDEX_MAX_ENTRIES:])
+    try:
+        BOOK_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp.write_text(json.dumps(index), encoding='utf-8')
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _source_key(path):
+    """Return (size, mtime_ns, digest) for the book at `path`, reusing the
+    indexed digest when size and mtime are unchanged."""
+    st = os.stat(path)
+    key = os.path.abspath(path)
+    with _lock:
+        known = _load_index().get(key)
+    if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+        return st.st_size, st.st_mtime_ns, known[2]
+    digest = file_digest(path)
+    with _lock:
+        index = _load_index()
+        index.pop(key, None)
+        index[key] = [st.st_size, st.st_mtime_ns, digest]
+        _save_index(index)
+    return st.st_size, st.st_mtime_ns, digest
+
+
+def _entry_path(digest, parser):
+    return BOOK_CACHE_DIR / digest[:2] / f'{digest}-{parser}{_ENTRY_EXT}'
+
+
+def _encode(record):
+    cover = record.pop('cover', None) or b''
+    thumbnail = record.pop('thumbnail', None) or b''
+    body = zlib.compress(
+        json.dumps(record, ensure_ascii=False,
+                   separators=(',', ':')).encode('utf-8'))
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, len(body), len(cover),
+                          len(thumbnail))
+    return header + body + cover + thumbnail
+
+
+def _decode(raw):
+    magic, version, body_len, cover_len, thumb_len = _HEADER.unpack_from(raw)
+    if magic != _MAGIC or version != _FORMAT_VERSION:
+        raise ValueError('not a book cache entry')
+    pos = _HEADER.size
+    if len(raw) != pos + body_len + cover_len + thumb_len:
+        raise ValueError('truncated book cache entry')
+    record = json.loads(zlib.decompress(raw[pos:pos + body_len]))
+    pos += body_len
+    record['cover'] = raw[pos:pos + cover_len] or None
+    pos += cover_len
+    record['thumbnail'] = raw[pos:pos + thumb_len] or None
+    return record
+
+
+def load(path, parser):
+    """Return the cached record for the book at `path` as parsed by
+    `parser` (a name plus version, e.g. 'epub3'), or None on a miss.
+
+    The record is the dict given to store(), with 'cover' and 'thumbnail'
+    as bytes or None.
+    """
+    if not cache_budget_bytes():
+        return None
+    try:
+        size, mtime_ns, digest = _source_key(path)
+        entry = _entry_path(digest, parser)
+        record = _decode(entry.read_bytes())
+    except (OSError, ValueError, struct.error, zlib.error):
+        return None
+    if record.get('size') != size or record.get('digest') != digest:
+        return None
+    try:
+        os.utime(entry)
+    except OSError:
+        pass
+    return record
+
+
+def store(path, parser, record):
+    """Cache `record` (a JSON-serializable dict, plus optional 'cover' and
+    'thumbnail' bytes) for the book at `path`. Failures are non-fatal."""
+    budget = cache_budget_bytes()
+    if not budget:
+        return
+    try:
+        size, mtime_ns, digest = _source_key(path)
+        record = dict(record, size=size, mtime_ns=mtime_ns, digest=digest)
+        entry = _entry_path(digest, parser)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        tmp = entry.with_name(f'{entry.name}.{os.getpid()}.part')
+        tmp.write_bytes(_encode(record))
+        os.replace(tmp, entry)
+    except (OSError, TypeError, ValueError):
+        return
+    prune(budget)
+
+
+def _iter_entries():
+    """Yield (path, size, mtime) for every cache entry."""
+    return cache.iter_entries(BOOK_CACHE_DIR, _ENTRY_EXT)
+
+
+def stats():
+    """Return {'entries', 'bytes', 'budget'} for the book cache."""
+    entries = list(_iter_entries())
+    return {
+        'entries': len(entries),
+        'bytes': sum(size for _, size, _ in entries),
+        'budget': cache_budget_bytes(),
+    }
+
+
+def prune(max_bytes=None, max_age_days=None):
+    """Evict least-recently-used entries until the cache fits `max_bytes`
+    (default: the configured budget). With `max_age_days`, entries unused
+    for longer than that are evicted regardless of size.
+
+    Returns (entries_removed, bytes_freed).
+    """
+    if max_bytes is None:
+        max_bytes = cache_budget_bytes()
+    return cache.prune_entries(_iter_entries(), max_bytes, max_age_days)
+
+
+def clear():
+    """Remove every cached book. Returns (entries_removed, bytes_freed)."""
+    return prune(max_bytes=0)
@@ -0,0 +1,210 @@
+"""Central content-addressed cache of synthesized chapter audio.
+
+Chapter audio is stored under `~/.autiobooks/cache/audio`, named by a hash
+of everything that determines what it sounds like: the chapter text, the
+voice and speed, the text-normalization settings and the engine version
+(see engine.synthesis_settings_key). Re-converting a book with unchanged
+settings, from any directory, then only has to copy the audio back out.
+
+Encoded chapters live alongside, keyed by a hash of the wav they were
+encoded from plus the encoder settings (see file_key), so a re-run whose
+audio is unchanged (a resume, or new chapter titles or cover) reuses them
+and only has to remux.
+
+The cache is bounded by a byte budget (config key `cache_max_mb`) and
+evicts least-recently-used entries first. An entry's mtime is its
+last-used time: it is refreshed on every hit.
+"""
+
+import hashlib
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from .config import CONFIG_DIR, load_config
+
+
+CACHE_DIR = CONFIG_DIR / 'cache'
+AUDIO_CACHE_DIR = CACHE_DIR / 'audio'
+
+DEFAULT_MAX_MB = 10 * 1024
+
+
+def budget_bytes(config_key, default_mb, config=None):
+    """Return the byte budget configured under `config_key` (in MB,
+    `default_mb` when unset or invalid; 0 disables the cache)."""
+    if config is None:
+        config = load_config()
+    try:
+        max_mb = float(config.get(config_key, default_mb))
+    except (TypeError, ValueError):
+        max_mb = default_mb
+    return max(0, int(max_mb * 1024 * 1024))
+
+
+def cache_budget_bytes(config=None):
+    """Return the configured cache budget in bytes (0 disables the cache)."""
+    return budget_bytes('cache_max_mb', DEFAULT_MAX_MB, config)
+
+
+def file_key(path, *params):
+    """Return a cache key for the contents of the file at `path` together
+    with `params` (e.g. the settings it is about to be encoded with)."""
+    h = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    h.update('\0'.join(map(str, params)).encode('utf-8'))
+    return h.hexdigest()
+
+
+def _entry_path(key, ext):
+    # Two-character fan-out keeps any one directory small.
+    return AUDIO_CACHE_DIR / key[:2] / f'{key}{ext}'
+
+
+def _link_or_copy(src, dst):
+    """Hard-link src to dst (atomically), falling back to a copy.
+
+    Hard links cost no extra disk, so a chapter that is both in the cache
+    and next to the book only takes its space once. The temporary name is
+    unique to this process and thread, so concurrent stores or fetches of
+    the same entry never share (or delete) each other's partial file.
+    """
+    dst = Path(dst)
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(
+        f'{dst.name}.{os.getpid()}.{threading.get_ident()}.part')
+    try:
+        tmp.unlink(missing_ok=True)
+        try:
+            os.link(src, tmp)
+        except OSError:
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+        # rename() does nothing when tmp and dst are already links to the
+        # same file (a concurrent store of the same entry won the race).
+        tmp.unlink(missing_ok=True)
+    except OSError:
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
+
+
+def contains(key, ext):
+    """Whether cache entry `key` exists."""
+    return _entry_path(key, ext).exists()
+
+
+def fetch(key, ext, dest):
+    """Materialize cache entry `key` at `dest`. Returns True on a hit."""
+    entry = _entry_path(key, ext)
+    if not entry.exists():
+        return False
+    try:
+        _link_or_copy(entry, dest)
+        os.utime(entry)
+    except OSError:
+        return False
+    return True
+
+
+def store(key, ext, src):
+    """Add `src` to the cache as `key`. Failures are non-fatal."""
+    entry = _entry_path(key, ext)
+    try:
+        if entry.exists():
+            os.utime(entry)
+        else:
+            _link_or_copy(src, entry)
+    except OSError:
+        pass
+
+
+def iter_entries(root, ext=None):
+    """Yield (path, size, mtime) for every entry of the fanned-out cache
+    directory `root`, skipping in-progress writes. With `ext`, only files
+    ending in it count as entries."""
+    if not root.exists():
+        return
+    for sub in root.iterdir():
+        if not sub.is_dir():
+            continue
+        for entry in sub.iterdir():
+            if ext is not None:
+                if not entry.name.endswith(ext):
+                    continue
+            elif entry.name.endswith('.part'):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            yield entry, st.st_size, st.st_mtime
+
+
+def prune_entries(entries, max_bytes, max_age_days=None):
+    """Evict least-recently-used `entries` ((path, size, mtime) tuples)
+    until they fit `max_bytes`. With `max_age_days`, entries unused for
+    longer than that are evicted regardless of size.
+
+    Returns (entries_removed, bytes_freed).
+    """
+    entries = sorted(entries, key=lambda e: e[2])
+    total = sum(size for _, size, _ in entries)
+    cutoff = (time.time() - max_age_days * 86400
+              if max_age_days is not None else None)
+    removed = freed = 0
+    for path, size, mtime in entries:
+        if total <= max_bytes and (cutoff is None or mtime >= cutoff):
+            # Oldest-first: once one entry survives both limits, the rest
+            # (newer, with the total already under budget) do too.
+            break
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+        freed += size
+    return removed, freed
+
+
+def _iter_entries():
+    """Yield (path, size, mtime) for every cache entry."""
+    return iter_entries(AUDIO_CACHE_DIR)
+
+
+def stats():
+    """Return {'entries', 'bytes', 'budget', 'oldest', 'newest'} for the
+    cache (the timestamps are None when it is empty)."""
+    entries = list(_iter_entries())
+    mtimes = [m for _, _, m in entries]
+    return {
+        'entries': len(entries),
+        'bytes': sum(size for _, size, _ in entries),
+        'budget': cache_budget_bytes(),
+        'oldest': min(mtimes) if mtimes else None,
+        'newest': max(mtimes) if mtimes else None,
+    }
+
+
+def prune(max_bytes=None, max_age_days=None):
+    """Evict least-recently-used entries until the cache fits `max_bytes`
+    (default: the configured budget). With `max_age_days`, entries unused
+    for longer than that are evicted regardless of size.
+
+    Returns (entries_removed, bytes_freed).
+    """
+    if max_bytes is None:
+        max_bytes = cache_budget_bytes()
+    return prune_entries(_iter_entries(), max_bytes, max_age_days)
+
+
+def clear():
+    """Remove every cache entry. Returns (entries_removed, bytes_freed)."""
+    return prune(max_bytes=0)
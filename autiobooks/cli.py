@@ -5,7 +5,6 @@ import hashlib
 import sys
 import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # Suppress third-party warnings (same as GUI)
@@ -71,15 +70,26 @@ def _content_hash(text):
     return hashlib.md5(text.encode('utf-8')).hexdigest()
 
 
+def _chapter_hash(ch):
+    """_content_hash of a chapter's stripped text, as recorded by the book
+    loader when it has it."""
+    h = getattr(ch, 'content_hash', None)
+    return h if h is not None else _content_hash(ch.extracted_text.strip())
+
+
+def _word_count(ch):
+    count = getattr(ch, 'word_count', None)
+    return count if count is not None else len(ch.extracted_text.split())
+
+
 def _auto_select_chapters(chapters):
     """Return list of 0-based indices for non-empty, non-duplicate chapters."""
     selected = []
     seen_hashes = set()
     for i, ch in enumerate(chapters):
-        text = ch.extracted_text.strip()
-        if not text:
+        if not ch.extracted_text.strip():
             continue
-        h = _content_hash(text)
+        h = _chapter_hash(ch)
         if h in seen_hashes:
             continue
         seen_hashes.add(h)
@@ -93,10 +103,9 @@ def _find_duplicates(chapters):
     seen = {}
     duplicates = {}
     for i, ch in enumerate(chapters):
-        text = ch.extracted_text.strip()
-        if not text:
+        if not ch.extracted_text.strip():
             continue
-        h = _content_hash(text)
+        h = _chapter_hash(ch)
         if h in seen:
             duplicates[i] = seen[h] + 1  # 1-based
         else:
@@ -104,16 +113,23 @@ def _find_duplicates(chapters):
     return duplicates
 
 
-def _load_book(input_path):
-    """Load an epub or PDF file. Returns (book, chapters, cover_image, is_pdf)."""
+def _load_book(input_path, lazy=False):
+    """Load an epub or PDF file. Returns (book, chapters, cover_image, is_pdf).
+
+    With `lazy`, PDF chapters extract their text only when it is read (see
+    get_pdf_book).
+    """
     path_lower = input_path.lower()
     if path_lower.endswith('.pdf'):
-        from .pdf_parser import get_pdf_book
-        book, chapters, cover_image = get_pdf_book(input_path, resized=False)
+        from .pdf_parser import get_pdf_book_cached
+        book, chapters, cover_image = get_pdf_book_cached(input_path,
+                                                          resized=False,
+                                                          lazy=lazy)
         return book, chapters, cover_image, True
     elif path_lower.endswith('.epub'):
-        from .epub_parser import get_book
-        book, chapters, cover_image = get_book(input_path, resized=False)
+        from .epub_parser import get_book_cached
+        book, chapters, cover_image = get_book_cached(input_path,
+                                                      resized=False)
         return book, chapters, cover_image, False
     else:
         _eprint(f"Error: Unsupported file format: {input_path}")
@@ -161,12 +177,21 @@ def cmd_list_chapters(args):
         _eprint(f"Error: File not found: {input_path}")
         sys.exit(1)
 
-    book, chapters, _, is_pdf = _load_book(input_path)
+    page_ranges = getattr(args, 'page_ranges', False)
+    book, chapters, _, is_pdf = _load_book(input_path, lazy=page_ranges)
 
     if not chapters:
         _eprint("No chapters found.")
         sys.exit(1)
 
+    if page_ranges and is_pdf:
+        for i, ch in enumerate(chapters):
+            first, last = ch.page_range
+            pages = f"p. {first}" if last <= first else f"pp. {first}-{last}"
+            title = getattr(ch, 'display_title', None) or ''
+            print(f"  {i + 1:>3}. [{pages:>13}] {title}")
+        return
+
     # Get titles
     if is_pdf:
         titles = [getattr(ch, 'display_title', None) for ch in chapters]
@@ -177,7 +202,7 @@ def cmd_list_chapters(args):
     duplicates = _find_duplicates(chapters)
 
     for i, ch in enumerate(chapters):
-        word_count = len(ch.extracted_text.split())
+        word_count = _word_count(ch)
         title = (titles[i] if titles and titles[i] else '') or ''
         num = i + 1
 
@@ -229,6 +254,25 @@ def cmd_convert(args):
         _eprint("Error: Speed must be between 0.5 and 2.0.")
         sys.exit(1)
 
+    workers = args.workers
+    if workers < 1:
+        _eprint("Error: --workers must be at least 1.")
+        sys.exit(1)
+    batch_size = args.batch_size
+    if batch_size < 1:
+        _eprint("Error: --batch-size must be at least 1.")
+        sys.exit(1)
+    max_chapter_words = args.max_chapter_words
+    if max_chapter_words is not None and max_chapter_words < 0:
+        _eprint("Error: --max-chapter-words cannot be negative.")
+        sys.exit(1)
+    if args.encode_workers is not None and args.encode_workers < 0:
+        _eprint("Error: --encode-workers cannot be negative.")
+        sys.exit(1)
+    if args.single_encoder and args.stream:
+        _eprint("Error: --single-encoder cannot be combined with --stream.")
+        sys.exit(1)
+
     _eprint(f"Loading {input_path}...")
     book, chapters, cover_image, is_pdf = _load_book(input_path)
 
@@ -302,23 +346,38 @@ def cmd_convert(args):
     _eprint(f"Speed:    {speed}")
     _eprint(f"Format:   {out_format}")
     _eprint(f"GPU:      {'enabled' if use_gpu else 'disabled'}")
+    if workers > 1:
+        _eprint(f"Workers:  {workers}")
     _eprint(f"Chapters: {len(chapters_selected)} selected")
     _eprint(f"Output:   {output_path}")
     _eprint("")
 
     # Conversion
-    from .engine import (convert_chapters_to_wav, create_m4b,
+    from .engine import (convert_chapters_to_wav, create_m4b, BookEncoder,
                          concat_audio_files, _INTERMEDIATE_EXTS, safe_stem,
-                         chapter_wav_name)
+                         chapter_wav_name, chapter_enc_name, EncodePool,
+                         clear_segment_checkpoints, synthesis_settings_key,
+                         encode_worker_count)
 
     wav_dir = Path(input_path).parent
     stem = safe_stem(Path(input_path).stem, wav_dir)
     enc_ext = _INTERMEDIATE_EXTS.get(out_format, '.m4a')
 
     chapter_texts = [ch.extracted_text for ch in chapters_selected]
-    all_chapter_wav_files = [
-        chapter_wav_name(stem, t, wav_dir) for t in chapter_texts
-    ]
+    settings_key = synthesis_settings_key(
+        voice, speed, chapter_gap, substitutions, heteronyms, contractions,
+        phoneme_overrides, auto_acronyms, batch_size)
+    # With --stream the encoded chapters themselves are what resume keeps.
+    if args.stream:
+        all_chapter_wav_files = [
+            chapter_enc_name(stem, t, wav_dir, enc_ext, settings_key)
+            for t in chapter_texts
+        ]
+    else:
+        all_chapter_wav_files = [
+            chapter_wav_name(stem, t, wav_dir, settings_key)
+            for t in chapter_texts
+        ]
     all_chapter_enc_files = [
         str(wav_dir / f'{stem}_chapter_{i}_enc{enc_ext}')
         for i in range(1, len(chapters_selected) + 1)
@@ -331,11 +390,19 @@ def cmd_convert(args):
                 Path(wav).unlink(missing_ok=True)
             except OSError:
                 pass
+            clear_segment_checkpoints(wav)
 
-    encode_executor = ThreadPoolExecutor(max_workers=1)
+    # The single encoder takes the chapters' wavs itself, so no chapter is
+    # encoded on its own and no pool is needed.
+    encode_executor = (None if args.single_encoder else
+                       EncodePool(encode_worker_count(args.encode_workers)))
+    book_encoder = None
     conversion_success = False
 
     try:
+        if args.single_encoder:
+            book_encoder = BookEncoder(output_path, out_format, bitrate, vbr)
+
         # ETA tracking
         word_counts = [len(ch.extracted_text.split())
                        for ch in chapters_selected]
@@ -380,40 +447,59 @@ def cmd_convert(args):
             auto_acronyms=auto_acronyms,
             heteronyms=heteronyms, contractions=contractions,
             resume=resume,
+            workers=workers,
+            batch_size=batch_size,
+            stream_encode=args.stream,
+            segment_checkpoints=args.checkpoint_segments,
+            use_cache=not args.no_cache,
+            max_chapter_words=max_chapter_words,
+            book_encoder=book_encoder,
             on_chapter_start=on_start,
             on_segment=on_segment if _verbosity >= 2 else None,
             on_chapter_done=on_done,
             on_chapter_error=on_error)
         wav_files = result['wav_files']
         encode_futures = result['encode_futures']
+        all_chapter_wav_files += result['part_wav_files']
+        all_chapter_enc_files += result['part_enc_files']
 
         if not wav_files:
             _eprint("Error: No chapters were converted.", level=0)
             sys.exit(1)
 
-        # Wait for background encoding to finish
+        # Build titles list aligned with successfully converted chapters
+        converted_titles = None
+        if chapter_titles is not None:
+            converted_titles = []
+            for i, chapter in enumerate(chapters_selected):
+                wav_name = chapter_wav_name(stem, chapter_texts[i],
+                                            wav_dir, settings_key)
+                if wav_name in wav_files:
+                    converted_titles.append(chapter_titles[i])
+            if not converted_titles:
+                converted_titles = None
+
+        # cover_image is already full-size bytes (resized=False) for
+        # both epub and PDF from _load_book
+        final_cover = cover_image
+
         _eprint(f"\nAssembling {out_format} file...")
-        encoded_files = []
-        for wav_name in wav_files:
-            future, enc_name = encode_futures[wav_name]
-            future.result()
-            encoded_files.append(enc_name)
-
-        if out_format == 'm4b':
-            # Build titles list aligned with successfully converted chapters
-            converted_titles = None
-            if chapter_titles is not None:
-                converted_titles = []
-                for i, chapter in enumerate(chapters_selected):
-                    wav_name = chapter_wav_name(stem, chapter_texts[i], wav_dir)
-                    if wav_name in wav_files:
-                        converted_titles.append(chapter_titles[i])
-                if not converted_titles:
-                    converted_titles = None
-
-            # cover_image is already full-size bytes (resized=False) for
-            # both epub and PDF from _load_book
-            final_cover = cover_image
+        if book_encoder is not None:
+            def progress_cb(pct):
+                _eprint_progress("Muxing", pct)
+
+            book_encoder.finish(title, author, starting_chapter,
+                                converted_titles, final_cover,
+                                progress_callback=progress_cb)
+            if _stderr_is_tty():
+                _eprint("")
+        elif out_format == 'm4b':
+            # Wait for background encoding to finish
+            encoded_files = []
+            for wav_name in wav_files:
+                future, enc_name = encode_futures[wav_name]
+                future.result()
+                encoded_files.append(enc_name)
 
             def progress_cb(pct):
                 _eprint_progress("Muxing", pct)
@@ -423,15 +509,23 @@ def cmd_convert(args):
                        converted_titles,
                        progress_callback=progress_cb,
                        preencoded=True,
+                       known_durations=result['durations'],
                        bitrate=bitrate, vbr=vbr)
             if _stderr_is_tty():
                 _eprint("")
         else:
+            encoded_files = []
+            for wav_name in wav_files:
+                future, enc_name = encode_futures[wav_name]
+                future.result()
+                encoded_files.append(enc_name)
+
             def progress_cb(pct):
                 _eprint_progress("Concatenating", pct)
 
             concat_audio_files(encoded_files, output_path,
-                               progress_callback=progress_cb)
+                               progress_callback=progress_cb,
+                               known_durations=result['durations'])
             if _stderr_is_tty():
                 _eprint("")
 
@@ -450,7 +544,10 @@ def cmd_convert(args):
         _eprint(f"\nConversion failed: {e}", level=0)
         sys.exit(1)
     finally:
-        encode_executor.shutdown(wait=True)
+        if encode_executor is not None:
+            encode_executor.shutdown(wait=True)
+        if book_encoder is not None:
+            book_encoder.abort()
         if conversion_success:
             # Clean up wav files on success
             for wav_file in all_chapter_wav_files:
@@ -460,6 +557,40 @@ def cmd_convert(args):
             Path(enc_file).unlink(missing_ok=True)
 
 
+def _format_bytes(n):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n < 1024 or unit == 'GB':
+            return f"{n:.0f} {unit}" if unit == 'B' else f"{n:.1f} {unit}"
+        n /= 1024
+
+
+def cmd_cache(args):
+    """Handle the 'cache' subcommand."""
+    from . import cache
+
+    if args.cache_command == 'stats':
+        st = cache.stats()
+        print(f"Location: {cache.AUDIO_CACHE_DIR}")
+        print(f"Entries:  {st['entries']}")
+        print(f"Size:     {_format_bytes(st['bytes'])} of "
+              f"{_format_bytes(st['budget'])} budget")
+        if st['oldest'] is not None:
+            def _fmt(ts):
+                return time.strftime('%Y-%m-%d %H:%M', time.localtime(ts))
+            print(f"Oldest:   {_fmt(st['oldest'])}")
+            print(f"Newest:   {_fmt(st['newest'])}")
+        return
+
+    if args.cache_command == 'prune':
+        max_bytes = (None if args.max_mb is None
+                     else max(0, int(args.max_mb * 1024 * 1024)))
+        removed, freed = cache.prune(max_bytes=max_bytes,
+                                     max_age_days=args.older_than)
+    else:
+        removed, freed = cache.clear()
+    print(f"Removed {removed} entries ({_format_bytes(freed)})")
+
+
 def build_parser():
     """Build the argparse parser for the CLI."""
     parser = argparse.ArgumentParser(
@@ -518,6 +649,45 @@ def build_parser():
     convert_parser.add_argument(
         '--no-resume', action='store_true',
         help='Re-convert all chapters even if cached WAV files exist')
+    convert_parser.add_argument(
+        '--no-cache', action='store_true',
+        help='Neither reuse nor add to the shared audio cache in '
+             '~/.autiobooks/cache')
+    convert_parser.add_argument(
+        '--workers', type=int, default=1,
+        help='Synthesize this many chapters in parallel, one TTS process '
+             'each (default: 1). Best on many-core CPUs')
+    convert_parser.add_argument(
+        '--batch-size', type=int, default=1,
+        help='Phoneme chunks per TTS forward pass (default: 1). Batched '
+             'audio is close to, not identical with, unbatched audio, and '
+             'is not faster on every machine; measure with '
+             'scripts/bench_batch_rtf.py first')
+    convert_parser.add_argument(
+        '--stream', action='store_true',
+        help='Pipe audio straight into each chapter\'s encoder while it is '
+             'generated instead of writing intermediate WAV files')
+    convert_parser.add_argument(
+        '--checkpoint-segments', action='store_true', default=None,
+        help='Save every synthesized chunk so a chapter interrupted '
+             'part-way resumes where it stopped (default: the '
+             'segment_checkpoints setting, off)')
+    convert_parser.add_argument(
+        '--encode-workers', type=int, default=None, metavar='N',
+        help='Encode this many finished chapters in parallel (default: '
+             'the encode_workers setting; 0 picks a quarter of the CPUs, '
+             'up to 4)')
+    convert_parser.add_argument(
+        '--single-encoder', action='store_true',
+        help='Encode the whole book in one ffmpeg process, fed each '
+             'chapter as it is ready, instead of one encoder per chapter '
+             'plus a final concatenation')
+    convert_parser.add_argument(
+        '--max-chapter-words', type=int, default=None, metavar='N',
+        help='Synthesize chapters longer than N words in parts, cut at '
+             'paragraph or heading boundaries, and join them back into one '
+             'chapter (default: the max_chapter_words setting, 10000; 0 '
+             'never splits)')
     verbosity = convert_parser.add_mutually_exclusive_group()
     verbosity.add_argument(
         '-q', '--quiet', action='store_true',
@@ -531,11 +701,32 @@ def build_parser():
         'list-chapters', help='List chapters in an epub/PDF file')
     chapters_parser.add_argument(
         'input', help='Path to epub or PDF file')
+    chapters_parser.add_argument(
+        '--page-ranges', action='store_true',
+        help='For PDFs, list each chapter\'s pages instead of its word '
+             'count, without extracting any text')
 
     # list-voices
     subparsers.add_parser(
         'list-voices', help='List all available TTS voices')
 
+    # cache
+    cache_parser = subparsers.add_parser(
+        'cache', help='Inspect or prune the shared audio cache')
+    cache_sub = cache_parser.add_subparsers(dest='cache_command',
+                                            required=True)
+    cache_sub.add_parser('stats', help='Show cache size and entry count')
+    prune_parser = cache_sub.add_parser(
+        'prune', help='Evict least-recently-used audio')
+    prune_parser.add_argument(
+        '--max-mb', type=float, default=None,
+        help='Shrink the cache to this many MB (default: the configured '
+             'cache_max_mb budget)')
+    prune_parser.add_argument(
+        '--older-than', type=float, default=None, metavar='DAYS',
+        help='Also evict audio not used in this many days')
+    cache_sub.add_parser('clear', help='Delete all cached audio')
+
     return parser
 
 
@@ -554,6 +745,8 @@ def main(argv=None):
         cmd_list_chapters(args)
     elif args.command == 'convert':
         cmd_convert(args)
+    elif args.command == 'cache':
+        cmd_cache(args)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,29 @@
+"""Cover image helpers shared by the EPUB and PDF parsers."""
+
+import io
+
+from PIL import Image
+
+
+def cover_thumbnail(image):
+    """Fit a cover (a PIL image, or encoded image bytes) onto the 200x300
+    gray cover the GUI shows."""
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+    else:
+        image = image.copy()
+    image.thumbnail((200, 300))
+    ratio = min(200 / image.width, 300 / image.height)
+    new_size = (int(image.width * ratio), int(image.height * ratio))
+    resized = image.resize(new_size, Image.Resampling.LANCZOS)
+    background = Image.new('RGB', (200, 300), 'gray')
+    offset = ((200 - new_size[0]) // 2, (300 - new_size[1]) // 2)
+    background.paste(resized, offset)
+    return background
+
+
+def png_bytes(image):
+    """Return a PIL image encoded as PNG."""
+    buf = io.BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
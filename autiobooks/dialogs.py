@@ -6,7 +6,8 @@ import tkinter as tk
 from pathlib import Path
 from tkinter import filedialog, messagebox, ttk
 
-from .engine import _probe_chapters, append_m4b, probe_duration
+from . import probe
+from .engine import append_m4b
 
 
 def show_append_dialog(parent):
@@ -36,8 +37,8 @@ def show_append_dialog(parent):
     def load_file_info(path, label):
         def run():
             try:
-                dur = probe_duration(path)
-                chs = _probe_chapters(path)
+                dur = probe.duration(path)
+                chs = probe.chapters(path)
                 h, m = int(dur // 3600), int((dur % 3600) // 60)
                 dur_str = f'{h}h {m}m' if h else f'{m}m'
                 text = f'{len(chs)} chapter(s) · {dur_str}'
@@ -135,14 +136,14 @@ def show_preferences(parent, prefs, apply_theme, save_current_config, add_toolti
     """Open the Preferences dialog.
 
     prefs: dict of tk variables — theme_var, heteronyms, contractions,
-    auto_select, mark_duplicates, auto_acronyms.
+    auto_select, mark_duplicates, auto_acronyms, encode_workers.
     apply_theme: callable(theme_name) that restyles the app.
     save_current_config: callable() that persists the current config.
     add_tooltip: callable(widget, text) that attaches a tooltip.
     """
     dlg = tk.Toplevel(parent)
     dlg.title('Preferences')
-    dlg.geometry('500x380')
+    dlg.geometry('500x440')
     dlg.resizable(False, False)
     dlg.grab_set()
 
@@ -189,6 +190,18 @@ def show_preferences(parent, prefs, apply_theme, save_current_config, add_toolti
                 'Detect and label chapters with identical content.\n'
                 'Duplicates are excluded from auto-select.')
 
+    if 'encode_workers' in prefs:
+        pf = ttk.LabelFrame(dlg, text='Performance', padding=10)
+        pf.pack(fill=tk.X, padx=15, pady=5)
+        tk.Label(pf, text='Parallel chapter encoders:').pack(side=tk.LEFT)
+        ttk.Spinbox(pf, from_=0, to=32, width=5,
+                    textvariable=prefs['encode_workers']).pack(
+                        side=tk.LEFT, padx=5)
+        add_tooltip(pf.winfo_children()[-1],
+                    'How many finished chapters are encoded at once.\n'
+                    '0 picks a quarter of the CPUs (up to 4), leaving\n'
+                    'the rest to speech synthesis.')
+
     def save_and_close():
         save_current_config()
         dlg.destroy()
@@ -1,12 +1,15 @@
 import hashlib
+import itertools
 import re
+import shutil
 import subprocess
 import sys
 import threading
 import time
 import warnings
+import weakref
 import json
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
 import numpy as np
 import soundfile
 import torch
@@ -14,7 +17,10 @@ import os
 from pathlib import Path
 from kokoro import KPipeline
 from tempfile import NamedTemporaryFile, TemporaryDirectory
-from .text_processing import normalize_text
+from . import cache, espeak_cache, g2p_memo, lexicon_store, probe
+from .config import load_config
+from .text_processing import (normalize_book, normalize_text,
+                              split_chapter_text)
 from .voices_lang import get_language_from_voice
 
 
@@ -83,6 +89,62 @@ def _patch_misaki_preprocess():
 
 _patch_misaki_preprocess()
 
+
+def _patch_misaki_lexicon():
+    """Make misaki.en.Lexicon read its tables from lexicon_store.
+
+    Upstream parses, grows and validates ~6 MB of JSON on every G2P
+    construction — in every worker process. The store does that once and
+    hands out mmap-backed mappings whose pages all processes share.
+    autiobooks/misaki/en.py carries the same change in-place. Any store
+    failure falls back to the upstream loader. Idempotent.
+    """
+    from misaki import en  # system install, used by Kokoro
+    if getattr(en.Lexicon.__init__, '_autiobooks_store_patch', False):
+        return
+    upstream_init = en.Lexicon.__init__
+
+    def __init__(self, british):
+        try:
+            golds, silvers = lexicon_store.open_lexicon(
+                en.data, british, en.GB_VOCAB if british else en.US_VOCAB)
+        except Exception:
+            upstream_init(self, british)
+            return
+        self.british = british
+        self.cap_stresses = (0.5, 2)
+        self.golds = golds
+        self.silvers = silvers
+
+    __init__._autiobooks_store_patch = True
+    en.Lexicon.__init__ = __init__
+
+
+_patch_misaki_lexicon()
+
+
+def _patch_misaki_word_memo():
+    """Memoize misaki.en.Lexicon word lookups (see g2p_memo). The bundled
+    autiobooks/misaki/en.py applies the same patch to itself."""
+    from misaki import en  # system install, used by Kokoro
+    g2p_memo.memoize_lexicon(en.Lexicon)
+
+
+_patch_misaki_word_memo()
+
+
+def _patch_misaki_espeak_cache():
+    """Cache misaki's espeak OOV fallback on disk (see espeak_cache). The
+    bundled autiobooks/misaki/espeak.py applies the same patch to itself."""
+    try:
+        from misaki import espeak  # needs phonemizer + espeakng_loader
+    except ImportError:
+        return
+    espeak_cache.memoize_fallback(espeak.EspeakFallback)
+
+
+_patch_misaki_espeak_cache()
+
 # Suppress torch warnings from Kokoro's model internals
 warnings.filterwarnings('ignore', message='.*dropout option adds dropout.*')
 warnings.filterwarnings('ignore', category=FutureWarning, module='torch.nn.utils.weight_norm')
@@ -100,7 +162,73 @@ else:
     _SUBPROCESS_FLAGS = {}
 
 
-def chapter_wav_name(stem, text, wav_dir):
+# Bump whenever a change to normalization or synthesis alters the audio a
+# given text produces, so chapters cached by older builds are not reused.
+AUDIO_REVISION = 1
+
+# Chapters longer than this many words are synthesized in parts (see
+# convert_chapters_to_wav); about an hour of audio.
+DEFAULT_MAX_CHAPTER_WORDS = 10000
+
+# Words of chapter text normalized per normalize_book call when
+# converting without workers: enough for spaCy to batch across short
+# chapters, little enough that cancelling never waits on a whole book.
+_NORMALIZE_BATCH_WORDS = 20000
+
+# Upper bound on chapter encoders picked automatically (encode_workers 0):
+# a quarter of the CPUs, leaving the rest to synthesis.
+MAX_AUTO_ENCODE_WORKERS = 4
+
+
+def _engine_version():
+    """Identify the code that turns text into audio, for cache keys."""
+    import importlib.metadata
+    parts = [str(AUDIO_REVISION)]
+    for dist in ('autiobooks', 'kokoro'):
+        try:
+            parts.append(importlib.metadata.version(dist))
+        except importlib.metadata.PackageNotFoundError:
+            parts.append('?')
+    return '/'.join(parts)
+
+
+def synthesis_settings_key(voice, speed, chapter_gap=0.0, substitutions=None,
+                           heteronyms=True, contractions=True,
+                           phoneme_overrides=None, auto_acronyms=False,
+                           batch_size=1):
+    """Return a hash of every setting that changes a chapter's audio.
+
+    Combined with the chapter text by chapter_wav_name and the audio cache,
+    so changing the voice, speed or any normalization option produces a
+    different file instead of silently reusing stale audio.
+
+    Batched inference is close to, not identical with, the unbatched
+    audio (see _forward_batch), so a `batch_size` over 1 is part of the
+    key; batch size 1 keeps the keys earlier runs used.
+    """
+    settings = {
+        'engine': _engine_version(),
+        'voice': voice,
+        'speed': float(speed),
+        'chapter_gap': float(chapter_gap or 0),
+        'substitutions': substitutions or [],
+        'heteronyms': bool(heteronyms),
+        'contractions': bool(contractions),
+        'phoneme_overrides': phoneme_overrides or [],
+        'auto_acronyms': bool(auto_acronyms),
+    }
+    if batch_size > 1:
+        settings['batch_size'] = int(batch_size)
+    blob = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.md5(blob.encode('utf-8')).hexdigest()
+
+
+def _chapter_hash(text, settings_key=''):
+    data = f'{settings_key}\0{text}' if settings_key else text
+    return hashlib.md5(data.encode('utf-8', errors='replace')).hexdigest()
+
+
+def chapter_wav_name(stem, text, wav_dir, settings_key=''):
     """Return the canonical resume-safe WAV path for a chapter's text.
 
     The filename embeds an 8-char MD5 prefix of the chapter text so that
@@ -108,11 +236,24 @@ def chapter_wav_name(stem, text, wav_dir):
     cause a sequential-position resume to feed one chapter's audio into
     another chapter's slot. Two chapters with identical text deliberately
     share a wav path (the audio is identical, so re-using it is correct).
+
+    Pass the synthesis_settings_key() of the run as `settings_key` so a wav
+    left over from a run with different settings is not resumed.
     """
-    h = hashlib.md5(text.encode('utf-8', errors='replace')).hexdigest()[:8]
+    h = _chapter_hash(text, settings_key)[:8]
     return str(Path(wav_dir) / f'{stem}_chapter_{h}.wav')
 
 
+def chapter_enc_name(stem, text, wav_dir, ext, settings_key=''):
+    """Return the resume-safe encoded-chapter path for streamed encoding.
+
+    Same content hash as chapter_wav_name, so a chapter encoded straight
+    from the synthesizer (no wav on disk) can be found again on resume.
+    """
+    wav_name = chapter_wav_name(stem, text, wav_dir, settings_key)
+    return wav_name[:-len('.wav')] + f'_enc{ext}'
+
+
 def safe_stem(stem, wav_dir):
     """Return a stem short enough that `{wav_dir}/{stem}_chapter_999_enc.m4a`
     fits within Windows MAX_PATH (260). On non-Windows, returns stem unchanged.
@@ -202,6 +343,61 @@ def _safe_probe_duration(file_name):
         return 0.0
 
 
+# Joining encoded chapters by stream copy (the concat demuxer with -c copy)
+# keeps each file's encoder priming and pads it out to whole codec frames,
+# so a chapter made of n samples takes up more than n samples of the joined
+# timeline. Per intermediate extension: (priming, frame length) in samples
+# at SAMPLE_RATE, for ffmpeg's aac, libmp3lame and libopus (312 samples of
+# pre-skip and 20 ms frames at Opus's 48 kHz).
+_STREAM_COPY_FRAMING = {
+    '.m4a': (1024, 1024),
+    '.mp3': (1105, 576 if SAMPLE_RATE < 32000 else 1152),
+    '.opus': (SAMPLE_RATE * 312 // 48000, SAMPLE_RATE // 50),
+}
+
+
+def _stream_copy_seconds(path, seconds):
+    """Return how long the encoded chapter `path`, made from `seconds` of
+    audio, lasts once stream-copied into a joined file."""
+    framing = _STREAM_COPY_FRAMING.get(Path(path).suffix.lower())
+    if framing is None or not seconds:
+        return seconds
+    priming, frame = framing
+    samples = round(seconds * SAMPLE_RATE)
+    return -(-(samples + priming) // frame) * frame / SAMPLE_RATE
+
+
+def _chapter_durations(parts, known_durations=None, stream_copy=False):
+    """Return each chapter's duration in seconds, given each chapter's list
+    of files.
+
+    Files in `known_durations` (path -> seconds, the manifest
+    convert_chapters_to_wav returns) are not probed: their durations were
+    counted from the samples written. The rest are probed in parallel.
+    With `stream_copy`, durations are what the files take up once joined
+    without re-encoding, priming and frame padding included (see
+    _STREAM_COPY_FRAMING).
+    """
+    known = known_durations or {}
+    files_to_probe = [f for files in parts for f in files if f not in known]
+    probe.prefetch(files_to_probe)
+    probed = {f: _safe_probe_duration(f) for f in files_to_probe}
+
+    def seconds(f):
+        d = known[f] if f in known else probed[f]
+        return _stream_copy_seconds(f, d) if stream_copy else d
+    return [sum(seconds(f) for f in files) for files in parts]
+
+
+def _wav_duration(path):
+    """Return a wav file's duration from its header, or None."""
+    try:
+        info = soundfile.info(path)
+    except Exception:
+        return None
+    return info.frames / info.samplerate
+
+
 _pipeline_cache = {}
 _pipeline_lock = threading.Lock()
 _current_device = 'cpu'
@@ -278,132 +474,412 @@ def get_pipeline(lang_code):
 
 
 def gen_audio_segments(text, voice, speed, split_pattern=r'\n+',
-                       on_segment=None):
+                       on_segment=None, batch_size=1, checkpoint_dir=None):
+    return list(iter_audio_segments(text, voice, speed, split_pattern,
+                                    on_segment, batch_size=batch_size,
+                                    checkpoint_dir=checkpoint_dir))
+
+
+def iter_audio_segments(text, voice, speed, split_pattern=r'\n+',
+                        on_segment=None, batch_size=1, checkpoint_dir=None):
+    """Yield each chunk's audio as soon as it is synthesized, in order.
+
+    Streaming counterpart of gen_audio_segments: the caller can write every
+    chunk out and drop it, so a chapter never has to sit in memory whole.
+
+    With `checkpoint_dir`, every synthesized chunk is also saved there
+    (see _save_segment) and chunks already present are loaded instead of
+    re-synthesized, so an interrupted chapter resumes where it stopped.
+    """
     # a for american or b for british etc.
     pipeline = get_pipeline(voice[0])
-    audio_segments = []
     speed = float(speed)
+    # Phonemize the chapter's out-of-vocabulary words in one espeak call
+    # up front instead of one round-trip per token during G2P.
+    espeak_cache.prefetch(getattr(pipeline, 'g2p', None), text)
+    try:
+        if batch_size > 1 or checkpoint_dir is not None:
+            yield from _iter_audio_segments_chunked(
+                pipeline, text, voice, speed, split_pattern, on_segment,
+                batch_size, checkpoint_dir)
+            return
+        count = 0
+        with torch.inference_mode():
+            for gs, ps, audio in pipeline(text, voice=voice, speed=speed,
+                                          split_pattern=split_pattern):
+                count += 1
+                if on_segment:
+                    on_segment(count)
+                yield audio
+    finally:
+        # Keep whatever the fallback resolved during G2P for next time.
+        espeak_cache.save_all()
+
+
+def chapter_segment_dir(chapter_path):
+    """Return the segment-checkpoint directory for a chapter output file."""
+    root, _ = os.path.splitext(str(chapter_path))
+    return root + '_segments'
+
+
+def clear_segment_checkpoints(chapter_path):
+    """Delete a chapter's segment checkpoints, if it has any."""
+    shutil.rmtree(chapter_segment_dir(chapter_path), ignore_errors=True)
+
+
+def _segment_key(ps, voice, speed):
+    """Checkpoint key for one chunk: its phonemes, voice and speed.
+
+    Phonemes rather than graphemes, because they are what the acoustic
+    model actually sees — a changed substitution or phoneme override that
+    alters the pronunciation must not reuse the old audio.
+    """
+    key = f'{voice}\0{float(speed)!r}\0{ps}'
+    return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+
+def _load_segment(checkpoint_dir, key):
+    """Return a checkpointed chunk's audio, or None if it is absent or
+    unreadable (an unreadable one is simply re-synthesized)."""
+    path = Path(checkpoint_dir) / f'{key}.npy'
+    if not path.exists():
+        return None
+    try:
+        return np.load(path, allow_pickle=False)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_segment(checkpoint_dir, key, audio):
+    """Atomically write one chunk's audio as float32 .npy."""
+    Path(checkpoint_dir).mkdir(parents=True, exist_ok=True)
+    path = Path(checkpoint_dir) / f'{key}.npy'
+    part_path = str(path) + '.part'
+    try:
+        with open(part_path, 'wb') as f:
+            np.save(f, np.asarray(audio, dtype=np.float32))
+        os.replace(part_path, path)
+    except OSError:
+        # A checkpoint is an optimization; losing one only costs a
+        # re-synthesis on resume.
+        try:
+            Path(part_path).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+# Kokoro's iSTFTNet decoder emits 600 samples (25 ms at 24 kHz) for every
+# predicted duration frame; used to cut a batched waveform back into
+# per-chunk pieces.
+_SAMPLES_PER_FRAME = 600
+
+# KPipeline truncates longer chunks to this many phonemes (the model's
+# context is 512 tokens including the two boundary pads).
+_MAX_PHONEMES = 510
+
+
+def _phoneme_chunks(pipeline, text, split_pattern):
+    """Yield the phoneme string of every chunk KPipeline would synthesize.
+
+    Runs only the G2P/chunking half of KPipeline.__call__ by calling it on
+    a shallow copy whose model is None — KPipeline then yields results
+    without inference. The copy shares the original's G2P, lexicon and
+    spaCy model, so this costs no extra memory.
+    """
+    import copy
+    g2p_only = copy.copy(pipeline)
+    g2p_only.model = None
+    for result in g2p_only(text, voice=None, split_pattern=split_pattern):
+        ps = result.phonemes
+        if ps:
+            yield ps[:_MAX_PHONEMES]
+
+
+# The KModel layout _forward_batch drives directly (kokoro 0.9). A model
+# missing any of these has changed shape and is run chunk by chunk.
+_BATCH_SUBMODULES = (
+    'bert', 'bert_encoder', 'text_encoder', 'decoder',
+    'predictor.text_encoder', 'predictor.lstm', 'predictor.duration_proj',
+    'predictor.shared', 'predictor.F0', 'predictor.F0_proj',
+    'predictor.N', 'predictor.N_proj',
+)
+
+# Models _forward_batch has failed on once; they are not batched again.
+_unbatchable_models = weakref.WeakSet()
+
+
+def _can_batch(model):
+    """Whether `model` still has the layout _forward_batch relies on."""
+    if model in _unbatchable_models:
+        return False
+    if not isinstance(getattr(model, 'vocab', None), dict):
+        return False
+    for path in _BATCH_SUBMODULES:
+        obj = model
+        for name in path.split('.'):
+            obj = getattr(obj, name, None)
+            if obj is None:
+                return False
+    return True
+
+
+def _forward_chunks(model, phoneme_list, ref_list, speed):
+    """Run each chunk through KModel on its own, or all of them through
+    _forward_batch when the model allows it. A batch that fails marks the
+    model unbatchable and is redone chunk by chunk, so a kokoro release
+    that reshapes KModel's internals slows synthesis down instead of
+    breaking it."""
+    if len(phoneme_list) > 1 and _can_batch(model):
+        try:
+            return _forward_batch(model, phoneme_list, ref_list, speed)
+        except (AttributeError, TypeError, ValueError, RuntimeError) as e:
+            _unbatchable_models.add(model)
+            print(f'Batched inference failed ({e}); falling back to one '
+                  'chunk at a time', file=sys.stderr)
+    return [model(ps, ref_s, speed)
+            for ps, ref_s in zip(phoneme_list, ref_list)]
+
+
+def _forward_batch(model, phoneme_list, ref_list, speed):
+    """Run Kokoro's acoustic model on several phoneme chunks in one pass.
+
+    Mirrors KModel.forward_with_tokens with a real batch dimension: chunks
+    are right-padded, the BERT/encoder stages get attention and length
+    masks, both recurrent stages run on packed sequences so padding never
+    leaks into the backward direction, and padding tokens get zero
+    duration so they own no frames in the alignment. Returns one 1-D CPU
+    tensor per chunk, in input order.
+
+    Not bit-identical to unbatched inference: the decoder's AdaIN
+    InstanceNorm layers still see each item's zero-padded frame tail.
+    Callers bucket chunks by length so that tail stays short.
+    """
+    from torch.nn.utils.rnn import pack_padded_sequence, pad_packed_sequence
+
+    device = model.device
+    ids = [[0, *(model.vocab[p] for p in ps if p in model.vocab), 0]
+           for ps in phoneme_list]
+    batch = len(ids)
+    lengths = torch.tensor([len(x) for x in ids], dtype=torch.long)
+    max_len = int(lengths.max())
+    input_ids = torch.zeros((batch, max_len), dtype=torch.long)
+    for b, row in enumerate(ids):
+        input_ids[b, :len(row)] = torch.tensor(row, dtype=torch.long)
+    input_ids = input_ids.to(device)
+    text_mask = (torch.arange(max_len).unsqueeze(0)
+                 >= lengths.unsqueeze(1)).to(device)
+    ref_s = torch.cat(ref_list).to(device)
+
+    bert_dur = model.bert(input_ids, attention_mask=(~text_mask).int())
+    d_en = model.bert_encoder(bert_dur).transpose(-1, -2)
+    s = ref_s[:, 128:]
+    d = model.predictor.text_encoder(d_en, s, lengths, text_mask)
+    packed = pack_padded_sequence(d, lengths, batch_first=True,
+                                  enforce_sorted=False)
+    x, _ = model.predictor.lstm(packed)
+    x, _ = pad_packed_sequence(x, batch_first=True, total_length=max_len)
+    duration = torch.sigmoid(model.predictor.duration_proj(x)).sum(axis=-1)
+    pred_dur = torch.round(duration / speed).clamp(min=1).long()
+    pred_dur.masked_fill_(text_mask, 0)
+
+    frames = pred_dur.sum(axis=-1).cpu()
+    max_frames = int(frames.max())
+    aln = torch.zeros((batch, max_len, max_frames), device=device)
+    for b in range(batch):
+        n = int(lengths[b])
+        idx = torch.repeat_interleave(
+            torch.arange(n, device=device), pred_dur[b, :n])
+        aln[b, idx, torch.arange(idx.shape[0], device=device)] = 1
+
+    en = d.transpose(-1, -2) @ aln
+    shared_in = pack_padded_sequence(en.transpose(-1, -2), frames,
+                                     batch_first=True, enforce_sorted=False)
+    shared, _ = model.predictor.shared(shared_in)
+    shared, _ = pad_packed_sequence(shared, batch_first=True,
+                                    total_length=max_frames)
+    f0 = shared.transpose(-1, -2)
+    for block in model.predictor.F0:
+        f0 = block(f0, s)
+    f0 = model.predictor.F0_proj(f0).squeeze(1)
+    noise = shared.transpose(-1, -2)
+    for block in model.predictor.N:
+        noise = block(noise, s)
+    noise = model.predictor.N_proj(noise).squeeze(1)
+
+    t_en = model.text_encoder(input_ids, lengths, text_mask)
+    asr = t_en @ aln
+    audio = model.decoder(asr, f0, noise, ref_s[:, :128])
+    audio = audio.reshape(batch, -1).cpu()
+    return [audio[b, :int(frames[b]) * _SAMPLES_PER_FRAME]
+            for b in range(batch)]
+
+
+# How many batches' worth of consecutive chunks are length-sorted together.
+# Wider windows pad less; narrower ones start streaming sooner and hold
+# less audio in memory.
+_BATCH_SORT_WINDOW = 8
+
+
+def _iter_audio_segments_chunked(pipeline, text, voice, speed, split_pattern,
+                                 on_segment, batch_size, checkpoint_dir=None):
+    """Chunk-at-a-time counterpart of iter_audio_segments' KPipeline loop.
+
+    Phonemizes the whole text first, then walks it in windows of
+    `batch_size * _BATCH_SORT_WINDOW` consecutive chunks. Chunks already
+    in `checkpoint_dir` are loaded; the rest of each window is sorted by
+    phoneme length so every batch pads as little as possible, run
+    `batch_size` chunks per forward pass, and yielded back in original
+    chunk order.
+    """
+    chunks = list(_phoneme_chunks(pipeline, text, split_pattern))
+    if not chunks:
+        return
+    model = pipeline.model
+    pack = pipeline.load_voice(voice).to(model.device)
+    window = batch_size * _BATCH_SORT_WINDOW
+    done = 0
     with torch.inference_mode():
-        for gs, ps, audio in pipeline(text, voice=voice, speed=speed,
-                                      split_pattern=split_pattern):
-            audio_segments.append(audio)
-            if on_segment:
-                on_segment(len(audio_segments))
-    return audio_segments
+        for w_start in range(0, len(chunks), window):
+            w_range = range(w_start, min(w_start + window, len(chunks)))
+            audio_by_chunk = {}
+            keys = {}
+            if checkpoint_dir is not None:
+                for k in w_range:
+                    keys[k] = _segment_key(chunks[k], voice, speed)
+                    audio = _load_segment(checkpoint_dir, keys[k])
+                    if audio is not None:
+                        audio_by_chunk[k] = audio
+                        done += 1
+                        if on_segment:
+                            on_segment(done)
+            order = sorted((k for k in w_range if k not in audio_by_chunk),
+                           key=lambda k: len(chunks[k]))
+            for start in range(0, len(order), batch_size):
+                group = order[start:start + batch_size]
+                audios = _forward_chunks(
+                    model, [chunks[k] for k in group],
+                    [pack[len(chunks[k]) - 1] for k in group], speed)
+                for k, audio in zip(group, audios):
+                    audio_by_chunk[k] = audio
+                    if checkpoint_dir is not None:
+                        _save_segment(checkpoint_dir, keys[k], audio)
+                done += len(group)
+                if on_segment:
+                    on_segment(done)
+            for k in w_range:
+                yield audio_by_chunk.pop(k)
 
 
 def create_m4b(chapter_files, output_path, cover_image, title, creator,
                chapter_num, chapter_titles=None, progress_callback=None,
                known_durations=None, preencoded=False, bitrate='64k', vbr=False):
+    """Mux chapter files into one m4b with a chapter marker per entry.
+
+    An entry of `chapter_files` may be a tuple of files (the parts of a
+    chapter synthesized in pieces, see convert_chapters_to_wav); they are
+    joined back into that one chapter.
+    """
+    parts = [chapter_parts(f) for f in chapter_files]
+    all_files = [f for files in parts for f in files]
     with TemporaryDirectory() as tempdir:
         # Create concat file listing chapter files
         concat_file = os.path.join(tempdir, 'concat.txt')
         with open(concat_file, 'w', encoding='utf-8') as f:
-            for chapter_file in chapter_files:
+            for chapter_file in all_files:
                 safe_path = chapter_file.replace("'", "'\\''")
                 f.write(f"file '{safe_path}'\n")
 
-        # Resolve chapter durations for timestamp metadata.
-        # When pre-encoded M4A files are provided the WAV-based durations are
-        # not usable — each M4A has an AAC encoder delay prepended that would
-        # accumulate across chapters. Always probe the M4A files in that case.
-        # For raw WAV files, use any caller-supplied durations and only probe
-        # the remainder (e.g. chapters recovered via resume).
+        # Resolve chapter durations for timestamp metadata from the
+        # caller's manifest (see convert_chapters_to_wav), probing only
+        # files it does not cover (e.g. chapters resumed as encoded files).
+        durations = _chapter_durations(parts, known_durations,
+                                       stream_copy=preencoded)
+
         if preencoded:
-            with ThreadPoolExecutor(max_workers=min(len(chapter_files), 8)) as pool:
-                durations = list(pool.map(_safe_probe_duration, chapter_files))
+            audio_codec_args = ['-c:a', 'copy']
+        elif vbr:
+            audio_codec_args = ['-c:a', 'aac', '-q:a', '2']
         else:
-            known = known_durations or {}
-            files_to_probe = [f for f in chapter_files if f not in known]
-            if files_to_probe:
-                with ThreadPoolExecutor(
-                        max_workers=min(len(files_to_probe), 8)) as pool:
-                    probed = dict(zip(files_to_probe,
-                                      pool.map(_safe_probe_duration,
-                                               files_to_probe)))
-            else:
-                probed = {}
-            durations = [
-                known[f] if f in known else probed[f]
-                for f in chapter_files
+            audio_codec_args = ['-c:a', 'aac', '-b:a', bitrate]
+        _mux_m4b(['-safe', '0', '-f', 'concat', '-i', concat_file],
+                 audio_codec_args, durations, output_path, cover_image,
+                 title, creator, chapter_num, chapter_titles,
+                 progress_callback, tempdir)
+
+
+def _mux_m4b(input_args, audio_codec_args, durations, output_path,
+             cover_image, title, creator, chapter_num, chapter_titles,
+             progress_callback, tempdir):
+    """Write the m4b at `output_path` from the audio input `input_args`,
+    with a chapter marker per entry of `durations` and the cover art."""
+    chapters_file = create_index_file(
+        title, creator, durations, chapter_num, chapter_titles,
+        output_dir=tempdir)
+
+    # FFmpeg arguments for cover image if present
+    cover_image_args = []
+    cover_image_path = None
+    try:
+        if cover_image:
+            cover_image_file = NamedTemporaryFile("wb", delete=False)
+            # Record the path before writing so cleanup runs even if the
+            # write or close raises — NamedTemporaryFile has already
+            # created the file on disk at this point.
+            cover_image_path = cover_image_file.name
+            try:
+                cover_image_file.write(cover_image)
+            finally:
+                cover_image_file.close()
+            cover_image_args = [
+                "-i", cover_image_path,
+                '-disposition:v', 'attached_pic'
             ]
 
-        chapters_file = create_index_file(
-            title, creator, durations, chapter_num, chapter_titles,
-            output_dir=tempdir)
+        total_duration_us = sum(durations) * 1_000_000
+        proc = subprocess.Popen([
+            'ffmpeg', '-y',
+            *input_args,
+            '-i', chapters_file,
+            *cover_image_args,
+            *audio_codec_args,
+            '-c:v', 'copy',
+            '-map_metadata', '1',
+            '-movflags', '+disable_chpl',
+            '-progress', 'pipe:1',
+            '-nostats',
+            output_path
+        ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace',
+           **_SUBPROCESS_FLAGS)
 
-        # FFmpeg arguments for cover image if present
-        cover_image_args = []
-        cover_image_path = None
-        try:
-            if cover_image:
-                cover_image_file = NamedTemporaryFile("wb", delete=False)
-                # Record the path before writing so cleanup runs even if the
-                # write or close raises — NamedTemporaryFile has already
-                # created the file on disk at this point.
-                cover_image_path = cover_image_file.name
+        stderr_buf = []
+        stderr_thread = threading.Thread(
+            target=_drain_stderr, args=(proc, stderr_buf))
+        stderr_thread.start()
+
+        for line in proc.stdout:
+            if progress_callback and line.startswith('out_time_ms='):
                 try:
-                    cover_image_file.write(cover_image)
-                finally:
-                    cover_image_file.close()
-                cover_image_args = [
-                    "-i", cover_image_path,
-                    '-disposition:v', 'attached_pic'
-                ]
-
-            if preencoded:
-                audio_codec_args = ['-c:a', 'copy']
-            elif vbr:
-                audio_codec_args = ['-c:a', 'aac', '-q:a', '2']
-            else:
-                audio_codec_args = ['-c:a', 'aac', '-b:a', bitrate]
-            total_duration_us = sum(durations) * 1_000_000
-            proc = subprocess.Popen([
-                'ffmpeg', '-y',
-                '-safe', '0',
-                '-f', 'concat',
-                '-i', concat_file,
-                '-i', chapters_file,
-                *cover_image_args,
-                *audio_codec_args,
-                '-c:v', 'copy',
-                '-map_metadata', '1',
-                '-movflags', '+disable_chpl',
-                '-progress', 'pipe:1',
-                '-nostats',
-                output_path
-            ], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding='utf-8', errors='replace',
-               **_SUBPROCESS_FLAGS)
-
-            stderr_buf = []
-            stderr_thread = threading.Thread(
-                target=_drain_stderr, args=(proc, stderr_buf))
-            stderr_thread.start()
-
-            for line in proc.stdout:
-                if progress_callback and line.startswith('out_time_ms='):
-                    try:
-                        us = int(line.split('=', 1)[1])
-                        if total_duration_us > 0:
-                            pct = min(100, int(us / total_duration_us * 100))
-                            progress_callback(pct)
-                    except ValueError:
-                        pass
+                    us = int(line.split('=', 1)[1])
+                    if total_duration_us > 0:
+                        pct = min(100, int(us / total_duration_us * 100))
+                        progress_callback(pct)
+                except ValueError:
+                    pass
 
-            proc.wait()
-            stderr_thread.join()
-            if proc.returncode != 0:
-                stderr_text = (stderr_buf[0] if stderr_buf else '')[-2000:]
-                raise RuntimeError(f"FFmpeg failed:\n{stderr_text}")
-        finally:
-            if cover_image_path and os.path.exists(cover_image_path):
-                for attempt in range(3):
-                    try:
-                        os.unlink(cover_image_path)
-                        break
-                    except OSError:
-                        if attempt < 2:
-                            time.sleep(0.5)
+        proc.wait()
+        stderr_thread.join()
+        if proc.returncode != 0:
+            stderr_text = (stderr_buf[0] if stderr_buf else '')[-2000:]
+            raise RuntimeError(f"FFmpeg failed:\n{stderr_text}")
+    finally:
+        if cover_image_path and os.path.exists(cover_image_path):
+            for attempt in range(3):
+                try:
+                    os.unlink(cover_image_path)
+                    break
+                except OSError:
+                    if attempt < 2:
+                        time.sleep(0.5)
 
 
 _INTERMEDIATE_EXTS = {
@@ -415,13 +891,210 @@ _INTERMEDIATE_EXTS = {
 }
 
 
+def _init_tts_worker(device, torch_threads):
+    """ProcessPoolExecutor initializer for chapter-parallel synthesis.
+
+    Runs once in each worker process. Pins the worker to the parent's torch
+    device and caps its intra-op thread pool so N workers share the machine
+    instead of each spinning up one thread per core. The worker's KPipeline
+    is built lazily by `get_pipeline` on its first chapter and stays warm
+    in that process's `_pipeline_cache` for every chapter after.
+    """
+    global _current_device
+    torch.set_num_threads(max(1, int(torch_threads)))
+    with _pipeline_lock:
+        torch.set_default_device(device)
+        _current_device = device
+
+
+def _tts_worker_chapter(text, voice, speed, out_filename, synth_kwargs,
+                       encode_args=None):
+    """Synthesize one chapter inside a worker process. Returns the duration
+    (or None when the chapter produced no audio).
+
+    With `encode_args` (out_format, bitrate, vbr) the chapter is streamed
+    straight into an encoder instead of being written as a wav.
+    """
+    if encode_args is not None:
+        return convert_text_to_encoded_file(text, voice, speed, out_filename,
+                                            *encode_args, **synth_kwargs)
+    return convert_text_to_wav_file(text, voice, speed, out_filename,
+                                    **synth_kwargs)
+
+
+def _completed_future(value):
+    """Return an already-resolved Future holding `value`."""
+    fut = Future()
+    fut.set_result(value)
+    return fut
+
+
+def _create_tts_pool(workers):
+    """Start a spawn-context process pool of `workers` TTS workers.
+
+    `spawn` rather than `fork`: torch keeps OpenMP/MKL thread pools and
+    (on GPU) a CUDA context that are not fork-safe, so a forked child can
+    deadlock on its first inference.
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_tts_worker,
+        initargs=(_current_device, threads))
+
+
+def chapter_word_budget(config=None):
+    """Return the configured word budget per synthesis unit (config key
+    `max_chapter_words`; 0 never splits a chapter)."""
+    if config is None:
+        config = load_config()
+    try:
+        return max(0, int(config.get('max_chapter_words',
+                                     DEFAULT_MAX_CHAPTER_WORDS)))
+    except (TypeError, ValueError):
+        return DEFAULT_MAX_CHAPTER_WORDS
+
+
+def encode_worker_count(requested=None, config=None):
+    """Return how many chapters to encode at once: `requested`, else the
+    `encode_workers` setting. 0 (the default) picks a quarter of the CPUs,
+    between 1 and MAX_AUTO_ENCODE_WORKERS."""
+    if requested is None:
+        if config is None:
+            config = load_config()
+        try:
+            requested = max(0, int(config.get('encode_workers', 0)))
+        except (TypeError, ValueError):
+            requested = 0
+    if requested > 0:
+        return requested
+    return max(1, min(MAX_AUTO_ENCODE_WORKERS, (os.cpu_count() or 1) // 4))
+
+
+class EncodePool(ThreadPoolExecutor):
+    """Thread pool for chapter encodes with back-pressure.
+
+    Each encode is an ffmpeg process, so `workers` bounds how many run
+    beside synthesis. submit() blocks while `max_pending` encodes (twice
+    `workers` by default) are queued or running, which holds the
+    submitting synthesis loop back instead of letting a backlog of
+    finished wavs pile up behind the encoders.
+    """
+
+    def __init__(self, workers=1, max_pending=None):
+        super().__init__(max_workers=workers, thread_name_prefix='encode')
+        self._slots = threading.BoundedSemaphore(max_pending or 2 * workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        self._slots.acquire()
+        try:
+            future = super().submit(fn, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+
+def chapter_parts(chapter_file):
+    """Return the files of one chapter as given to create_m4b: a path, or
+    a tuple of paths for a chapter synthesized in parts."""
+    if isinstance(chapter_file, (list, tuple)):
+        return list(chapter_file)
+    return [chapter_file]
+
+
+def _gather_futures(futures):
+    """Return a Future resolving to the results of `futures` in order, or
+    failing with the first of their exceptions once all are done."""
+    combined = Future()
+    lock = threading.Lock()
+
+    def _settle(_):
+        with lock:
+            if combined.done() or not all(f.done() for f in futures):
+                return
+            try:
+                combined.set_result([f.result() for f in futures])
+            except Exception as e:
+                combined.set_exception(e)
+
+    for fut in futures:
+        fut.add_done_callback(_settle)
+    return combined
+
+
+def _synthesis_units(chapter_texts, voice, speed, chapter_gap, substitutions,
+                     heteronyms, contractions, phoneme_overrides,
+                     auto_acronyms, batch_size, max_chapter_words):
+    """Split chapters into the units convert_chapters_to_wav synthesizes.
+
+    Returns (units, chapter_units). A unit is (chapter idx, part number or
+    0 for a whole chapter, text, settings key, trailing silence); parts
+    before a chapter's last one carry no gap, so they are keyed as gapless
+    audio. `chapter_units` lists each chapter's unit indices in order.
+    """
+    if max_chapter_words is None:
+        max_chapter_words = chapter_word_budget()
+    settings_key = synthesis_settings_key(
+        voice, speed, chapter_gap, substitutions, heteronyms, contractions,
+        phoneme_overrides, auto_acronyms, batch_size)
+    units = []
+    chapter_units = []
+    gapless_key = None
+    for i, text in enumerate(chapter_texts, start=1):
+        parts = split_chapter_text(text, max_chapter_words)
+        if len(parts) == 1:
+            chapter_units.append([len(units)])
+            units.append((i, 0, text, settings_key, chapter_gap))
+            continue
+        if gapless_key is None:
+            gapless_key = synthesis_settings_key(
+                voice, speed, 0.0, substitutions, heteronyms, contractions,
+                phoneme_overrides, auto_acronyms, batch_size)
+        chapter_units.append(list(range(len(units),
+                                        len(units) + len(parts))))
+        for k, part in enumerate(parts, start=1):
+            if k == len(parts):
+                units.append((i, k, part, settings_key, chapter_gap))
+            else:
+                units.append((i, k, part, gapless_key, 0.0))
+    return units, chapter_units
+
+
+def chapter_unit_wav_names(stem, chapter_texts, wav_dir, voice, speed,
+                           chapter_gap=0.0, substitutions=None,
+                           heteronyms=True, contractions=True,
+                           phoneme_overrides=None, auto_acronyms=False,
+                           batch_size=1, max_chapter_words=None):
+    """Return, per chapter, the wav paths convert_chapters_to_wav
+    synthesizes it to: one for a whole chapter, one per part for a chapter
+    it splits. Takes the same settings, with the same defaults, so callers
+    can find what an earlier run left behind (wavs, or segment checkpoints
+    at chapter_segment_dir of these paths) before resuming or discarding
+    it."""
+    units, chapter_units = _synthesis_units(
+        chapter_texts, voice, speed, chapter_gap, substitutions, heteronyms,
+        contractions, phoneme_overrides, auto_acronyms, batch_size,
+        max_chapter_words)
+    return [[chapter_wav_name(stem, units[u][2], wav_dir, units[u][3])
+             for u in ids]
+            for ids in chapter_units]
+
+
 def convert_chapters_to_wav(chapter_texts, voice, speed, wav_dir, stem,
                             encode_executor, *,
                             out_format='m4b', bitrate='64k', vbr=False,
                             chapter_gap=0.0, substitutions=None,
                             heteronyms=True, contractions=True,
                             phoneme_overrides=None, auto_acronyms=False,
-                            resume=True, cancel_check=None,
+                            resume=True, cancel_check=None, workers=1,
+                            batch_size=1, stream_encode=False,
+                            segment_checkpoints=None, use_cache=True,
+                            max_chapter_words=None, book_encoder=None,
                             on_chapter_start=None, on_segment=None,
                             on_chapter_done=None, on_chapter_error=None):
     """Run TTS for each chapter text and queue background encoding.
@@ -437,100 +1110,445 @@ def convert_chapters_to_wav(chapter_texts, voice, speed, wav_dir, stem,
       on_chapter_start(idx, total, text, is_resume)
       on_segment(idx, seg_count, est_segs)
       on_chapter_done(idx, duration_or_none)
+    The duration is None when the chapter, or any part of it, was resumed
+    rather than synthesized by this call.
       on_chapter_error(idx, exception)
 
+    `workers` > 1 synthesizes chapters in that many worker processes, each
+    holding its own warm KPipeline. Chapters are handed out in order as
+    workers free up, so `on_chapter_start` still fires roughly when a
+    chapter actually begins; `on_chapter_done` fires in completion order.
+    All callbacks run in the calling thread. `on_segment` is not reported
+    in this mode — segment progress lives in the worker processes.
+
+    `batch_size` > 1 runs that many phoneme chunks per acoustic-model
+    forward pass (see gen_audio_segments); 1 keeps KPipeline's own loop.
+
+    Without workers, chapters still to be synthesized are normalized in
+    normalize_book batches of up to _NORMALIZE_BATCH_WORDS words, each
+    just before its first chapter is synthesized, so the spaCy passes
+    batch across chapters while `cancel_check` still runs between
+    batches; the output is the same as normalizing chapter by chapter.
+
+    `stream_encode` pipes each chapter's audio straight into its encoder
+    while it is synthesized (see convert_text_to_encoded_file) instead of
+    writing a wav for `encode_executor` to read back. No wav is written;
+    the encoded chapter lands at chapter_enc_name(), which is also what
+    resume looks for, and its future in `encode_futures` is already done.
+    `wav_files` and the `encode_futures` keys are still the
+    chapter_wav_name() paths so callers can match chapters the same way
+    in both modes.
+
+    `segment_checkpoints` (default: the `segment_checkpoints` setting,
+    off) saves every chunk next to its chapter file as it is synthesized
+    (see iter_audio_segments), so a chapter interrupted part-way only
+    synthesizes its missing chunks on the next run. It costs a .npy write
+    per chunk and runs chunks through KModel one at a time rather than
+    through KPipeline's loop. The checkpoints are removed once the chapter
+    file is complete; callers starting fresh should discard leftovers with
+    clear_segment_checkpoints.
+
+    `use_cache` looks chapters up in the central audio cache (see
+    autiobooks.cache) before synthesizing them, when `resume` allows
+    reusing audio at all, and adds every newly synthesized chapter to it.
+    Encoding goes through encode_chapter_cached, so audio encoded by an
+    earlier run with the same encoder settings is not encoded again.
+    Chapter files are named with synthesis_settings_key(), so callers
+    matching `wav_files` with chapter_wav_name must pass the same key.
+
+    `max_chapter_words` (default: chapter_word_budget()) splits longer
+    chapters with split_chapter_text. Each part is synthesized, resumed,
+    cached and encoded on its own, like a chapter of its own, so one huge
+    chapter no longer means one long serial job with a single resume
+    point, and with `workers` its parts run in parallel. Only the last
+    part ends in `chapter_gap` silence. Callbacks still report whole
+    chapters, and the chapter's entry in `encode_futures` maps to a tuple
+    of its parts' encoded files, which create_m4b and concat_audio_files
+    join back into one chapter.
+
+    `book_encoder` (a BookEncoder) replaces per-chapter encoding: each
+    chapter's wavs are handed to it once the chapter is complete, and
+    `encode_executor` is not used (it may be None). The `encode_futures`
+    entries then hold no encoded paths; call book_encoder.finish() to
+    write the book. Needs wav chapters, so it cannot be combined with
+    `stream_encode`.
+
     `cancel_check` is polled before each chapter; if it returns truthy the
     loop stops, already-submitted futures are cancelled, and
-    `cancelled` is True in the returned dict.
+    `cancelled` is True in the returned dict. With workers, chapters that
+    are already mid-synthesis finish in the background and land on disk
+    for the next resume.
 
-    The caller owns `encode_executor` and must shut it down. Chapter files
+    The caller owns `encode_executor` (normally an EncodePool, whose
+    back-pressure may block this call while encodes catch up) and must
+    shut it down. Chapter files
     that resumed-from-disk are submitted to the executor immediately so the
     returned dict always maps every wav to a future.
 
     Returns a dict with:
-      wav_files      — list[str] in generation order (resumed + newly done)
-      encode_futures — dict[wav_path] -> (Future, encoded_path)
-      cancelled      — bool
+      wav_files       — list[str] in chapter order (resumed + newly done)
+      encode_futures  — dict[wav_path] -> (Future, encoded_path); for a
+                        split chapter the path is a tuple of its parts'
+      cancelled       — bool
+      part_wav_files  — list[str] the parts of split chapters were
+                        synthesized to (kept for resume, like wavs)
+      part_enc_files  — list[str] the parts were encoded to
+      durations       — dict[encoded_path] -> seconds, counted from the
+                        samples synthesized (or read from a resumed wav's
+                        header); pass it to create_m4b or
+                        concat_audio_files as `known_durations` to skip
+                        probing those files
     """
+    if book_encoder is not None and stream_encode:
+        raise ValueError('book_encoder reads wav chapters; it cannot be '
+                         'combined with stream_encode')
     wav_dir = Path(wav_dir)
     total = len(chapter_texts)
     enc_ext = _INTERMEDIATE_EXTS.get(out_format, '.m4a')
-    wav_files = []
-    encode_futures = {}
-    cancelled = False
+    if segment_checkpoints is None:
+        segment_checkpoints = bool(
+            load_config().get('segment_checkpoints', False))
+    synth_kwargs = {
+        'trailing_silence': chapter_gap,
+        'substitutions': substitutions,
+        'heteronyms': heteronyms,
+        'contractions': contractions,
+        'phoneme_overrides': phoneme_overrides,
+        'auto_acronyms': auto_acronyms,
+        'batch_size': batch_size,
+        'segment_checkpoints': segment_checkpoints,
+    }
+    settings_key = synthesis_settings_key(
+        voice, speed, chapter_gap, substitutions, heteronyms, contractions,
+        phoneme_overrides, auto_acronyms, batch_size)
+    if use_cache:
+        use_cache = cache.cache_budget_bytes() > 0
+    units, chapter_units = _synthesis_units(
+        chapter_texts, voice, speed, chapter_gap, substitutions, heteronyms,
+        contractions, phoneme_overrides, auto_acronyms, batch_size,
+        max_chapter_words)
+
+    unit_files = {}    # unit idx -> file synthesis wrote
+    unit_encodes = {}  # unit idx -> (Future, encoded path)
+    manifest = {}      # encoded path -> seconds
+    settled = [0] * total
+    chapter_seconds = {}
+    unmeasured = set()  # chapters with a part resumed or without audio
+    started = set()
+    failed = set()
+    seg_counts = {}
+    stored = []
+
+    def _cache_key(key):
+        # Streamed units are cached already encoded, so the encoder
+        # settings are part of their cache key.
+        if stream_encode:
+            return f'{key}\0{out_format}\0{bitrate}\0{vbr}'
+        return key
+
+    cache_ext = enc_ext if stream_encode else '.wav'
 
     def _cancel_pending():
-        for fut, _ in encode_futures.values():
+        for fut, _ in unit_encodes.values():
             fut.cancel()
 
-    for i, text in enumerate(chapter_texts, start=1):
+    def _result(cancelled):
+        # Encodes added to the cache during this run are accounted for by
+        # the next run's prune.
+        if stored or (use_cache and unit_encodes and not stream_encode
+                      and book_encoder is None):
+            cache.prune()
+        wav_files = []
+        encode_futures = {}
+        part_wav_files = []
+        part_enc_files = []
+        for i, ids in enumerate(chapter_units, start=1):
+            done = [u for u in ids if u in unit_encodes]
+            if len(ids) > 1:
+                part_wav_files.extend(unit_files[u] for u in done)
+                if not stream_encode and book_encoder is None:
+                    part_enc_files.extend(unit_encodes[u][1] for u in done)
+            if not done or i in failed or settled[i - 1] < len(ids):
+                continue
+            wav_filename = chapter_wav_name(
+                stem, chapter_texts[i - 1], wav_dir, settings_key)
+            wav_files.append(wav_filename)
+            if len(ids) == 1:
+                encode_futures[wav_filename] = unit_encodes[ids[0]]
+            else:
+                encode_futures[wav_filename] = (
+                    _gather_futures([unit_encodes[u][0] for u in done]),
+                    tuple(unit_encodes[u][1] for u in done))
+        return {'wav_files': wav_files,
+                'encode_futures': encode_futures,
+                'cancelled': cancelled,
+                'part_wav_files': part_wav_files,
+                'part_enc_files': part_enc_files,
+                'durations': manifest}
+
+    def _enc_filename(u):
+        i, k = units[u][:2]
+        part = f'_part{k}' if k else ''
+        return str(wav_dir / f'{stem}_chapter_{i}{part}_enc{enc_ext}')
+
+    def _unit_paths(u):
+        """Return (unit key, file synthesis writes) for a unit."""
+        text, key = units[u][2:4]
+        wav_filename = chapter_wav_name(stem, text, wav_dir, key)
+        if stream_encode:
+            return wav_filename, chapter_enc_name(stem, text, wav_dir,
+                                                  enc_ext, key)
+        return wav_filename, wav_filename
+
+    def _unit_kwargs(u):
+        return dict(synth_kwargs, trailing_silence=units[u][4])
+
+    def _skip(u):
+        """Whether the unit's chapter has already failed."""
+        return units[u][0] in failed
+
+    def _start(u, is_resume=False):
+        i = units[u][0]
+        if i in started:
+            return
+        started.add(i)
+        if on_chapter_start is not None:
+            on_chapter_start(i, total, chapter_texts[i - 1], is_resume)
+
+    def _settle(u, duration):
+        i = units[u][0]
+        settled[i - 1] += 1
+        if duration is None:
+            unmeasured.add(i)
+        else:
+            chapter_seconds[i] = chapter_seconds.get(i, 0) + duration
+        if settled[i - 1] < len(chapter_units[i - 1]) or i in failed:
+            return
+        # Every part was resumed if none of them started the chapter.
+        _start(u, True)
+        if book_encoder is not None:
+            book_encoder.add(i, [unit_files[v] for v in chapter_units[i - 1]
+                                 if v in unit_encodes])
+        if on_chapter_done is not None:
+            on_chapter_done(i, None if i in unmeasured
+                            else chapter_seconds.get(i))
+
+    def _queue_encode(u, wav_filename, out_filename, duration=None):
+        unit_files[u] = out_filename
+        if book_encoder is not None:
+            unit_encodes[u] = (_completed_future(None), None)
+            return
+        if duration is None and not stream_encode:
+            duration = _wav_duration(wav_filename)
+        if stream_encode:
+            unit_encodes[u] = (_completed_future(out_filename), out_filename)
+        else:
+            unit_encodes[u] = (
+                encode_executor.submit(
+                    encode_chapter_cached, wav_filename, _enc_filename(u),
+                    out_format, bitrate, vbr, use_cache),
+                _enc_filename(u))
+        if duration is not None:
+            manifest[unit_encodes[u][1]] = duration
+
+    def _finish(u, wav_filename, out_filename, duration):
+        if duration is not None:
+            if use_cache:
+                text, key = units[u][2:4]
+                cache.store(_chapter_hash(text, _cache_key(key)),
+                            cache_ext, out_filename)
+                stored.append(u)
+            _queue_encode(u, wav_filename, out_filename, duration)
+        _settle(u, duration)
+
+    def _fail(u, exc):
+        i = units[u][0]
+        if i in failed:
+            return
+        failed.add(i)
+        if book_encoder is not None:
+            book_encoder.skip(i)
+        if on_chapter_error is not None:
+            on_chapter_error(i, exc)
+        else:
+            print(f"Chapter {i} failed: {exc}", file=sys.stderr)
+
+    def _resumable(u):
+        """Whether _try_resume would find the unit, without fetching it."""
+        if not resume:
+            return False
+        text, key = units[u][2:4]
+        return (Path(_unit_paths(u)[1]).exists()
+                or (use_cache and cache.contains(
+                    _chapter_hash(text, _cache_key(key)), cache_ext)))
+
+    def _try_resume(u, wav_filename, out_filename):
+        if not resume:
+            return False
+        text, key = units[u][2:4]
+        if not (Path(out_filename).exists()
+                or (use_cache and cache.fetch(
+                    _chapter_hash(text, _cache_key(key)), cache_ext,
+                    out_filename))):
+            return False
+        _queue_encode(u, wav_filename, out_filename)
+        _settle(u, None)
+        return True
+
+    encode_args = (out_format, bitrate, vbr) if stream_encode else None
+
+    if workers > 1 and len(units) > 1:
+        return _convert_chapters_parallel(
+            units, voice, speed, workers, _unit_kwargs, encode_args,
+            cancel_check, _start, _unit_paths, _skip, _try_resume,
+            _finish, _fail, _cancel_pending, _result)
+
+    # Units are normalized in normalize_book batches of a bounded number of
+    # words, each just before the first of its units is synthesized, so
+    # spaCy still batches across chapters while cancel_check and progress
+    # callbacks keep running between batches. (Parallel workers normalize
+    # their own units.)
+    normalized = {}
+
+    def _normalize_batch(first):
+        batch, words = [first], len(units[first][2].split())
+        for v in range(first + 1, len(units)):
+            if words >= _NORMALIZE_BATCH_WORDS:
+                break
+            if v in normalized or _skip(v) or _resumable(v):
+                continue
+            batch.append(v)
+            words += len(units[v][2].split())
+        normalized.update(zip(batch, normalize_book(
+            [units[v][2] for v in batch],
+            lang=get_language_from_voice(voice),
+            substitutions=substitutions, heteronyms=heteronyms,
+            contractions=contractions, phoneme_overrides=phoneme_overrides,
+            auto_acronyms=auto_acronyms)))
+
+    for u, (i, _, text, _, _) in enumerate(units):
         if cancel_check is not None and cancel_check():
-            cancelled = True
             _cancel_pending()
-            return {'wav_files': wav_files,
-                    'encode_futures': encode_futures,
-                    'cancelled': True}
-
-        wav_filename = chapter_wav_name(stem, text, wav_dir)
-        enc_filename = str(wav_dir / f'{stem}_chapter_{i}_enc{enc_ext}')
+            return _result(True)
+        if _skip(u):
+            continue
 
-        if resume and Path(wav_filename).exists():
-            if on_chapter_start is not None:
-                on_chapter_start(i, total, text, True)
-            wav_files.append(wav_filename)
-            encode_futures[wav_filename] = (
-                encode_executor.submit(
-                    encode_chapter, wav_filename, enc_filename,
-                    out_format, bitrate, vbr),
-                enc_filename)
-            if on_chapter_done is not None:
-                on_chapter_done(i, None)
+        wav_filename, out_filename = _unit_paths(u)
+        if _try_resume(u, wav_filename, out_filename):
             continue
 
-        if on_chapter_start is not None:
-            on_chapter_start(i, total, text, False)
+        _start(u)
 
-        est_segs = max(len(text.split('\n\n\n')), 1)
+        ids = chapter_units[i - 1]
+        est_segs = max(len(chapter_texts[i - 1].split('\n\n\n')), 1)
 
-        def _seg_cb(seg_count, _idx=i, _est=est_segs):
+        def _seg_cb(seg_count, _u=u, _i=i, _ids=ids, _est=est_segs):
             if on_segment is not None:
-                on_segment(_idx, seg_count, _est)
+                seg_counts[_u] = seg_count
+                on_segment(_i, sum(seg_counts.get(v, 0) for v in _ids),
+                           _est)
 
+        if u not in normalized:
+            _normalize_batch(u)
+        text = normalized.pop(u)
         try:
-            duration = convert_text_to_wav_file(
-                text, voice, speed, wav_filename,
-                on_segment=_seg_cb,
-                trailing_silence=chapter_gap,
-                substitutions=substitutions,
-                heteronyms=heteronyms,
-                contractions=contractions,
-                phoneme_overrides=phoneme_overrides,
-                auto_acronyms=auto_acronyms)
-        except Exception as e:
-            if on_chapter_error is not None:
-                on_chapter_error(i, e)
+            if stream_encode:
+                duration = convert_text_to_encoded_file(
+                    text, voice, speed, out_filename, *encode_args,
+                    on_segment=_seg_cb, normalized=True,
+                    **_unit_kwargs(u))
             else:
-                print(f"Chapter {i} failed: {e}", file=sys.stderr)
+                duration = convert_text_to_wav_file(
+                    text, voice, speed, wav_filename,
+                    on_segment=_seg_cb, normalized=True,
+                    **_unit_kwargs(u))
+        except Exception as e:
+            _fail(u, e)
             continue
 
-        if duration is not None:
-            wav_files.append(wav_filename)
-            encode_futures[wav_filename] = (
-                encode_executor.submit(
-                    encode_chapter, wav_filename, enc_filename,
-                    out_format, bitrate, vbr),
-                enc_filename)
-
-        if on_chapter_done is not None:
-            on_chapter_done(i, duration)
+        _finish(u, wav_filename, out_filename, duration)
 
+    cancelled = False
     if cancel_check is not None and cancel_check():
         cancelled = True
         _cancel_pending()
 
-    return {'wav_files': wav_files,
-            'encode_futures': encode_futures,
-            'cancelled': cancelled}
+    return _result(cancelled)
+
+
+def _convert_chapters_parallel(units, voice, speed, workers, unit_kwargs,
+                               encode_args, cancel_check, start, unit_paths,
+                               skip, try_resume, finish, fail, cancel_pending,
+                               result):
+    """Process-pool body of convert_chapters_to_wav (workers > 1).
+
+    Keeps at most `workers` synthesis units (whole chapters, or parts of
+    split ones) in flight and tops the pool up in order as each one
+    finishes. Two units with identical text share a wav path, so the
+    second waits for the first instead of racing it on the same `.part`
+    file, then reuses its audio.
+    """
+    from concurrent.futures import FIRST_COMPLETED, wait
+
+    pending = list(range(len(units)))
+    pending.reverse()  # pop() from the end yields unit order
+    in_flight = {}     # future -> (unit, wav_filename, out_filename)
+    waiting_on = {}    # wav_filename -> [unit, ...] sharing that wav
+    pool = _create_tts_pool(min(workers, len(units)))
+    cancelled = False
+    try:
+        while pending or in_flight:
+            if cancel_check is not None and cancel_check():
+                cancelled = True
+                break
+
+            while pending and len(in_flight) < workers:
+                u = pending.pop()
+                if skip(u):
+                    continue
+                wav_filename, out_filename = unit_paths(u)
+                if wav_filename in waiting_on:
+                    waiting_on[wav_filename].append(u)
+                    continue
+                if try_resume(u, wav_filename, out_filename):
+                    continue
+                start(u)
+                fut = pool.submit(_tts_worker_chapter, units[u][2], voice,
+                                  speed, out_filename, unit_kwargs(u),
+                                  encode_args)
+                in_flight[fut] = (u, wav_filename, out_filename)
+                waiting_on[wav_filename] = []
+
+            if not in_flight:
+                continue
+            done, _ = wait(in_flight, timeout=0.5,
+                           return_when=FIRST_COMPLETED)
+            for fut in done:
+                u, wav_filename, out_filename = in_flight.pop(fut)
+                sharers = waiting_on.pop(wav_filename, [])
+                try:
+                    duration = fut.result()
+                except Exception as e:
+                    fail(u, e)
+                    for v in sharers:
+                        fail(v, e)
+                    continue
+                finish(u, wav_filename, out_filename, duration)
+                for v in sharers:
+                    if skip(v):
+                        continue
+                    start(v)
+                    finish(v, wav_filename, out_filename, duration)
+    finally:
+        # cancel_futures drops units that never started; ones already
+        # running finish in their worker and land on disk for resume.
+        pool.shutdown(wait=not cancelled, cancel_futures=True)
+
+    if not cancelled and cancel_check is not None and cancel_check():
+        cancelled = True
+    if cancelled:
+        cancel_pending()
+    return result(cancelled)
 
 
 # Map the bitrate spinbox values to libmp3lame VBR quality levels when
@@ -544,6 +1562,23 @@ _MP3_VBR_QUALITY = {
 }
 
 
+def _encoder_args(output_format='m4b', bitrate='64k', vbr=False):
+    """Return the ffmpeg codec arguments for one chapter intermediate."""
+    if output_format == 'm4b':
+        quality_args = ['-q:a', '2'] if vbr else ['-b:a', bitrate]
+        return ['-c:a', 'aac', *quality_args]
+    if output_format == 'mp3' and vbr:
+        quality = _MP3_VBR_QUALITY.get(bitrate, '4')
+        return ['-c:a', 'libmp3lame', '-q:a', quality]
+    format_args = {
+        'mp3': ['-c:a', 'libmp3lame', '-b:a', bitrate],
+        'flac': ['-c:a', 'flac'],
+        'opus': ['-c:a', 'libopus', '-b:a', bitrate],
+        'wav': ['-c:a', 'pcm_s16le'],
+    }
+    return format_args.get(output_format, ['-c:a', 'copy'])
+
+
 def encode_chapter(wav_path, output_path, output_format='m4b',
                     bitrate='64k', vbr=False):
     """Encode a single WAV chapter to the target format.
@@ -554,21 +1589,10 @@ def encode_chapter(wav_path, output_path, output_format='m4b',
     if output_format == 'm4b':
         return encode_chapter_to_m4a(wav_path, output_path, bitrate, vbr)
 
-    if output_format == 'mp3' and vbr:
-        quality = _MP3_VBR_QUALITY.get(bitrate, '4')
-        codec_args = ['-c:a', 'libmp3lame', '-q:a', quality]
-    else:
-        format_args = {
-            'mp3': ['-c:a', 'libmp3lame', '-b:a', bitrate],
-            'flac': ['-c:a', 'flac'],
-            'opus': ['-c:a', 'libopus', '-b:a', bitrate],
-            'wav': ['-c:a', 'pcm_s16le'],
-        }
-        codec_args = format_args.get(output_format, ['-c:a', 'copy'])
     result = subprocess.run([
         'ffmpeg', '-y',
         '-i', wav_path,
-        *codec_args,
+        *_encoder_args(output_format, bitrate, vbr),
         output_path
     ], capture_output=True, **_SUBPROCESS_FLAGS)
     if result.returncode != 0:
@@ -577,10 +1601,43 @@ def encode_chapter(wav_path, output_path, output_format='m4b',
     return output_path
 
 
+def encode_chapter_cached(wav_path, output_path, output_format='m4b',
+                           bitrate='64k', vbr=False, use_cache=True):
+    """encode_chapter, reusing an earlier encoding of the same audio.
+
+    With `use_cache`, the central cache (autiobooks.cache) is looked up by
+    the wav's contents and the encoder settings, and a fresh encoding is
+    added to it. Returns output_path.
+    """
+    # output_path may be a leftover hard link into the cache; never let
+    # ffmpeg overwrite an entry in place.
+    Path(output_path).unlink(missing_ok=True)
+    key = None
+    if use_cache:
+        try:
+            key = cache.file_key(wav_path, 'encoded', output_format,
+                                 bitrate, vbr)
+        except OSError:
+            pass
+    ext = Path(output_path).suffix
+    if key is not None and cache.fetch(key, ext, output_path):
+        return output_path
+    encode_chapter(wav_path, output_path, output_format, bitrate, vbr)
+    if key is not None:
+        cache.store(key, ext, output_path)
+    return output_path
+
+
 def concat_audio_files(chapter_files, output_path, cover_image=None,
                        title='', creator='', chapter_num=1,
-                       chapter_titles=None, progress_callback=None):
-    """Concatenate encoded chapter files into a single output file (non-m4b)."""
+                       chapter_titles=None, progress_callback=None,
+                       known_durations=None):
+    """Concatenate encoded chapter files into a single output file (non-m4b).
+
+    Entries may be tuples of parts, as for create_m4b. `known_durations`
+    (path -> seconds) spares probing files for the progress total.
+    """
+    chapter_files = [f for entry in chapter_files for f in chapter_parts(entry)]
     with TemporaryDirectory() as tempdir:
         concat_file = os.path.join(tempdir, 'concat.txt')
         with open(concat_file, 'w', encoding='utf-8') as f:
@@ -588,12 +1645,9 @@ def concat_audio_files(chapter_files, output_path, cover_image=None,
                 safe_path = chapter_file.replace("'", "'\\''")
                 f.write(f"file '{safe_path}'\n")
 
-        total_duration_us = 0
-        for cf in chapter_files:
-            try:
-                total_duration_us += int(probe_duration(cf) * 1_000_000)
-            except Exception:
-                pass
+        total_duration_us = int(sum(_chapter_durations(
+            [[f] for f in chapter_files], known_durations,
+            stream_copy=True)) * 1_000_000)
 
         proc = subprocess.Popen([
             'ffmpeg', '-y',
@@ -635,12 +1689,10 @@ def encode_chapter_to_m4a(wav_path, m4a_path, bitrate='64k', vbr=False):
     Intended to run in a background thread during TTS generation so that the
     final assembly step can do a fast stream-copy instead of re-encoding.
     """
-    quality_args = ['-q:a', '2'] if vbr else ['-b:a', bitrate]
     result = subprocess.run([
         'ffmpeg', '-y',
         '-i', wav_path,
-        '-c:a', 'aac',
-        *quality_args,
+        *_encoder_args('m4b', bitrate, vbr),
         m4a_path
     ], capture_output=True, **_SUBPROCESS_FLAGS)
     if result.returncode != 0:
@@ -649,28 +1701,156 @@ def encode_chapter_to_m4a(wav_path, m4a_path, bitrate='64k', vbr=False):
     return m4a_path
 
 
+class BookEncoder:
+    """One ffmpeg process encoding a whole book, fed chapter by chapter.
+
+    The per-chapter path starts an encoder for every chapter and then one
+    more ffmpeg to concatenate their output. A BookEncoder instead streams
+    the chapter wavs, in chapter order, as raw PCM into a single encoder
+    as they become ready, counting each chapter's samples on the way
+    through so its marker lands on the exact sample offset. No per-chapter
+    intermediates are written.
+
+    add() takes chapters in any order and they are fed in index order;
+    skip() marks an index that produced nothing. finish() writes the book:
+    for m4b, a stream-copy remux adds the chapter markers and cover to the
+    encoded audio (ffmpeg reads metadata inputs up front, before the
+    chapter lengths are known); other formats are the encoder's output as
+    is. abort() discards everything.
+    """
+
+    def __init__(self, output_path, out_format='m4b', bitrate='64k',
+                 vbr=False):
+        self.output_path = str(output_path)
+        self.out_format = out_format
+        root, ext = os.path.splitext(self.output_path)
+        # Keep the real extension last so ffmpeg still picks the right
+        # muxer; m4b audio gets a plain m4a until its final remux.
+        self._audio_path = (f'{root}.part.m4a' if out_format == 'm4b'
+                            else f'{root}.part{ext}')
+        self.durations = []  # seconds per chapter fed, in order
+        self._ready = {}     # chapter idx -> [wav path, ...]
+        self._next = 1
+        self._closed = False
+        self._error = None
+        self._cond = threading.Condition()
+        self._proc = subprocess.Popen([
+            'ffmpeg', '-y',
+            '-f', 'f32le', '-ar', str(SAMPLE_RATE), '-ac', '1',
+            '-i', 'pipe:0',
+            *_encoder_args(out_format, bitrate, vbr),
+            self._audio_path
+        ], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+           stderr=subprocess.PIPE, **_SUBPROCESS_FLAGS)
+        self._stderr_buf = []
+        self._stderr_thread = threading.Thread(
+            target=_drain_stderr, args=(self._proc, self._stderr_buf))
+        self._stderr_thread.start()
+        self._feeder = threading.Thread(target=self._feed, daemon=True)
+        self._feeder.start()
+
+    def add(self, idx, wav_files):
+        """Queue chapter `idx` (1-based), made of `wav_files` in order."""
+        with self._cond:
+            self._ready[idx] = list(wav_files)
+            self._cond.notify()
+
+    def skip(self, idx):
+        """Mark chapter `idx` as producing no audio."""
+        self.add(idx, [])
+
+    def _feed(self):
+        try:
+            while True:
+                with self._cond:
+                    while self._next not in self._ready and not self._closed:
+                        self._cond.wait()
+                    if self._next in self._ready:
+                        wav_files = self._ready.pop(self._next)
+                        self._next += 1
+                    elif self._ready:
+                        # Closed with a gap: the missing chapters are gone.
+                        self._next = min(self._ready)
+                        continue
+                    else:
+                        return
+                if wav_files:
+                    samples = sum(self._write(path) for path in wav_files)
+                    self.durations.append(samples / SAMPLE_RATE)
+        except Exception as e:
+            self._error = e
+
+    def _write(self, wav_path):
+        samples = 0
+        with soundfile.SoundFile(wav_path) as f:
+            for block in f.blocks(blocksize=1 << 16, dtype='float32'):
+                self._proc.stdin.write(block.tobytes())
+                samples += len(block)
+        return samples
+
+    def _stop(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._feeder.join()
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        self._proc.wait()
+        self._stderr_thread.join()
+
+    def _discard(self):
+        try:
+            Path(self._audio_path).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def finish(self, title='', creator='', chapter_num=1,
+               chapter_titles=None, cover_image=None,
+               progress_callback=None):
+        """Encode what is left, write the book and return the chapter
+        durations. `chapter_titles` align with the chapters fed."""
+        self._stop()
+        try:
+            if self._error is not None or self._proc.returncode != 0:
+                raw = self._stderr_buf[0] if self._stderr_buf else b''
+                if isinstance(raw, bytes):
+                    raw = raw.decode('utf-8', errors='replace')
+                raise RuntimeError(
+                    f"Book encoding failed: {self._error or ''}\n"
+                    f"{raw[-2000:]}")
+            if not self.durations:
+                raise RuntimeError("No chapters were encoded.")
+            if self.out_format == 'm4b':
+                with TemporaryDirectory() as tempdir:
+                    _mux_m4b(['-i', self._audio_path], ['-c:a', 'copy'],
+                             self.durations, self.output_path, cover_image,
+                             title, creator, chapter_num, chapter_titles,
+                             progress_callback, tempdir)
+            else:
+                os.replace(self._audio_path, self.output_path)
+        finally:
+            self._discard()
+        return self.durations
+
+    def abort(self):
+        """Stop the encoder and delete its output. Safe to call twice, or
+        after finish()."""
+        if self._proc.poll() is None:
+            self._proc.kill()
+        self._stop()
+        self._discard()
+
+
 def _probe_chapters(file_path):
     """Return list of chapter dicts from an m4b file via ffprobe."""
-    result = subprocess.run([
-        'ffprobe', '-v', 'quiet',
-        '-print_format', 'json',
-        '-show_chapters',
-        file_path
-    ], capture_output=True, text=True, encoding='utf-8', check=True, timeout=30,
-       **_SUBPROCESS_FLAGS)
-    return json.loads(result.stdout).get('chapters', [])
+    return probe.chapters(file_path)
 
 
 def _probe_format_tags(file_path):
     """Return the format-level metadata tags from an m4b file."""
-    result = subprocess.run([
-        'ffprobe', '-v', 'quiet',
-        '-print_format', 'json',
-        '-show_format',
-        file_path
-    ], capture_output=True, text=True, encoding='utf-8', check=True, timeout=30,
-       **_SUBPROCESS_FLAGS)
-    return json.loads(result.stdout).get('format', {}).get('tags', {})
+    return probe.format_tags(file_path)
 
 
 def append_m4b(base_path, append_path, output_path, progress_callback=None):
@@ -687,7 +1867,8 @@ def append_m4b(base_path, append_path, output_path, progress_callback=None):
                 safe = p.replace("'", "'\\''")
                 f.write(f"file '{safe}'\n")
 
-        # Durations and chapters
+        # Durations and chapters: one ffprobe per file, usually already
+        # cached from when the files were picked.
         base_duration = probe_duration(base_path)
         base_duration_ms = int(base_duration * 1000)
         append_duration = probe_duration(append_path)
@@ -762,11 +1943,7 @@ def append_m4b(base_path, append_path, output_path, progress_callback=None):
 
 
 def probe_duration(file_name):
-    args = ['ffprobe', '-i', file_name, '-show_entries', 'format=duration',
-            '-v', 'quiet', '-of', 'default=noprint_wrappers=1:nokey=1']
-    proc = subprocess.run(args, capture_output=True, text=True, check=True,
-                          timeout=30, **_SUBPROCESS_FLAGS)
-    return float(proc.stdout.strip())
+    return probe.duration(file_name)
 
 
 def create_index_file(title, creator, chapter_durations, chapter_num,
@@ -796,13 +1973,23 @@ def convert_text_to_wav_file(text, voice, speed, filename,
                              split_pattern=r'\n\n\n', on_segment=None,
                              trailing_silence=0, substitutions=None,
                              heteronyms=True, contractions=True,
-                             phoneme_overrides=None, auto_acronyms=False):
-    text = normalize_text(text, lang=get_language_from_voice(voice),
-                          substitutions=substitutions,
-                          heteronyms=heteronyms, contractions=contractions,
-                          phoneme_overrides=phoneme_overrides,
-                          auto_acronyms=auto_acronyms)
-    audio = gen_audio_segments(text, voice, speed, split_pattern, on_segment)
+                             phoneme_overrides=None, auto_acronyms=False,
+                             batch_size=1, segment_checkpoints=False,
+                             normalized=False):
+    if not normalized:
+        text = normalize_text(text, lang=get_language_from_voice(voice),
+                              substitutions=substitutions,
+                              heteronyms=heteronyms,
+                              contractions=contractions,
+                              phoneme_overrides=phoneme_overrides,
+                              auto_acronyms=auto_acronyms)
+    # Checkpoints let a crash mid-chapter resume at the failed chunk; they
+    # are dropped once the finished wav is safely in place.
+    checkpoint_dir = (chapter_segment_dir(filename)
+                      if segment_checkpoints else None)
+    audio = gen_audio_segments(text, voice, speed, split_pattern, on_segment,
+                               batch_size=batch_size,
+                               checkpoint_dir=checkpoint_dir)
     if audio:
         audio = np.concatenate(audio)
         if trailing_silence > 0:
@@ -821,5 +2008,108 @@ def convert_text_to_wav_file(text, voice, speed, filename,
             except OSError:
                 pass
             raise
+        if checkpoint_dir is not None:
+            clear_segment_checkpoints(filename)
         return len(audio) / SAMPLE_RATE
     return None
+
+
+def convert_text_to_encoded_file(text, voice, speed, filename,
+                                 out_format='m4b', bitrate='64k', vbr=False,
+                                 split_pattern=r'\n\n\n', on_segment=None,
+                                 trailing_silence=0, substitutions=None,
+                                 heteronyms=True, contractions=True,
+                                 phoneme_overrides=None, auto_acronyms=False,
+                                 batch_size=1, segment_checkpoints=False,
+                                 normalized=False):
+    """Synthesize `text` and encode it to `filename` in a single pass.
+
+    Streaming counterpart of convert_text_to_wav_file + encode_chapter:
+    each segment is written as raw float32 PCM into one ffmpeg encoder's
+    stdin as soon as it is generated, so neither the whole chapter's audio
+    nor an intermediate wav ever exists. The encoder writes to a part file
+    that is renamed over `filename` only after ffmpeg exits cleanly, so an
+    interrupted chapter never looks complete to resume.
+
+    `segment_checkpoints` saves each chunk as it is generated, as in
+    convert_text_to_wav_file, so a restart only synthesizes what is missing.
+
+    `normalized` means `text` is already normalize_text output (as from
+    normalize_book), so the normalization settings are not applied again.
+
+    Returns the duration in seconds, or None if the text produced no audio
+    (in which case no encoder is started and nothing is written).
+    """
+    if not normalized:
+        text = normalize_text(text, lang=get_language_from_voice(voice),
+                              substitutions=substitutions,
+                              heteronyms=heteronyms,
+                              contractions=contractions,
+                              phoneme_overrides=phoneme_overrides,
+                              auto_acronyms=auto_acronyms)
+    checkpoint_dir = (chapter_segment_dir(filename)
+                      if segment_checkpoints else None)
+    segments = iter_audio_segments(text, voice, speed, split_pattern,
+                                   on_segment, batch_size=batch_size,
+                                   checkpoint_dir=checkpoint_dir)
+    first = next(segments, None)
+    if first is None:
+        return None
+
+    # Keep the real extension last so ffmpeg still picks the right muxer.
+    root, ext = os.path.splitext(filename)
+    part_path = f'{root}.part{ext}'
+    proc = subprocess.Popen([
+        'ffmpeg', '-y',
+        '-f', 'f32le', '-ar', str(SAMPLE_RATE), '-ac', '1',
+        '-i', 'pipe:0',
+        *_encoder_args(out_format, bitrate, vbr),
+        part_path
+    ], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+       stderr=subprocess.PIPE, **_SUBPROCESS_FLAGS)
+    stderr_buf = []
+    stderr_thread = threading.Thread(
+        target=_drain_stderr, args=(proc, stderr_buf))
+    stderr_thread.start()
+
+    def _stderr_text():
+        raw = stderr_buf[0] if stderr_buf else b''
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8', errors='replace')
+        return raw[-2000:]
+
+    samples = 0
+    broken_pipe = False
+    try:
+        try:
+            for audio in itertools.chain((first,), segments):
+                pcm = np.asarray(audio, dtype=np.float32)
+                proc.stdin.write(pcm.tobytes())
+                samples += len(pcm)
+            if trailing_silence > 0:
+                silence = np.zeros(int(SAMPLE_RATE * trailing_silence),
+                                   dtype=np.float32)
+                proc.stdin.write(silence.tobytes())
+                samples += len(silence)
+            proc.stdin.close()
+        except BrokenPipeError:
+            # ffmpeg died mid-chapter; its stderr says why.
+            broken_pipe = True
+        proc.wait()
+        stderr_thread.join()
+        if proc.returncode != 0 or broken_pipe:
+            raise RuntimeError(f"Chapter encoding failed:\n{_stderr_text()}")
+        os.replace(part_path, filename)
+    except BaseException:
+        if proc.poll() is None:
+            proc.kill()
+            proc.wait()
+        stderr_thread.join()
+        try:
+            Path(part_path).unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
+    if checkpoint_dir is not None:
+        clear_segment_checkpoints(filename)
+    return samples / SAMPLE_RATE
@@ -1,18 +1,32 @@
 import html
 import io
+import multiprocessing
 import os
+import posixpath
 import re
 import warnings
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import unquote
 import ebooklib
 from ebooklib import epub
 from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
 from PIL import Image, ImageTk
 
+from . import book_cache
+from .covers import cover_thumbnail, png_bytes
+
 # Suppress ebooklib's internal XML query warning
 warnings.filterwarnings('ignore', category=FutureWarning, module='ebooklib.epub')
 
 _chapter_cache = {}
 
+# Bump when extraction, or what a book cache record holds, changes, so
+# cached parses are not reused.
+PARSER_VERSION = 2
+
 
 # Elements to remove entirely (including their children)
 SKIP_TAGS = {'script', 'style', 'nav', 'svg', 'math'}
@@ -30,6 +44,18 @@ BLOCK_TAGS = {
 # Class names that indicate footnote/endnote references
 FOOTNOTE_CLASSES = {'noteref', 'footnote-ref', 'endnote-ref', 'fn-ref'}
 
+# Elements whose strings BeautifulSoup's get_text() leaves out (ruby
+# annotations, templates, scripts and styles)
+_NON_TEXT_STRING_TAGS = {'rt', 'rp', 'template', 'script', 'style'}
+
+# Elements searched, in this order, for a chapter's fallback title
+HEADING_TAGS = ('h1', 'h2', 'h3', 'title')
+
+# Books smaller than this are extracted in-process: starting a worker pool
+# costs more than it saves.
+PARALLEL_MIN_BYTES = 1 << 20
+PARALLEL_MIN_CHAPTERS = 4
+
 
 def _is_footnote_ref(tag):
     """Detect footnote/endnote reference links that clutter TTS output."""
@@ -45,9 +71,31 @@ def _is_footnote_ref(tag):
     return False
 
 
-def extract_text_from_html(html_content):
-    """Extract readable text from epub HTML with proper structure."""
+def _find_heading(soup):
+    """Return the text of the first h1, else h2, else h3, else title."""
+    for tag_name in HEADING_TAGS:
+        tag = soup.find(tag_name)
+        if tag:
+            text = tag.get_text(strip=True)
+            if text:
+                return text
+    return None
+
+
+def _extract_text_from_html_bs4(html_content):
+    """Reference extractor: BeautifulSoup tree plus find_all sweeps.
+
+    extract_text_from_html produces the same text in a single pass; this
+    stays as its fallback and as the baseline for the golden corpus and
+    scripts/bench_epub_extract.py.
+    """
+    return _extract_chapter_bs4(html_content)[0]
+
+
+def _extract_chapter_bs4(html_content):
+    """BeautifulSoup version of _extract_chapter."""
     soup = BeautifulSoup(html_content, features='lxml')
+    heading = _find_heading(soup)
 
     # Remove non-content elements
     for el in soup.find_all(SKIP_TAGS):
@@ -80,7 +128,11 @@ def extract_text_from_html(html_content):
         tag.append(NavigableString('\n'))
 
     # Extract all text and normalize whitespace
-    raw = soup.get_text()
+    return _normalize_lines(soup.get_text()), heading
+
+
+def _normalize_lines(raw):
+    """Collapse whitespace within each line and drop empty lines."""
     lines = []
     for line in raw.split('\n'):
         line = ' '.join(line.split())
@@ -90,8 +142,368 @@ def extract_text_from_html(html_content):
     return '\n'.join(lines)
 
 
+class _TextTarget:
+    """lxml parser target that builds the extracted text straight from the
+    parse events, with no tree.
+
+    Mirrors _extract_text_from_html_bs4 step for step: skip tags and
+    footnote refs drop their whole subtree (their tail text is the parent's
+    and survives), <br> is a newline, <hr> a blank line, <img> its alt
+    text, and block elements get a newline before and after their content.
+    A `#`-link is only known to be a footnote ref once a <sup> turns up
+    inside it, so its output is held back until its end tag. Strings
+    directly under a _NON_TEXT_STRING_TAGS element are dropped, as
+    get_text() drops them.
+
+    Alongside the text it collects the strings of the first element of each
+    HEADING_TAGS name, skipped content included, for _find_heading's title.
+    """
+
+    def __init__(self):
+        self._buffers = [[]]
+        self._skip_depth = 0
+        # One entry per open <a>: None, or [has_sup] for a held-back '#' link.
+        self._links = []
+        # Open _NON_TEXT_STRING_TAGS elements, innermost last.
+        self._containers = []
+        # tag → strings of its first element; [tag, depth] while it is open.
+        self._headings = {}
+        self._open_headings = []
+        self._in_string = False
+
+    def _heading_event(self, tag, delta):
+        self._in_string = False
+        if tag not in HEADING_TAGS:
+            return
+        if delta > 0 and tag not in self._headings:
+            self._headings[tag] = []
+            self._open_headings.append([tag, 0])
+        for open_heading in self._open_headings:
+            if open_heading[0] == tag:
+                open_heading[1] += delta
+        self._open_headings = [h for h in self._open_headings if h[1] > 0]
+
+    def start(self, tag, attrib):
+        self._heading_event(tag, 1)
+        if tag in _NON_TEXT_STRING_TAGS:
+            self._containers.append(tag)
+        if self._skip_depth:
+            self._skip_depth += 1
+            return
+        if tag in SKIP_TAGS:
+            self._skip_depth = 1
+            return
+        out = self._buffers[-1]
+        if tag == 'a':
+            if (attrib.get('epub:type', '') == 'noteref'
+                    or set(attrib.get('class', '').split())
+                    & FOOTNOTE_CLASSES):
+                self._skip_depth = 1
+                return
+            if attrib.get('href', '').startswith('#'):
+                self._links.append([False])
+                self._buffers.append([])
+            else:
+                self._links.append(None)
+        elif tag == 'sup':
+            for link in self._links:
+                if link is not None:
+                    link[0] = True
+        elif tag == 'br':
+            out.append('\n')
+        elif tag == 'hr':
+            out.append('\n\n')
+        elif tag == 'img':
+            out.append(attrib.get('alt', '').strip())
+        elif tag in BLOCK_TAGS:
+            out.append('\n')
+
+    def end(self, tag):
+        self._heading_event(tag, -1)
+        if self._containers and self._containers[-1] == tag:
+            self._containers.pop()
+        if self._skip_depth:
+            self._skip_depth -= 1
+            return
+        if tag in BLOCK_TAGS:
+            self._buffers[-1].append('\n')
+        elif tag == 'a' and self._links:
+            link = self._links.pop()
+            if link is not None:
+                held = self._buffers.pop()
+                if not link[0]:
+                    self._buffers[-1].extend(held)
+
+    def data(self, text):
+        if self._containers:
+            return
+        for tag, _ in self._open_headings:
+            strings = self._headings[tag]
+            # lxml may deliver one string in several pieces.
+            if self._in_string and strings:
+                strings[-1] += text
+            else:
+                strings.append(text)
+        self._in_string = True
+        if not self._skip_depth:
+            self._buffers[-1].append(text)
+
+    def comment(self, text):
+        self._in_string = False
+
+    def pi(self, target, data=None):
+        self._in_string = False
+
+    def heading(self):
+        """The first non-empty heading, as _find_heading would return it."""
+        for tag in HEADING_TAGS:
+            text = ''.join(s.strip() for s in self._headings.get(tag, ()))
+            if text:
+                return text
+        return None
+
+    def close(self):
+        return ''.join(''.join(b) for b in self._buffers)
+
+
+_DECLARED_ENCODING = re.compile(
+    rb'^\s*<\?xml[^>]*?encoding=["\']([\w.:-]+)'
+    rb'|<meta[^>]*?charset\s*=\s*["\']?([\w.:-]+)',
+    re.IGNORECASE)
+
+_BOMS = ((b'\xef\xbb\xbf', 'utf-8'), (b'\xff\xfe', 'utf-16le'),
+         (b'\xfe\xff', 'utf-16be'))
+
+
+def _markup_encodings(markup):
+    """Yield (markup, encoding) attempts in BeautifulSoup's order: BOM,
+    then the declared encoding, then UTF-8, then windows-1252."""
+    for bom, encoding in _BOMS:
+        if markup.startswith(bom):
+            yield markup[len(bom):], encoding
+            break
+    m = _DECLARED_ENCODING.search(markup, 0, 2048)
+    if m:
+        yield markup, (m.group(1) or m.group(2)).decode('ascii').lower()
+    yield markup, 'utf-8'
+    yield markup, 'windows-1252'
+
+
+def extract_text_from_html(html_content):
+    """Extract readable text from epub HTML with proper structure.
+
+    Single pass over lxml's HTML parse events (see _TextTarget), fed the
+    same way BeautifulSoup feeds lxml, so the output is identical to
+    _extract_text_from_html_bs4 — which is the fallback if lxml rejects
+    the markup under every encoding.
+    """
+    return _extract_chapter(html_content)[0]
+
+
+def _extract_chapter(html_content):
+    """Return (text, first heading) of a chapter's HTML from one parse.
+
+    Top-level so it can run in an extraction worker process.
+    """
+    if isinstance(html_content, bytes):
+        attempts = _markup_encodings(html_content)
+    else:
+        markup = html_content
+        if markup.startswith('\ufeff'):
+            markup = markup[1:]
+        attempts = [(markup, None)]
+    for markup, encoding in attempts:
+        try:
+            target = _TextTarget()
+            parser = etree.HTMLParser(target=target, recover=True,
+                                      encoding=encoding)
+            parser.feed(markup)
+            return _normalize_lines(parser.close()), target.heading()
+        except (UnicodeDecodeError, LookupError, etree.LxmlError):
+            continue
+    return _extract_chapter_bs4(html_content)
+
+
+class _EpubArchive:
+    """Reads single members of an EPUB (zip file or unpacked directory)."""
+
+    def __init__(self, path):
+        self.path = str(path)
+
+    def read(self, name):
+        name = posixpath.normpath(name)
+        if os.path.isdir(self.path):
+            with open(os.path.join(self.path, name), 'rb') as f:
+                return f.read()
+        # Opening per read keeps no file handle alive between chapters and
+        # is safe from any thread; it only costs a central-directory scan.
+        with zipfile.ZipFile(self.path) as zf:
+            return zf.read(name)
+
+
+class _LazyItemMixin:
+    """Item whose content is read from the archive on access, and whose
+    extracted_text is computed (and kept) the first time it is asked for.
+
+    Raw content is deliberately not kept: once a chapter's text has been
+    extracted its HTML is no longer needed, and images and fonts are only
+    ever read if something asks for them (the cover).
+    """
+
+    _archive = None
+    _archive_path = None
+    _content_set = None
+    _extracted_text = None
+    _heading = None
+
+    def _attach(self, archive, path):
+        self._archive = archive
+        self._archive_path = path
+        self._content_set = None
+
+    @property
+    def content(self):
+        if self._content_set is not None or self._archive is None:
+            return self._content_set
+        try:
+            return self._archive.read(self._archive_path)
+        except (KeyError, OSError):
+            return b''
+
+    @content.setter
+    def content(self, value):
+        self._content_set = value
+
+    def _extract(self):
+        if self._extracted_text is None:
+            xml = _get_chapter_html(self)
+            self._extracted_text, self._heading = (
+                _extract_chapter(xml) if xml is not None else ('', None))
+
+    @property
+    def extracted_text(self):
+        self._extract()
+        return self._extracted_text
+
+    @extracted_text.setter
+    def extracted_text(self, value):
+        self._extracted_text = value
+
+    @property
+    def heading(self):
+        self._extract()
+        return self._heading
+
+    @heading.setter
+    def heading(self, value):
+        self._heading = value
+
+
+class _LazyEpubItem(_LazyItemMixin, epub.EpubItem):
+    pass
+
+
+class _LazyEpubHtml(_LazyItemMixin, epub.EpubHtml):
+    pass
+
+
+class _LazyEpubCoverHtml(_LazyItemMixin, epub.EpubCoverHtml):
+    pass
+
+
+class _LazyEpubImage(_LazyItemMixin, epub.EpubImage):
+    pass
+
+
+class _LazyEpubCover(_LazyItemMixin, epub.EpubCover):
+    pass
+
+
+class _LazyEpubReader(epub.EpubReader):
+    """ebooklib's reader, minus reading every manifest item up front.
+
+    Metadata, spine and the TOC (NCX / nav document) are parsed as usual;
+    every other item gets a lazy subclass of the class ebooklib would have
+    built, so the result is a normal EpubBook that only touches the zip
+    when an item's content is actually used.
+    """
+
+    def _load_manifest(self):
+        archive = _EpubArchive(self.file_name)
+        opf = '{%s}' % epub.NAMESPACES['OPF']
+        for r in self.container.find(opf + 'manifest'):
+            if r is not None and r.tag != opf + 'item':
+                continue
+            media_type = r.get('media-type')
+            properties = (r.get('properties') or '').split()
+            href = unquote(r.get('href'))
+            path = posixpath.join(self.opf_dir, href)
+            if media_type == 'image/jpg':
+                media_type = 'image/jpeg'
+
+            # Same class choice as ebooklib's EpubReader._load_manifest.
+            if media_type == 'application/x-dtbncx+xml':
+                ei = epub.EpubNcx(uid=r.get('id'), file_name=href)
+                ei.content = self.read_file(path)
+            elif media_type == 'application/smil+xml':
+                ei = epub.EpubSMIL(uid=r.get('id'), file_name=href)
+                ei.content = self.read_file(path)
+            elif media_type == 'application/xhtml+xml':
+                if 'nav' in properties:
+                    # Needed now: the TOC is parsed from it.
+                    ei = epub.EpubNav(uid=r.get('id'), file_name=href)
+                    ei.content = self.read_file(
+                        posixpath.join(self.opf_dir, r.get('href')))
+                elif 'cover' in properties:
+                    ei = _LazyEpubCoverHtml()
+                    ei._attach(archive, path)
+                else:
+                    ei = _LazyEpubHtml()
+                    ei.id = r.get('id')
+                    ei.file_name = href
+                    ei.media_type = media_type
+                    ei.media_overlay = r.get('media-overlay', None)
+                    ei.media_duration = r.get('duration', None)
+                    ei.properties = properties
+                    ei._attach(archive, path)
+            elif media_type in epub.IMAGE_MEDIA_TYPES:
+                if 'cover-image' in properties:
+                    ei = _LazyEpubCover(uid=r.get('id'), file_name=href)
+                else:
+                    ei = _LazyEpubImage()
+                    ei.id = r.get('id')
+                    ei.file_name = href
+                ei.media_type = media_type
+                ei._attach(archive, path)
+            else:
+                ei = _LazyEpubItem()
+                ei.id = r.get('id')
+                ei.file_name = href
+                ei.media_type = media_type
+                ei._attach(archive, path)
+            self.book.add_item(ei)
+
+
+def read_epub_lazy(file_path):
+    """Open an EPUB reading only its OPF, spine and TOC.
+
+    Returns an ebooklib EpubBook whose items load their content from the
+    file on demand, and whose documents compute `extracted_text` the first
+    time it is read. Falls back to a full `epub.read_epub` if the lazy
+    reader cannot handle the file.
+    """
+    options = {'ignore_ncx': True}
+    try:
+        reader = _LazyEpubReader(str(file_path), options)
+        book = reader.load()
+        reader.process()
+        return book
+    except Exception:
+        return epub.read_epub(file_path, options=options)
+
+
 def get_book(file_path, resized):
-    book = epub.read_epub(file_path, options={'ignore_ncx': True})
+    book = read_epub_lazy(file_path)
     chapters = find_document_chapters_and_extract_texts(book)
     cover_image = get_cover_image(book, resized=resized)
     return (book, chapters, cover_image)
@@ -102,6 +514,8 @@ def get_book_cached(file_path, resized):
 
     Re-parses when the file is modified on disk. Cover images are PhotoImage
     objects when resized=True; callers must keep a reference to prevent GC.
+    Behind the in-memory cache is the on-disk book cache (see book_cache),
+    which keeps chapter texts, metadata, TOC and cover across runs.
     """
     try:
         mod_time = os.path.getmtime(file_path)
@@ -111,11 +525,128 @@ def get_book_cached(file_path, resized):
     cached = _chapter_cache.get(cache_key)
     if cached is not None:
         return cached
-    result = get_book(file_path, resized)
+    result = _get_book_disk_cached(file_path, resized)
     _chapter_cache[cache_key] = result
     return result
 
 
+# Dublin Core metadata kept in the book cache: everything read from a book
+# other than its chapters (see get_title, get_author, ...).
+_CACHED_METADATA = ('title', 'creator', 'publisher', 'date', 'description',
+                    'language')
+
+
+def _toc_record(toc):
+    """Return `toc` (an ebooklib TOC tree) as JSON-able nested lists."""
+    entries = []
+    for entry in toc:
+        if isinstance(entry, tuple):
+            section, children = entry
+            entries.append([getattr(section, 'title', '') or '',
+                            getattr(section, 'href', '') or '',
+                            _toc_record(children)])
+        else:
+            entries.append([getattr(entry, 'title', '') or '',
+                            getattr(entry, 'href', '') or ''])
+    return entries
+
+
+def _toc_from_record(entries):
+    toc = []
+    for entry in entries:
+        if len(entry) == 3:
+            toc.append((epub.Section(entry[0], entry[1]),
+                        _toc_from_record(entry[2])))
+        else:
+            toc.append(epub.Link(entry[1], entry[0]))
+    return toc
+
+
+def _book_from_record(record, resized):
+    """Rebuild (book, chapters, cover_image) from a book cache record
+    without opening the EPUB.
+
+    The book is an ebooklib EpubBook holding the cached metadata, TOC,
+    chapters and cover, so get_title, get_chapter_titles, get_cover_image
+    and friends work on it unchanged.
+    """
+    book = epub.EpubBook()
+    for key, values in record['metadata'].items():
+        for value in values:
+            book.add_metadata('DC', key, value)
+    book.toc = _toc_from_record(record['toc'])
+    chapters = []
+    for n, entry in enumerate(record['chapters']):
+        ch = epub.EpubHtml(uid=f'chapter_{n}', file_name=entry['file_name'])
+        ch.extracted_text = entry['text']
+        ch.heading = entry['title']
+        ch.word_count = entry['words']
+        ch.content_hash = entry['hash']
+        book.add_item(ch)
+        chapters.append(ch)
+    cover = record['cover']
+    if cover:
+        cover_item = epub.EpubCover(file_name=record['cover_name'] or '')
+        cover_item.content = cover
+        book.add_item(cover_item)
+    if resized:
+        thumbnail = record['thumbnail']
+        cover_image = (ImageTk.PhotoImage(Image.open(io.BytesIO(thumbnail)))
+                       if thumbnail else None)
+    else:
+        cover_image = cover
+    return (book, chapters, cover_image)
+
+
+def _get_book_disk_cached(file_path, resized):
+    """get_book, answered from the on-disk book cache when possible.
+
+    A hit does not open the book: chapter texts and headings, metadata,
+    TOC and cover all come from the cache record.
+    """
+    parser = f'epub{PARSER_VERSION}'
+    record = book_cache.load(file_path, parser)
+    if record is not None:
+        try:
+            return _book_from_record(record, resized)
+        except (KeyError, TypeError, ValueError, OSError):
+            pass
+
+    book, chapters, cover_image = get_book(file_path, resized)
+    # The cache record holds every chapter's text, so parse them together.
+    extract_all_texts(chapters)
+    entries = [book_cache.chapter_record(ch.file_name, ch.heading,
+                                         ch.extracted_text)
+               for ch in chapters]
+    for ch, entry in zip(chapters, entries):
+        ch.word_count = entry['words']
+        ch.content_hash = entry['hash']
+    cover_data = cover_name = thumbnail = None
+    for item in book.get_items():
+        if (item.get_type() == ebooklib.ITEM_COVER
+                or (item.get_type() == ebooklib.ITEM_IMAGE
+                    and 'cover' in item.get_name().lower())):
+            cover_data = item.get_content()
+            cover_name = item.get_name()
+            break
+    try:
+        thumbnail = (png_bytes(cover_thumbnail(cover_data))
+                     if cover_data else None)
+    except Exception:
+        thumbnail = None
+    metadata = {key: [value for value, _ in book.get_metadata('DC', key)]
+                for key in _CACHED_METADATA}
+    book_cache.store(file_path, parser, {
+        'metadata': metadata,
+        'toc': _toc_record(book.toc),
+        'chapters': entries,
+        'cover_name': cover_name,
+        'cover': cover_data,
+        'thumbnail': thumbnail,
+    })
+    return (book, chapters, cover_image)
+
+
 def clear_chapter_cache(file_path=None):
     """Clear the chapter cache; if file_path is given, only drop its entries."""
     if file_path is None:
@@ -147,34 +678,95 @@ def _get_chapter_html(chapter):
             return None
 
 
+def _extract_chapters(htmls):
+    """Return _extract_chapter(html) for each of `htmls`, in order.
+
+    Big books are spread over a spawn-context process pool (parsing is
+    CPU-bound, so threads would not help); small ones, or any pool
+    failure, go through the same function in-process.
+    """
+    workers = min(os.cpu_count() or 1, len(htmls))
+    if (workers > 1 and len(htmls) >= PARALLEL_MIN_CHAPTERS
+            and sum(len(h) for h in htmls) >= PARALLEL_MIN_BYTES):
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn')) as pool:
+                return list(pool.map(
+                    _extract_chapter, htmls,
+                    chunksize=max(1, len(htmls) // (workers * 4))))
+        except (OSError, BrokenProcessPool):
+            pass
+    return [_extract_chapter(h) for h in htmls]
+
+
+def _extract_into(pending):
+    """Parse (chapter, html) pairs together with _extract_chapters and
+    store each chapter's extracted_text and heading."""
+    results = _extract_chapters([xml for _, xml in pending])
+    for (chapter, _), (text, heading) in zip(pending, results):
+        chapter.extracted_text = text
+        chapter.heading = heading
+
+
 def find_document_chapters_and_extract_texts(book):
     """Returns every chapter that is an ITEM_DOCUMENT
-    and enriches each chapter with extracted_text."""
+    and enriches each chapter with extracted_text and heading (its first
+    h1/h2/h3/title, or None), both from a single parse.
+
+    Chapters of a book from read_epub_lazy compute both on first access,
+    so they are returned without being parsed here; see extract_all_texts
+    for callers about to read every one of them.
+    """
     document_chapters = []
+    pending = []
     for chapter in book.get_items():
         if not is_valid_chapter(chapter):
             continue
+        if isinstance(chapter, _LazyItemMixin):
+            document_chapters.append(chapter)
+            continue
         xml = _get_chapter_html(chapter)
         if xml is None:
             continue
-        chapter.extracted_text = extract_text_from_html(xml)
         document_chapters.append(chapter)
+        pending.append((chapter, xml))
+    _extract_into(pending)
     return document_chapters
 
 
+def extract_all_texts(chapters):
+    """Extract every lazy chapter's text and heading now.
+
+    Chapters not read yet are parsed together by _extract_chapters, which
+    spreads a big book over a process pool. Worth it only when every text
+    is about to be read anyway; otherwise lazy chapters are cheaper left
+    to parse themselves when first read.
+    """
+    pending = []
+    for chapter in chapters:
+        if (not isinstance(chapter, _LazyItemMixin)
+                or chapter._extracted_text is not None):
+            continue
+        xml = _get_chapter_html(chapter)
+        if xml is None:
+            chapter.extracted_text, chapter.heading = '', None
+            continue
+        pending.append((chapter, xml))
+    _extract_into(pending)
+
+
 def _extract_heading(chapter):
-    """Extract the first heading from a chapter's HTML as a fallback title."""
+    """Extract the first heading from a chapter's HTML as a fallback title.
+
+    Uses the heading found during text extraction when there is one.
+    """
+    if hasattr(chapter, 'heading'):
+        return chapter.heading
     xml = _get_chapter_html(chapter)
     if xml is None:
         return None
-    soup = BeautifulSoup(xml, features='lxml')
-    for tag_name in ['h1', 'h2', 'h3', 'title']:
-        tag = soup.find(tag_name)
-        if tag:
-            text = tag.get_text(strip=True)
-            if text:
-                return text
-    return None
+    return _extract_chapter(xml)[1]
 
 
 def _build_toc_map(toc, result=None):
@@ -253,16 +845,7 @@ def get_description(book):
 
 
 def resized_image(item):
-    image_data = item.get_content()
-    image = Image.open(io.BytesIO(image_data))
-    image.thumbnail((200, 300))
-    ratio = min(200/image.width, 300/image.height)
-    new_size = (int(image.width * ratio), int(image.height * ratio))
-    resized = image.resize(new_size, Image.Resampling.LANCZOS)
-    background = Image.new('RGB', (200, 300), 'gray')
-    offset = ((200 - new_size[0])//2, (300 - new_size[1])//2)
-    background.paste(resized, offset)
-    return ImageTk.PhotoImage(background)
+    return ImageTk.PhotoImage(cover_thumbnail(item.get_content()))
 
 
 def get_cover_image(book, resized):
@@ -0,0 +1,204 @@
+"""Batched, persistently cached espeak fallback for out-of-vocabulary words.
+
+misaki's EspeakFallback phonemizes each OOV token with its own espeak
+round-trip, so a fantasy novel full of invented names pays thousands of
+them per chapter — and again for every chapter and every re-run.
+
+memoize_fallback() wraps `EspeakFallback.__call__` with a cache of its
+results, stored on disk under `~/.autiobooks/cache/espeak`: one JSON file
+per (british, misaki version, espeak-ng version), mapping word → phonemes
+(null when espeak has nothing). prefetch() is the batching pre-pass: before
+a chapter goes through G2P it collects the chapter's words the lexicon
+cannot resolve and phonemizes all the uncached ones in a single espeak
+call. Each raw result is post-processed by the upstream __call__ itself,
+so cached phonemes are exactly what the fallback would have returned.
+"""
+
+import copy
+import json
+import os
+import re
+import threading
+from types import SimpleNamespace
+
+from .cache import CACHE_DIR
+
+
+ESPEAK_CACHE_DIR = CACHE_DIR / 'espeak'
+
+# Words as misaki's lexicon sees them: ASCII letters with inner
+# apostrophes or hyphens (see misaki.en.LEXICON_ORDS).
+_WORD_PATTERN = re.compile(r"[A-Za-z]+(?:['-][A-Za-z]+)*")
+# misaki inline-phoneme markdown `[word](/IPA/)`: already resolved.
+_LINK_PATTERN = re.compile(r'\[([^\]]+)\]\(([^\)]*)\)')
+
+_lock = threading.Lock()
+_caches = {}
+
+
+class PhonemeCache:
+    """word → phonemes for one fallback configuration, backed by a JSON
+    file. New entries are written back by save()."""
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._dirty = {}
+
+    def _load(self):
+        if self._entries is None:
+            try:
+                self._entries = json.loads(
+                    self.path.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def __contains__(self, word):
+        return word in self._load()
+
+    def get(self, word):
+        return self._load().get(word)
+
+    def put(self, word, phonemes):
+        self._load()[word] = phonemes
+        self._dirty[word] = phonemes
+
+    def save(self):
+        """Merge new entries into the file on disk. Failures are
+        non-fatal: the entries stay cached in memory."""
+        if not self._dirty:
+            return
+        try:
+            # Other processes may have added words since we loaded it.
+            on_disk = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            on_disk = {}
+        on_disk.update(self._dirty)
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps(on_disk, ensure_ascii=False),
+                           encoding='utf-8')
+            os.replace(tmp, self.path)
+        except OSError:
+            return
+        self._entries.update(on_disk)
+        self._dirty.clear()
+
+
+def _espeak_version(fallback):
+    try:
+        return '.'.join(str(v) for v in fallback.backend.version())
+    except Exception:
+        return 'unknown'
+
+
+def cache_for(fallback):
+    """Return the PhonemeCache for an EspeakFallback instance."""
+    key = (bool(fallback.british), fallback.version,
+           _espeak_version(fallback))
+    with _lock:
+        cache = _caches.get(key)
+        if cache is None:
+            british, version, espeak = key
+            name = (f"{'gb' if british else 'us'}-{version or 'default'}"
+                    f'-espeak{espeak}.json')
+            cache = _caches[key] = PhonemeCache(ESPEAK_CACHE_DIR / name)
+        return cache
+
+
+def save_all():
+    """Write every cache's new entries to disk."""
+    with _lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        with _lock:
+            cache.save()
+
+
+class _ReplayBackend:
+    """Backend stand-in that returns one precomputed phonemize result."""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def phonemize(self, texts):
+        return [self._raw]
+
+
+def memoize_fallback(fallback_cls):
+    """Patch `fallback_cls.__call__` (misaki.espeak.EspeakFallback) to
+    answer from the on-disk cache. Idempotent."""
+    upstream_call = fallback_cls.__call__
+    if getattr(upstream_call, '_autiobooks_cache_patch', False):
+        return
+
+    def __call__(self, token):
+        cache = cache_for(self)
+        word = token.text
+        with _lock:
+            if word in cache:
+                ps = cache.get(word)
+                return (None, None) if ps is None else (ps, 2)
+        ps, rating = upstream_call(self, token)
+        with _lock:
+            cache.put(word, ps)
+        return ps, rating
+
+    __call__._autiobooks_cache_patch = True
+    __call__._autiobooks_upstream = upstream_call
+    fallback_cls.__call__ = __call__
+
+
+def oov_words(g2p, text):
+    """Return the words of `text` the G2P's lexicon cannot resolve on its
+    own — the ones its espeak fallback will likely be asked about."""
+    text = _LINK_PATTERN.sub(' ', text)
+    lexicon = g2p.lexicon
+    # A default misaki TokenContext.
+    ctx = SimpleNamespace(future_vowel=None, future_to=False)
+    words = []
+    for word in dict.fromkeys(_WORD_PATTERN.findall(text)):
+        stress = (None if word == word.lower()
+                  else lexicon.cap_stresses[int(word == word.upper())])
+        try:
+            ps, _ = lexicon.get_word(word, 'NN', stress, ctx)
+        except Exception:
+            ps = None
+        if ps is None:
+            words.append(word)
+    return words
+
+
+def prefetch(g2p, text):
+    """Phonemize the likely-OOV words of `text` in one espeak call and
+    cache the results. No-op for G2Ps without an espeak fallback."""
+    fallback = getattr(g2p, 'fallback', None)
+    upstream_call = getattr(getattr(type(fallback), '__call__', None),
+                            '_autiobooks_upstream', None)
+    if upstream_call is None or getattr(g2p, 'lexicon', None) is None:
+        return 0
+    cache = cache_for(fallback)
+    words = oov_words(g2p, text)
+    with _lock:
+        words = [w for w in words if w not in cache]
+    if not words:
+        return 0
+    try:
+        raws = fallback.backend.phonemize(words)
+    except Exception:
+        return 0
+    if len(raws) != len(words):
+        # The batch can't be matched back to its words; leave them to the
+        # per-token path.
+        return 0
+    replay = copy.copy(fallback)
+    for word, raw in zip(words, raws):
+        replay.backend = _ReplayBackend(raw)
+        ps, _ = upstream_call(replay, SimpleNamespace(text=word))
+        with _lock:
+            cache.put(word, ps)
+    with _lock:
+        cache.save()
+    return len(words)
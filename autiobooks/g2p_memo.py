@@ -0,0 +1,115 @@
+"""Memoized word-level lookups for misaki's English Lexicon.
+
+`G2P.__call__` resolves every word through `Lexicon.__call__` →
+`get_word` → `lookup` / `stem_s` / `stem_ed` / `stem_ing`, yet a novel
+reuses the same few thousand (word, tag, stress) combinations hundreds of
+thousands of times. memoize_lexicon() wraps `Lexicon.__call__` with a
+bounded LRU per lexicon, keyed by every input the lookup reads:
+
+    token text and alias, POS tag, currency, stress, is_head, num_flags,
+    and the TokenContext (future_vowel, future_to)
+
+The result is a pure function of those plus the (read-only) lexicon
+tables, so a hit returns exactly what the full lookup would have.
+
+The memo is on by default; set config key `g2p_memo` to false (or call
+set_enabled(False)) to bypass it. stats() reports hit counters.
+"""
+
+import threading
+from collections import OrderedDict
+
+from .config import load_config
+
+
+MEMO_SIZE = 50_000
+
+_enabled = bool(load_config().get('g2p_memo', True))
+_counter_lock = threading.Lock()
+_hits = 0
+_misses = 0
+
+
+def set_enabled(enabled):
+    """Turn the memo on or off for every lexicon."""
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+def stats():
+    """Return {'hits', 'misses', 'hit_rate'} across all lexicons since the
+    last reset_stats()."""
+    with _counter_lock:
+        hits, misses = _hits, _misses
+    total = hits + misses
+    return {'hits': hits, 'misses': misses,
+            'hit_rate': hits / total if total else 0.0}
+
+
+def reset_stats():
+    global _hits, _misses
+    with _counter_lock:
+        _hits = _misses = 0
+
+
+class WordMemo:
+    """Thread-safe bounded LRU from lookup key to (phonemes, rating)."""
+
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key, compute):
+        """Return the memoized value for `key`, calling compute() on a
+        miss."""
+        global _hits, _misses
+        with self._lock:
+            value = self._data.get(key, self)
+            if value is not self:
+                self._data.move_to_end(key)
+        if value is not self:
+            with _counter_lock:
+                _hits += 1
+            return value
+        value = compute()
+        with self._lock:
+            self._data[key] = value
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        with _counter_lock:
+            _misses += 1
+        return value
+
+
+def _lookup_key(tk, ctx):
+    u = tk._
+    return (tk.text, u.alias, tk.tag, u.currency, u.stress, u.is_head,
+            u.num_flags, ctx.future_vowel, ctx.future_to)
+
+
+def memoize_lexicon(lexicon_cls):
+    """Patch `lexicon_cls.__call__` (misaki.en.Lexicon) to go through a
+    per-instance WordMemo. Idempotent."""
+    upstream_call = lexicon_cls.__call__
+    if getattr(upstream_call, '_autiobooks_memo_patch', False):
+        return
+
+    def __call__(self, tk, ctx):
+        if not _enabled:
+            return upstream_call(self, tk, ctx)
+        memo = self.__dict__.get('_autiobooks_word_memo')
+        if memo is None:
+            memo = self._autiobooks_word_memo = WordMemo()
+        return memo.get(_lookup_key(tk, ctx),
+                        lambda: upstream_call(self, tk, ctx))
+
+    __call__._autiobooks_memo_patch = True
+    lexicon_cls.__call__ = __call__
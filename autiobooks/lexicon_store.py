@@ -0,0 +1,262 @@
+"""Precompiled, memory-mapped misaki pronunciation lexicons.
+
+misaki's `Lexicon.__init__` parses two ~3 MB JSON files, grows them with
+capitalization variants and walks every value through a vocabulary check —
+seconds of work, repeated by every process that builds a G2P, each ending
+up with a private copy of the same dicts.
+
+This module compiles each (grown, validated) table once into a flat binary
+file under `~/.autiobooks/cache/lexicon` and opens it with mmap, so later
+G2P construction costs a hash of the source JSON plus an mmap, and every
+worker process shares the same page-cache pages. The file is named after a
+digest of the source JSON, which is re-checked on every open: an updated
+lexicon simply gets a new file instead of being served stale.
+
+File layout (native byte order, all offsets relative to their blob):
+
+    header       magic, format version, byte-order mark, flags, entry
+                 count, sha256 of the source JSON
+    key offsets  (count + 1) x uint32
+    val offsets  (count + 1) x uint32
+    key blob     UTF-8 keys, sorted bytewise
+    value blob   b's' + UTF-8 phonemes, or b'd' + JSON for tag-keyed dicts
+"""
+
+import bisect
+import hashlib
+import importlib.resources
+import json
+import mmap
+import os
+import struct
+from collections.abc import Mapping
+
+from .cache import CACHE_DIR
+
+
+LEXICON_DIR = CACHE_DIR / 'lexicon'
+
+_MAGIC = b'ABLX'
+_FORMAT_VERSION = 1
+_BYTE_ORDER_MARK = 0x01020304
+_FLAG_VALIDATED = 1
+_HEADER = struct.Struct('=4sIIII32s')
+_MEMO_SIZE = 1 << 16
+
+
+class LexiconStoreError(Exception):
+    """A lexicon failed validation or a store file is unusable."""
+
+
+def source_digest(raw):
+    """Digest identifying a source JSON file (and the store format)."""
+    h = hashlib.sha256(raw)
+    h.update(_FORMAT_VERSION.to_bytes(4, 'little'))
+    return h.digest()
+
+
+def grow_dictionary(d):
+    """misaki's Lexicon.grow_dictionary: add the capitalized form of
+    lowercase keys and the lowercase form of capitalized ones."""
+    e = {}
+    for k, v in d.items():
+        if len(k) < 2:
+            continue
+        if k == k.lower():
+            if k != k.capitalize():
+                e[k.capitalize()] = v
+        elif k == k.lower().capitalize():
+            e[k.lower()] = v
+    return {**e, **d}
+
+
+def validate(table, vocab):
+    """Check every phoneme string in `table` against `vocab`.
+
+    This is the check misaki's Lexicon runs on every construction; here it
+    runs once, when the store is built. Raises LexiconStoreError.
+    """
+    for key, value in table.items():
+        if isinstance(value, str):
+            values = [value]
+        elif isinstance(value, dict):
+            if 'DEFAULT' not in value:
+                raise LexiconStoreError(f'{key!r}: tagged entry has no DEFAULT')
+            values = [v for v in value.values() if v is not None]
+        else:
+            raise LexiconStoreError(f'{key!r}: unexpected value {value!r}')
+        for v in values:
+            bad = set(v) - vocab
+            if bad:
+                raise LexiconStoreError(
+                    f'{key!r}: phonemes outside the vocabulary: '
+                    f'{"".join(sorted(bad))}')
+
+
+def build(path, table, digest, validated=False):
+    """Write `table` ({str: str | dict}) to `path` atomically."""
+    items = sorted((k.encode('utf-8'), v) for k, v in table.items())
+    key_offsets = [0]
+    val_offsets = [0]
+    keys = bytearray()
+    values = bytearray()
+    for key, value in items:
+        keys += key
+        key_offsets.append(len(keys))
+        if isinstance(value, str):
+            values += b's' + value.encode('utf-8')
+        else:
+            values += b'd' + json.dumps(
+                value, ensure_ascii=False, separators=(',', ':')
+            ).encode('utf-8')
+        val_offsets.append(len(values))
+    if max(len(keys), len(values)) >= 1 << 32:
+        raise LexiconStoreError('lexicon too large for 32-bit offsets')
+
+    header = _HEADER.pack(_MAGIC, _FORMAT_VERSION, _BYTE_ORDER_MARK,
+                          _FLAG_VALIDATED if validated else 0,
+                          len(items), digest)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Worker processes may race to build the same store; each writes its own
+    # temp file and the last os.replace wins with identical content.
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.part')
+    try:
+        with open(tmp, 'wb') as f:
+            f.write(header)
+            f.write(struct.pack(f'={len(key_offsets)}I', *key_offsets))
+            f.write(struct.pack(f'={len(val_offsets)}I', *val_offsets))
+            f.write(keys)
+            f.write(values)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+        raise
+
+
+class MappedLexicon(Mapping):
+    """Read-only {word: phonemes} mapping backed by a store file.
+
+    Lookups binary-search the sorted key blob in place; nothing is decoded
+    until a key is compared or a value returned. Tag-keyed values come back
+    as fresh dicts, so callers cannot corrupt the shared table.
+    """
+
+    def __init__(self, path, digest=None, require_validated=False):
+        with open(path, 'rb') as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as e:  # empty file
+                raise LexiconStoreError(f'{path}: {e}') from None
+        try:
+            magic, version, bom, flags, count, stored = \
+                _HEADER.unpack_from(self._mm)
+        except struct.error:
+            raise LexiconStoreError(f'{path}: truncated header') from None
+        if (magic != _MAGIC or version != _FORMAT_VERSION
+                or bom != _BYTE_ORDER_MARK):
+            raise LexiconStoreError(f'{path}: not a lexicon store')
+        if digest is not None and stored != digest:
+            raise LexiconStoreError(f'{path}: built from different source')
+        if require_validated and not flags & _FLAG_VALIDATED:
+            raise LexiconStoreError(f'{path}: built without validation')
+        self._count = count
+        # G2P asks about the same few thousand words over and over (often
+        # several times per token); remember where they were found.
+        self._memo = {}
+        offsets_end = _HEADER.size + 8 * (count + 1)
+        offsets = memoryview(self._mm)[_HEADER.size:offsets_end].cast('I')
+        self._key_offsets = offsets[:count + 1]
+        self._val_offsets = offsets[count + 1:]
+        self._keys_base = offsets_end
+        self._values_base = offsets_end + self._key_offsets[count]
+        if self._values_base + self._val_offsets[count] != len(self._mm):
+            raise LexiconStoreError(f'{path}: size does not match header')
+
+    def _key_at(self, i):
+        base = self._keys_base
+        return self._mm[base + self._key_offsets[i]:
+                        base + self._key_offsets[i + 1]]
+
+    def _value_at(self, i):
+        base = self._values_base
+        raw = self._mm[base + self._val_offsets[i]:
+                       base + self._val_offsets[i + 1]]
+        if raw[:1] == b's':
+            return raw[1:].decode('utf-8')
+        return json.loads(raw[1:])
+
+    def _index(self, key):
+        if not isinstance(key, str):
+            return -1
+        i = self._memo.get(key)
+        if i is not None:
+            return i
+        try:
+            target = key.encode('utf-8')
+        except UnicodeEncodeError:
+            return -1
+        i = bisect.bisect_left(range(self._count), target, key=self._key_at)
+        if i >= self._count or self._key_at(i) != target:
+            i = -1
+        if len(self._memo) >= _MEMO_SIZE:
+            self._memo.clear()
+        self._memo[key] = i
+        return i
+
+    def __getitem__(self, key):
+        i = self._index(key)
+        if i < 0:
+            raise KeyError(key)
+        return self._value_at(i)
+
+    def get(self, key, default=None):
+        i = self._index(key)
+        return default if i < 0 else self._value_at(i)
+
+    def __contains__(self, key):
+        return self._index(key) >= 0
+
+    def __len__(self):
+        return self._count
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._key_at(i).decode('utf-8')
+
+
+def open_table(data_package, name, vocab=None):
+    """Return a MappedLexicon of JSON resource `name` in `data_package`,
+    grown with grow_dictionary.
+
+    The store is (re)built first if it is missing or was built from
+    different source JSON. With `vocab`, the table is validated against it
+    when built (and a store built without validation is rebuilt).
+    """
+    raw = importlib.resources.files(data_package).joinpath(name).read_bytes()
+    digest = source_digest(raw)
+    stem = name.rsplit('.', 1)[0]
+    path = LEXICON_DIR / f'{stem}-{digest.hex()[:16]}.lex'
+    try:
+        return MappedLexicon(path, digest, require_validated=bool(vocab))
+    except (OSError, LexiconStoreError):
+        pass
+    table = grow_dictionary(json.loads(raw))
+    if vocab:
+        validate(table, vocab)
+    build(path, table, digest, validated=bool(vocab))
+    return MappedLexicon(path, digest)
+
+
+def open_lexicon(data_package, british, vocab=None):
+    """Return (golds, silvers) for misaki's US or GB lexicon.
+
+    Only gold is validated against `vocab`, matching misaki's own checks.
+    """
+    region = 'gb' if british else 'us'
+    return (
+        open_table(data_package, f'{region}_gold.json', vocab),
+        open_table(data_package, f'{region}_silver.json'),
+    )
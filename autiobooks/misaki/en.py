@@ -146,6 +146,16 @@ class Lexicon:
         self.cap_stresses = (0.5, 2)
         self.golds = {}
         self.silvers = {}
+        # autiobooks: serve the grown, pre-validated tables from a shared
+        # mmap store instead of re-parsing the JSON in every process (see
+        # autiobooks/lexicon_store.py). Falls back to the upstream load.
+        try:
+            from ..lexicon_store import open_lexicon
+            self.golds, self.silvers = open_lexicon(
+                data, british, GB_VOCAB if british else US_VOCAB)
+            return
+        except Exception:
+            pass
         with importlib.resources.open_text(data, f"{'gb' if british else 'us'}_gold.json") as r:
             self.golds = Lexicon.grow_dictionary(json.load(r))
         with importlib.resources.open_text(data, f"{'gb' if british else 'us'}_silver.json") as r:
@@ -501,6 +511,10 @@ class Lexicon:
         #         return apply_stress(self.append_currency(ps, tk._.currency), tk._.stress), rating
         return None, None
 
+# autiobooks: memoize word lookups; see autiobooks/g2p_memo.py.
+from ..g2p_memo import memoize_lexicon
+memoize_lexicon(Lexicon)
+
 class G2P:
     def __init__(self, version=None, trf=False, british=False, fallback=None, unk='❓'):
         self.version = version
@@ -59,6 +59,10 @@ class EspeakFallback:
             ps = ps.replace('ɾ', 'T').replace('ʔ', 't')
         return ps.replace('^', ''), 2
 
+# autiobooks: cache fallback results on disk; see autiobooks/espeak_cache.py.
+from ..espeak_cache import memoize_fallback
+memoize_fallback(EspeakFallback)
+
 # EspeakG2P used for most non-English/CJK languages
 class EspeakG2P:
     def __init__(self, language, version=None):
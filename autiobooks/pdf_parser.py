@@ -1,18 +1,142 @@
 """PDF parsing support using pypdf (BSD licensed)."""
 
 import io
+import multiprocessing
+import os
 import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image, ImageTk
 from pypdf import PdfReader
 
+from . import book_cache
+from .covers import cover_thumbnail, png_bytes
+
+# Bump when extraction changes, so cached parses are not reused.
+PARSER_VERSION = 4
+
+PAGES_PER_CHAPTER = 10
+
+# Running headers and footers: a line among the first or last
+# RUNNING_LINE_DEPTH lines of a page is boilerplate when the same
+# (normalized) line sits at the same position on at least
+# RUNNING_LINE_MIN_PAGES pages, covering at least RUNNING_LINE_MIN_DENSITY
+# of the pages from its first occurrence to its last. Alternating
+# verso/recto headers cover about half; a stray repeated line of prose
+# covers almost none.
+RUNNING_LINE_DEPTH = 2
+RUNNING_LINE_MIN_PAGES = 3
+RUNNING_LINE_MIN_DENSITY = 0.4
+# Headers and footers are a few lines per page; if more than this share of
+# all lines qualifies, the pages are templated text, not boilerplate.
+RUNNING_LINE_MAX_SHARE = 0.5
+# A lazily loaded book detects its running lines on a sample of this many
+# runs of consecutive pages, spread over the book (an even run length
+# shows verso and recto heads alike), plus each chapter's own pages.
+RUNNING_LINE_SAMPLE_RUNS = 4
+RUNNING_LINE_SAMPLE_PAGES = 6
+
+_RE_DIGITS = re.compile(r'\d+')
+
+# A chapter head ("CHAPTER", "Chapter 12", "Part Two", "Book IV") opens
+# every chapter of a book with short chapters, at the same spot on the
+# page, so it can look like a running line; it is never treated as one.
+# Matched against a line's key text (casefolded, digits masked).
+_NUMBER_WORD = (r'(?:one|two|three|four|five|six|seven|eight|nine|ten'
+                r'|eleven|twelve|(?:thir|four|fif|six|seven|eigh|nine)teen'
+                r'|(?:twen|thir|for|fif|six|seven|eigh|nine)ty|hundred)')
+_RE_CHAPTER_HEAD = re.compile(
+    r'(?:chapter|part|book|section|act)'
+    rf'(?: (?:#|[ivxlc]+|{_NUMBER_WORD}(?:[ -]{_NUMBER_WORD})*))?[.:]?')
+
+# PDFs with fewer pages to extract than this are extracted in-process:
+# starting a worker pool (each worker re-opens the PDF) costs more than it
+# saves.
+PARALLEL_MIN_PAGES = 64
+
 
 class PdfChapter:
-    """Mimics ebooklib chapter interface for compatibility."""
+    """Mimics ebooklib chapter interface for compatibility.
+
+    `page_range` is the chapter's (first, last) page, 1-based and inclusive.
+    """
 
-    def __init__(self, title, text, file_name):
+    def __init__(self, title, text, file_name, page_range=None):
         self.extracted_text = text
         self.display_title = title
         self.file_name = file_name
+        self.page_range = page_range
+
+
+class _LazyPdfChapter(PdfChapter):
+    """PdfChapter whose extracted_text is only extracted from its pages
+    the first time it is read (see get_pdf_book's `lazy`)."""
+
+    def __init__(self, title, file_name, source, start, end):
+        super().__init__(title, None, file_name, (start + 1, end))
+        self._source = source
+        self._pages = range(start, end)
+
+    @property
+    def extracted_text(self):
+        if self._text is None:
+            self._text = _chapter_text(self._source.page_texts(self._pages))
+        return self._text
+
+    @extracted_text.setter
+    def extracted_text(self, value):
+        self._text = value
+
+
+class _PageSource:
+    """A PDF's chapter pages, extracted on demand by a reader opened on
+    first use.
+
+    Shared by the chapters of a lazily loaded book. Each read extracts
+    only the pages it needs, and every page's raw text is kept, so no page
+    is extracted twice. Running lines are those found on a sample of the
+    book (see _running_line_sample), taken on the first read, together
+    with those found on the chapter's own pages. A book no longer than
+    the sample is extracted whole on the first read and stripped across
+    all its pages, exactly as an eager load does. A lock keeps a preview
+    thread and the main thread from driving the reader at once.
+    """
+
+    def __init__(self, file_path, pages, reader=None):
+        self.file_path = file_path
+        self._pages = pages
+        self._reader = reader
+        self._raw = {}
+        self._texts = None
+        self._running = None
+        self._lock = threading.Lock()
+
+    def _extract(self, pages):
+        missing = [i for i in pages if i not in self._raw]
+        if missing:
+            if self._reader is None:
+                self._reader = PdfReader(self.file_path)
+            self._raw.update(zip(missing, _extract_pages(
+                self.file_path, self._reader, missing)))
+        return [self._raw[i] for i in pages]
+
+    def page_texts(self, pages):
+        with self._lock:
+            if self._texts is None and self._running is None:
+                sample = _running_line_sample(self._pages)
+                if len(sample) == len(self._pages):
+                    self._texts = dict(zip(self._pages, _strip_running_lines(
+                        self._extract(self._pages))))
+                    self._raw.clear()
+                else:
+                    self._running = _find_running_lines(
+                        _page_lines(self._extract(sample)))
+            if self._texts is not None:
+                return [self._texts[i] for i in pages]
+            lines = _page_lines(self._extract(pages))
+            return _drop_running_lines(
+                lines, self._running | _find_running_lines(lines))
 
 
 class PdfBook:
@@ -29,6 +153,81 @@ class PdfBook:
         return []
 
 
+def _running_line_keys(lines):
+    """Yield (line index, key) for each line near the top or bottom of a
+    page. A key is the line's position plus its normalized text, with
+    page numbers and other digits masked."""
+    depth = min(RUNNING_LINE_DEPTH, len(lines))
+    for pos in range(depth):
+        for end, i in (('top', pos), ('bottom', len(lines) - 1 - pos)):
+            norm = ' '.join(_RE_DIGITS.sub('#', lines[i]).casefold().split())
+            yield i, (end, pos, norm)
+
+
+def _strip_running_lines(page_texts):
+    """Remove running headers and footers from consecutive pages.
+
+    `page_texts` holds each page's extracted text (or None), in page order.
+    Returns the pages' remaining non-blank lines, joined (see
+    _find_running_lines and _drop_running_lines).
+    """
+    pages = _page_lines(page_texts)
+    return _drop_running_lines(pages, _find_running_lines(pages))
+
+
+def _page_lines(page_texts):
+    """Split each page's text (or None) into its non-blank lines."""
+    return [[line for line in (text or '').split('\n') if line.strip()]
+            for text in page_texts]
+
+
+def _find_running_lines(pages):
+    """Return the keys of the running lines among consecutive pages' lines.
+
+    One pass indexes every top/bottom line key by the pages it appears on;
+    a key is a running line when it qualifies as boilerplate (see
+    RUNNING_LINE_MIN_PAGES and RUNNING_LINE_MIN_DENSITY) and is not a
+    chapter head.
+    """
+    seen = {}  # key -> [pages, first page, last page]
+    for n, lines in enumerate(pages):
+        for key in {key for _, key in _running_line_keys(lines)}:
+            entry = seen.get(key)
+            if entry is None:
+                seen[key] = [1, n, n]
+            else:
+                entry[0] += 1
+                entry[2] = n
+    return {key for key, (count, first, last) in seen.items()
+            if count >= RUNNING_LINE_MIN_PAGES
+            and count >= RUNNING_LINE_MIN_DENSITY * (last - first + 1)
+            and not _RE_CHAPTER_HEAD.fullmatch(key[2])}
+
+
+def _drop_running_lines(pages, running):
+    """Join each page's lines, without those whose key is in `running`,
+    unless that would drop more than RUNNING_LINE_MAX_SHARE of all lines."""
+    drops = [{i for i, key in _running_line_keys(lines) if key in running}
+             for lines in pages] if running else []
+    if (not running or sum(map(len, drops))
+            > RUNNING_LINE_MAX_SHARE * sum(map(len, pages))):
+        return ['\n'.join(lines) for lines in pages]
+    return ['\n'.join(line for i, line in enumerate(lines) if i not in drop)
+            for lines, drop in zip(pages, drops)]
+
+
+def _running_line_sample(pages):
+    """Return RUNNING_LINE_SAMPLE_RUNS runs of RUNNING_LINE_SAMPLE_PAGES
+    consecutive entries of `pages`, spread evenly from its first entry to
+    its last; all of `pages` if it is no longer than that."""
+    runs, size = RUNNING_LINE_SAMPLE_RUNS, RUNNING_LINE_SAMPLE_PAGES
+    if len(pages) <= runs * size:
+        return list(pages)
+    span = len(pages) - size
+    return [pages[r * span // (runs - 1) + k]
+            for r in range(runs) for k in range(size)]
+
+
 def _clean_pdf_text(text):
     """Clean text extracted from PDF pages."""
     text = re.sub(r'^\s*\d+\s*$', '', text, flags=re.MULTILINE)
@@ -41,16 +240,90 @@ def _clean_pdf_text(text):
     return '\n'.join(lines)
 
 
-def get_pdf_book(file_path, resized=True):
+def get_pdf_book(file_path, resized=True, lazy=False):
     """Parse a PDF file and return (book, chapters, cover_image).
 
     Uses the PDF's outline (bookmarks) for chapter structure. Falls back
     to page groups if no outline is present.
+
+    With `lazy`, no page text is extracted up front: a chapter's pages are
+    extracted the first time its extracted_text is read (along with a
+    sample of the book for running-line detection, on the first read;
+    see _PageSource), and chapters without text are kept (with empty
+    text) rather than dropped.
     """
     reader = PdfReader(file_path)
+    metadata = _get_metadata(reader)
+    cover_image = _extract_cover(reader, resized)
+    outline, chapters = _get_chapters(file_path, reader, lazy)
+    book = PdfBook(metadata, _build_book_toc(outline) if outline else [])
+    return (book, chapters, cover_image)
+
+
+def get_pdf_book_cached(file_path, resized=True, lazy=False):
+    """get_pdf_book through the on-disk book cache (see book_cache).
+
+    A cached PDF is rebuilt from its stored chapters, outline, metadata and
+    cover without opening it. A lazy load that misses the cache is not
+    stored, since its text has not been extracted.
+    """
+    parser = f'pdf{PARSER_VERSION}'
+    record = book_cache.load(file_path, parser)
+    if record is not None:
+        try:
+            return _book_from_record(record, resized)
+        except (KeyError, TypeError, ValueError, OSError):
+            pass
+    if lazy:
+        return get_pdf_book(file_path, resized, lazy=True)
+
+    reader = PdfReader(file_path)
+    metadata = _get_metadata(reader)
+    outline, chapters = _get_chapters(file_path, reader)
+    cover = _extract_cover_image(reader)
+    try:
+        cover_png = png_bytes(cover) if cover else None
+        thumbnail_png = png_bytes(cover_thumbnail(cover)) if cover else None
+    except Exception:
+        cover_png = thumbnail_png = None
+    record = {
+        'metadata': metadata,
+        'outline': outline,
+        'chapters': [dict(book_cache.chapter_record(ch.file_name,
+                                                    ch.display_title,
+                                                    ch.extracted_text),
+                          pages=ch.page_range)
+                     for ch in chapters],
+        'cover': cover_png,
+        'thumbnail': thumbnail_png,
+    }
+    book_cache.store(file_path, parser, record)
+    return _book_from_record(record, resized)
 
+
+def _book_from_record(record, resized):
+    outline = [tuple(entry) for entry in record['outline'] or []]
+    book = PdfBook(record['metadata'],
+                   _build_book_toc(outline) if outline else [])
+    chapters = []
+    for entry in record['chapters']:
+        ch = PdfChapter(entry['title'], entry['text'], entry['file_name'],
+                        tuple(entry['pages']))
+        ch.word_count = entry['words']
+        ch.content_hash = entry['hash']
+        chapters.append(ch)
+    if resized:
+        thumbnail = record['thumbnail']
+        cover_image = (ImageTk.PhotoImage(Image.open(io.BytesIO(thumbnail)))
+                       if thumbnail else None)
+    else:
+        cover_image = record['cover']
+    return (book, chapters, cover_image)
+
+
+def _get_metadata(reader):
     meta = reader.metadata or {}
-    metadata = {
+    return {
         'DC:title': getattr(meta, 'title', '') or '',
         'DC:creator': getattr(meta, 'author', '') or '',
         'DC:publisher': '',
@@ -58,18 +331,80 @@ def get_pdf_book(file_path, resized=True):
         'DC:description': getattr(meta, 'subject', '') or '',
     }
 
-    cover_image = _extract_cover(reader, resized)
 
+def _get_chapters(file_path, reader, lazy=False):
+    """Return (outline, chapters); outline is None when the chapters are
+    page groups."""
     outline = _get_outline(reader)
+    total_pages = len(reader.pages)
     if outline and len(outline) > 1:
-        chapters = _chapters_from_outline(reader, outline)
-        book_toc = _build_book_toc(outline)
+        spans = _outline_spans(outline, total_pages)
     else:
-        chapters = _chapters_from_pages(reader)
-        book_toc = []
+        outline = None
+        spans = _page_group_spans(total_pages)
+
+    needed = sorted({i for _, _, start, end in spans
+                     for i in range(start, end)})
+    if lazy:
+        source = _PageSource(file_path, needed, reader)
+        return outline, [_LazyPdfChapter(title, file_name, source,
+                                         start, end)
+                         for title, file_name, start, end in spans]
+
+    page_texts = _book_page_texts(file_path, reader, needed)
+    chapters = []
+    for title, file_name, start, end in spans:
+        text = _chapter_text(page_texts[i] for i in range(start, end))
+        if text.strip():
+            chapters.append(PdfChapter(title, text, file_name,
+                                       (start + 1, end)))
+    return outline, chapters
+
+
+def _book_page_texts(file_path, reader, pages):
+    """Extract `pages` and strip their running lines in one whole-book
+    pass. Returns {page index: text}."""
+    return dict(zip(pages, _strip_running_lines(
+        _extract_pages(file_path, reader, pages))))
+
+
+def _chapter_text(page_texts):
+    """Join a chapter's page texts (None for pages without text)."""
+    return _clean_pdf_text('\n'.join(
+        t for t in page_texts if t and t.strip()))
 
-    book = PdfBook(metadata, book_toc)
-    return (book, chapters, cover_image)
+
+def _extract_page_range(file_path, pages):
+    """Extract the text of `pages` with a reader of our own. Runs in an
+    extraction worker process."""
+    reader = PdfReader(file_path)
+    return [reader.pages[i].extract_text() for i in pages]
+
+
+def _extract_pages(file_path, reader, pages):
+    """Return the text of each of `pages`, in order.
+
+    Long page lists are split into contiguous runs and spread over a
+    spawn-context process pool, each worker opening its own PdfReader
+    (page extraction is CPU-bound pure Python, and a reader cannot be
+    shared across processes). Short lists, single-core machines and pool
+    failures use `reader` in-process.
+    """
+    workers = min(os.cpu_count() or 1, len(pages) // 16)
+    if (workers > 1 and len(pages) >= PARALLEL_MIN_PAGES
+            and isinstance(file_path, (str, os.PathLike))):
+        size = -(-len(pages) // (workers * 2))
+        runs = [pages[i:i + size] for i in range(0, len(pages), size)]
+        try:
+            with ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context('spawn')) as pool:
+                results = pool.map(_extract_page_range,
+                                   [file_path] * len(runs), runs)
+                return [text for run in results for text in run]
+        except (OSError, BrokenProcessPool):
+            pass
+    return [reader.pages[i].extract_text() for i in pages]
 
 
 def _get_outline(reader):
@@ -105,6 +440,19 @@ def _get_outline(reader):
 
 def _extract_cover(reader, resized):
     """Extract cover image from the first page's resources."""
+    img = _extract_cover_image(reader)
+    if img is None:
+        return None
+    try:
+        if resized:
+            return ImageTk.PhotoImage(cover_thumbnail(img))
+        return png_bytes(img)
+    except Exception:
+        return None
+
+
+def _extract_cover_image(reader):
+    """Return the first page's cover image as a PIL image, or None."""
     try:
         page = reader.pages[0]
         x_object = page.get('/Resources', {}).get('/XObject', {})
@@ -135,72 +483,35 @@ def _extract_cover(reader, resized):
                         continue
                 else:
                     continue
-
-                if resized:
-                    img.thumbnail((200, 300))
-                    ratio = min(200 / img.width, 300 / img.height)
-                    new_size = (int(img.width * ratio), int(img.height * ratio))
-                    img = img.resize(new_size, Image.Resampling.LANCZOS)
-                    background = Image.new('RGB', (200, 300), 'gray')
-                    offset = ((200 - new_size[0]) // 2,
-                              (300 - new_size[1]) // 2)
-                    background.paste(img, offset)
-                    return ImageTk.PhotoImage(background)
-                else:
-                    buf = io.BytesIO()
-                    img.save(buf, format='PNG')
-                    return buf.getvalue()
+                img.load()
+                return img
     except Exception:
         pass
     return None
 
 
-def _chapters_from_outline(reader, outline):
-    """Build chapters from PDF outline entries."""
-    chapters = []
-    total_pages = len(reader.pages)
-
+def _outline_spans(outline, total_pages):
+    """Return (title, file_name, start, end) for each outline entry: its
+    pages run up to the next entry's start page (0-based, end exclusive)."""
+    spans = []
     for i, (level, title, start_page) in enumerate(outline):
         if i + 1 < len(outline):
             end_page = outline[i + 1][2]
         else:
             end_page = total_pages
+        spans.append((title, f'page_{start_page + 1}.pdf', start_page,
+                      max(start_page, min(end_page, total_pages))))
+    return spans
 
-        text_parts = []
-        for page_idx in range(start_page, min(end_page, total_pages)):
-            page_text = reader.pages[page_idx].extract_text()
-            if page_text and page_text.strip():
-                text_parts.append(page_text)
 
-        text = _clean_pdf_text('\n'.join(text_parts))
-        if text.strip():
-            ch = PdfChapter(title, text, f'page_{start_page + 1}.pdf')
-            chapters.append(ch)
-
-    return chapters
-
-
-def _chapters_from_pages(reader):
+def _page_group_spans(total_pages):
     """Fall back to one chapter per page group (~10 pages each)."""
-    PAGES_PER_CHAPTER = 10
-    chapters = []
-    total = len(reader.pages)
-
-    for start in range(0, total, PAGES_PER_CHAPTER):
-        end = min(start + PAGES_PER_CHAPTER, total)
-        text_parts = []
-        for page_idx in range(start, end):
-            page_text = reader.pages[page_idx].extract_text()
-            if page_text and page_text.strip():
-                text_parts.append(page_text)
-
-        text = _clean_pdf_text('\n'.join(text_parts))
-        if text.strip():
-            title = f'Pages {start + 1}-{end}'
-            ch = PdfChapter(title, text, f'pages_{start+1}_{end}.pdf')
-            chapters.append(ch)
-
-    return chapters
+    spans = []
+    for start in range(0, total_pages, PAGES_PER_CHAPTER):
+        end = min(start + PAGES_PER_CHAPTER, total_pages)
+        spans.append((f'Pages {start + 1}-{end}',
+                       f'pages_{start+1}_{end}.pdf', start, end))
+    return spans
 
 
 def _build_book_toc(outline):
@@ -0,0 +1,119 @@
+"""One ffprobe per media file.
+
+Durations, chapter lists and metadata tags used to come from separate
+ffprobe runs over the same file. probe() fetches format, streams and
+chapters in a single `ffprobe -show_format -show_streams -show_chapters`
+call and remembers the result per (path, size, mtime), so asking about an
+unchanged file again spawns nothing. Files probed together (prefetch) go
+through a small shared thread pool, which bounds how many ffprobe
+processes run at once.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Mirror of engine._SUBPROCESS_FLAGS — duplicated here so probing does not
+# have to import the TTS engine.
+if sys.platform == 'win32':
+    _SUBPROCESS_FLAGS = {'creationflags': subprocess.CREATE_NO_WINDOW}
+else:
+    _SUBPROCESS_FLAGS = {}
+
+MAX_WORKERS = 8
+CACHE_MAX_ENTRIES = 1024
+TIMEOUT = 30
+
+_cache = OrderedDict()  # (abspath, size, mtime_ns) -> probe result
+_lock = threading.Lock()
+_pool = None
+
+
+def _cache_key(path):
+    st = os.stat(path)
+    return os.path.abspath(path), st.st_size, st.st_mtime_ns
+
+
+def _run_ffprobe(path):
+    result = subprocess.run([
+        'ffprobe', '-v', 'quiet',
+        '-print_format', 'json',
+        '-show_format', '-show_streams', '-show_chapters',
+        str(path)
+    ], capture_output=True, text=True, encoding='utf-8', check=True,
+       timeout=TIMEOUT, **_SUBPROCESS_FLAGS)
+    info = json.loads(result.stdout)
+    return {
+        'format': info.get('format', {}),
+        'streams': info.get('streams', []),
+        'chapters': info.get('chapters', []),
+    }
+
+
+def probe(path):
+    """Return {'format', 'streams', 'chapters'} for the media file at
+    `path`, as ffprobe's JSON reports them. Treat the result as read-only:
+    it is shared with later calls.
+
+    Raises FileNotFoundError, subprocess.CalledProcessError,
+    subprocess.TimeoutExpired or ValueError (unreadable output).
+    """
+    key = _cache_key(path)
+    with _lock:
+        info = _cache.get(key)
+        if info is not None:
+            _cache.move_to_end(key)
+            return info
+    info = _run_ffprobe(path)
+    with _lock:
+        _cache[key] = info
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return info
+
+
+def _get_pool():
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=MAX_WORKERS,
+                                       thread_name_prefix='ffprobe')
+        return _pool
+
+
+def prefetch(paths):
+    """Probe `paths` on the shared pool and wait for them, so probe()
+    calls for them that follow are cache hits. Failures are left for those
+    calls to raise."""
+    paths = list(dict.fromkeys(paths))
+    if len(paths) > 1:
+        pool = _get_pool()
+        wait([pool.submit(probe, p) for p in paths])
+
+
+def duration(path):
+    """Return the duration in seconds of the media file at `path`."""
+    try:
+        return float(probe(path)['format']['duration'])
+    except KeyError:
+        raise ValueError(f'ffprobe reported no duration for {path}') from None
+
+
+def chapters(path):
+    """Return the chapter dicts of the media file at `path`."""
+    return probe(path)['chapters']
+
+
+def format_tags(path):
+    """Return the format-level metadata tags of the media file at `path`."""
+    return probe(path)['format'].get('tags', {})
+
+
+def clear():
+    """Forget every cached probe result."""
+    with _lock:
+        _cache.clear()
@@ -1,3 +1,5 @@
+import functools
+import json
 import re
 import sys
 import unicodedata
@@ -38,14 +40,43 @@ HETERONYMS = {
 }
 
 
-def resolve_heteronyms(text):
-    """Use spaCy POS tagging to add phoneme hints for ambiguous words."""
+def _parse(text):
+    """Return the spaCy Doc for `text`, or None when spaCy or its English
+    model is unavailable (every spaCy-driven pass is then a no-op)."""
     if not HAS_SPACY:
-        return text
+        return None
     nlp = _get_nlp()
     if nlp is None:
+        return None
+    return nlp(text)
+
+
+def _apply_edits(text, edits):
+    """Apply non-overlapping (start, end, replacement) span edits made
+    against `text`, all resolved in one pass."""
+    if not edits:
+        return text
+    parts = []
+    pos = 0
+    for start, end, replacement in sorted(edits):
+        parts.append(text[pos:start])
+        parts.append(replacement)
+        pos = end
+    parts.append(text[pos:])
+    return ''.join(parts)
+
+
+def resolve_heteronyms(text):
+    """Use spaCy POS tagging to add phoneme hints for ambiguous words."""
+    doc = _parse(text)
+    if doc is None:
         return text
-    doc = nlp(text)
+    return _apply_edits(text, _heteronym_edits(text, doc))
+
+
+def _heteronym_edits(text, doc, skip=()):
+    """Span edits for resolve_heteronyms. Tokens starting at an offset in
+    `skip` were already rewritten by another rule and are left alone."""
     replacements = []
     for token in doc:
         lower = token.text.lower()
@@ -56,7 +87,7 @@ def resolve_heteronyms(text):
         # Skip tokens already wrapped in `[word](/IPA/)` so a respelling
         # can't mutate the bracket display text emitted by an earlier pass
         # (apply_contextual_overrides) or by user phoneme overrides.
-        if _is_inside_markdown(text, start, end):
+        if start in skip or _is_inside_markdown(text, start, end):
             continue
         rules = HETERONYMS[lower]
         if token.tag_ in ('VBD', 'VBN'):
@@ -65,10 +96,7 @@ def resolve_heteronyms(text):
             hint = rules['present']
         if hint != lower:
             replacements.append((start, end, hint))
-
-    for start, end, hint in reversed(replacements):
-        text = text[:start] + hint + text[end:]
-    return text
+    return replacements
 
 
 # --- Contextual heteronym overrides ---
@@ -338,12 +366,14 @@ def apply_contextual_overrides(text):
     Skips tokens already wrapped in `[word](/IPA/)` so user-configured phoneme
     overrides (which run later) stay authoritative.
     """
-    if not HAS_SPACY:
+    doc = _parse(text)
+    if doc is None:
         return text
-    nlp = _get_nlp()
-    if nlp is None:
-        return text
-    doc = nlp(text)
+    return _apply_edits(text, _contextual_edits(text, doc))
+
+
+def _contextual_edits(text, doc):
+    """Span edits for apply_contextual_overrides."""
     replacements = []
     for token in doc:
         rule = _CONTEXTUAL_RULES.get(token.text.lower())
@@ -358,22 +388,21 @@ def apply_contextual_overrides(text):
             continue
         ipa = _to_misaki_phonemes(ipa)
         replacements.append((start, end, f'[{token.text}](/{ipa}/)'))
-
-    for start, end, hint in reversed(replacements):
-        text = text[:start] + hint + text[end:]
-    return text
+    return replacements
 
 
 # --- Contraction resolution ---
 
 def resolve_contractions(text):
     """Expand ambiguous contractions using spaCy POS context."""
-    if not HAS_SPACY:
-        return text
-    nlp = _get_nlp()
-    if nlp is None:
+    doc = _parse(text)
+    if doc is None:
         return text
-    doc = nlp(text)
+    return _apply_edits(text, _contraction_edits(doc))
+
+
+def _contraction_edits(doc):
+    """Span edits for resolve_contractions."""
     replacements = []
     for i, token in enumerate(doc):
         if token.text.lower() == "'s":
@@ -393,10 +422,95 @@ def resolve_contractions(text):
             elif nxt and nxt.pos_ in ('VERB', 'AUX'):
                 replacements.append(
                     (token.idx, token.idx + len(token.text), ' would'))
-
-    for start, end, expansion in reversed(replacements):
-        text = text[:start] + expansion + text[end:]
-    return text
+    return replacements
+
+
+def _context_edits(text, doc, heteronyms, contractions):
+    """All of resolve_context's span edits for one parsed text."""
+    edits = []
+    if heteronyms:
+        contextual = _contextual_edits(text, doc)
+        edits.extend(contextual)
+        edits.extend(_heteronym_edits(
+            text, doc, skip={start for start, _, _ in contextual}))
+    if contractions:
+        edits.extend(_contraction_edits(doc))
+    return edits
+
+
+# Every rule above fires only on a handful of trigger tokens; a text
+# containing none of them cannot produce an edit, so it is never parsed.
+# The texts are whole chapters (or chapter parts), so only a chapter with
+# no trigger word at all is skipped. With contractions on, `'s` alone
+# appears in nearly every chapter, so in practice the filter saves little
+# there; scripts/bench_context_filter.py measures it for a given book.
+# The lookarounds stop at letters only (not `\b`), because spaCy splits
+# digits and underscores off words but never splits a run of letters.
+_NOT_LETTER_BEFORE = r'(?<![^\W\d_])'
+_NOT_LETTER_AFTER = r'(?![^\W\d_])'
+
+
+@functools.lru_cache(maxsize=None)
+def _candidate_pattern(heteronyms, contractions):
+    """Compiled keyword index of resolve_context's trigger tokens."""
+    alternatives = []
+    if heteronyms:
+        words = set(_CONTEXTUAL_RULES) | set(HETERONYMS)
+        alternatives.append(
+            _NOT_LETTER_BEFORE + '(?:'
+            + '|'.join(re.escape(w)
+                       for w in sorted(words, key=len, reverse=True))
+            + ')' + _NOT_LETTER_AFTER)
+    if contractions:
+        # spaCy splits `'s`/`'d` off the word they are attached to.
+        alternatives.append("'[sd]" + _NOT_LETTER_AFTER)
+    return re.compile('|'.join(alternatives), re.IGNORECASE)
+
+
+def _resolve_texts(texts, parse_many, heteronyms, contractions):
+    """Apply resolve_context's rules to each text.
+
+    `parse_many` maps a list of strings to their Docs, in order — plain
+    `map(nlp, ...)` for one chapter, `nlp.pipe` for a whole book. Each
+    text is parsed whole, exactly as a lone nlp(text) call would, since
+    the tagger and parser read context across line breaks. A text with
+    no trigger token at all (see _candidate_pattern) passes through
+    untouched; any other text is parsed in full, however few of its
+    paragraphs hold a trigger.
+    """
+    candidates = _candidate_pattern(heteronyms, contractions)
+    todo = [k for k, t in enumerate(texts) if candidates.search(t)]
+    resolved = list(texts)
+    docs = parse_many([texts[k] for k in todo])
+    for k, doc in zip(todo, docs):
+        resolved[k] = _apply_edits(texts[k], _context_edits(
+            texts[k], doc, heteronyms, contractions))
+    return resolved
+
+
+def resolve_context(text, heteronyms=True, contractions=True):
+    """Run every spaCy-driven English pass over a single parse.
+
+    Equivalent to apply_contextual_overrides → resolve_heteronyms →
+    resolve_contractions, but the text is tokenized, tagged and parsed
+    once instead of three times. All three rule families read the same Doc
+    and emit span edits against the original text, which are applied
+    together at the end. They never overlap: a heteronym the contextual
+    rules already wrapped is skipped, just as resolve_heteronyms skips the
+    markdown the sequential pipeline would have emitted, and contraction
+    edits only touch `'s`/`'d` tokens.
+
+    The later passes therefore see the original sentence rather than one
+    already carrying `[word](/IPA/)` markdown or `leed`/`led` respellings,
+    which if anything gives the tagger cleaner input.
+    """
+    if not (heteronyms or contractions) or not HAS_SPACY:
+        return text
+    nlp = _get_nlp()
+    if nlp is None:
+        return text
+    return _resolve_texts([text], lambda texts: map(nlp, texts),
+                          heteronyms, contractions)[0]
 
 
 # --- Unicode normalization ---
@@ -454,23 +568,33 @@ FRACTION_REPLACEMENTS = {
 }
 
 
+# The single-character tables above, compiled into str.translate tables so
+# each is one pass over the text. No replacement contains a key, so one
+# simultaneous pass is equivalent to replacing the entries one by one.
+_UNICODE_TABLE = str.maketrans(UNICODE_REPLACEMENTS)
+_UNICODE_TABLE_EN = str.maketrans({
+    **UNICODE_REPLACEMENTS,
+    **{char: ' ' + replacement + ' '
+       for char, replacement in FRACTION_REPLACEMENTS.items()},
+    '\u2044': '/',  # fraction slash → regular slash
+})
+
+_EN_DASH_BETWEEN_DIGITS = re.compile(r'(\d)\u2013(\d)')
+
+
 def strip_diacritics(text):
     """Strip accent marks so accented words match the ASCII-only TTS lexicon."""
+    if text.isascii():
+        return text
     nfd = unicodedata.normalize('NFD', text)
     return ''.join(c for c in nfd if unicodedata.category(c) != 'Mn')
 
 
 def normalize_unicode(text, is_english=True):
-    for char, replacement in UNICODE_REPLACEMENTS.items():
-        text = text.replace(char, replacement)
-    if is_english:
-        for char, replacement in FRACTION_REPLACEMENTS.items():
-            text = text.replace(char, ' ' + replacement + ' ')
-        # Fraction slash → regular slash
-        text = text.replace('\u2044', '/')
+    text = text.translate(_UNICODE_TABLE_EN if is_english else _UNICODE_TABLE)
     # En-dash between numbers: "10–20" → "10 to 20" (English only)
     if is_english:
-        text = re.sub(r'(\d)\u2013(\d)', r'\1 to \2', text)
+        text = _EN_DASH_BETWEEN_DIGITS.sub(r'\1 to \2', text)
     # Remaining en-dashes
     text = text.replace('\u2013', ' - ')
     if is_english:
@@ -549,12 +673,20 @@ ABBREVIATIONS = {
 }
 
 
+# Every abbreviation in one alternation (longest first), dispatched through
+# the dict. Expansions contain no periods, and a match must be followed by
+# whitespace, so one left-to-right pass gives the same result as one
+# re.sub per entry.
+_ABBREVIATION_PATTERN = re.compile(
+    r'(?<!\w)(?:'
+    + '|'.join(re.escape(abbr)
+               for abbr in sorted(ABBREVIATIONS, key=len, reverse=True))
+    + r')(?=\s|$)')
+
+
 def expand_abbreviations(text):
-    for abbr, expansion in ABBREVIATIONS.items():
-        # Word-boundary-aware replacement
-        pattern = re.escape(abbr)
-        text = re.sub(r'(?<!\w)' + pattern + r'(?=\s|$)', expansion, text)
-    return text
+    return _ABBREVIATION_PATTERN.sub(
+        lambda m: ABBREVIATIONS[m.group(0)], text)
 
 
 # --- Roman numeral expansion ---
@@ -582,13 +714,13 @@ def _roman_to_int(s):
     return result if i == len(s) else None
 
 
+_ROMAN_PATTERN = re.compile(
+    r'(?i)\b(' + '|'.join(ROMAN_KEYWORDS) + r')\s+([IVXLCDM]+)\b'
+)
+
+
 def expand_roman_numerals(text):
     """Convert Roman numerals after keywords like Chapter, Part, etc."""
-    keywords_pattern = '|'.join(ROMAN_KEYWORDS)
-    pattern = re.compile(
-        r'(?i)\b(' + keywords_pattern + r')\s+([IVXLCDM]+)\b'
-    )
-
     def _replace(match):
         keyword = match.group(1)
         roman = match.group(2).upper()
@@ -597,7 +729,7 @@ def expand_roman_numerals(text):
             return f'{keyword} {value}'
         return match.group(0)
 
-    return pattern.sub(_replace, text)
+    return _ROMAN_PATTERN.sub(_replace, text)
 
 
 # --- Special character cleanup ---
@@ -647,57 +779,197 @@ EMAIL_PATTERN = re.compile(
 )
 
 
+# Symbol tables for clean_special_characters (English words for English;
+# strip to space otherwise), one str.translate pass each.
+_SYMBOL_TABLE_EN = str.maketrans(SYMBOL_REPLACEMENTS)
+_SYMBOL_TABLE = str.maketrans(dict.fromkeys(SYMBOL_REPLACEMENTS, ' '))
+
+# Scene break markers: 3+ repeated special characters, e.g. ***, ---, ~~~, ===
+_SCENE_BREAK_PATTERN = re.compile(r'[\*\-\~\=\_\#\+\.]{3,}')
+_MULTI_SPACE_PATTERN = re.compile(r' {2,}')
+_MULTI_NEWLINE_PATTERN = re.compile(r'\n{3,}')
+
+
 def clean_special_characters(text, is_english=True):
     # Remove URLs and emails
     text = URL_PATTERN.sub('', text)
     text = EMAIL_PATTERN.sub('', text)
 
-    # Remove scene break markers (3+ repeated special characters, e.g. ***, ---, ~~~, ===)
-    text = re.sub(r'[\*\-\~\=\_\#\+\.]{3,}', '', text)
+    # Remove scene break markers
+    text = _SCENE_BREAK_PATTERN.sub('', text)
 
-    # Replace symbols (English words for English; strip to space otherwise)
-    for symbol, replacement in SYMBOL_REPLACEMENTS.items():
-        text = text.replace(symbol, replacement if is_english else ' ')
+    # Replace symbols
+    text = text.translate(_SYMBOL_TABLE_EN if is_english else _SYMBOL_TABLE)
 
     # Collapse multiple spaces
-    text = re.sub(r' {2,}', ' ', text)
+    text = _MULTI_SPACE_PATTERN.sub(' ', text)
     # Collapse 3+ newlines into 2
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _MULTI_NEWLINE_PATTERN.sub('\n\n', text)
     # Strip trailing whitespace on each line
     text = '\n'.join(line.rstrip() for line in text.split('\n'))
 
     return text
 
 
+# --- Compiled user rule sets ---
+#
+# Substitutions and phoneme overrides used to cost one re.sub over the whole
+# chapter per entry, which a few thousand audit-generated overrides turn into
+# the slowest part of normalization. Instead each rule list is compiled once
+# (cached by its content) into a short sequence of steps:
+#
+#   * Runs of consecutive whole-word entries whose word is all `\w` become
+#     one dict lookup per `\w+` token of the text. `\bword\b` can only
+#     match a whole `\w+` run, so this finds exactly the same matches.
+#   * Anything else (substring matches, words with punctuation, non-ASCII
+#     case-insensitive words) stays a precompiled regex of its own.
+#
+# Entries apply in list order, each seeing the previous one's output. A
+# dict stage applies its entries simultaneously, which is only the same
+# thing when no entry in it can see an earlier one's output — so a new stage
+# starts whenever a word repeats (as re.IGNORECASE sees it) or appears in
+# the output of an earlier entry of the stage.
+
+_WORD_TOKEN = re.compile(r'\w+')
+
+# Non-ASCII characters that re.IGNORECASE matches to an ASCII letter but
+# str.lower() does not map to it (İ, ı, ſ and the Kelvin sign).
+_RE_ASCII_CASEFOLD = str.maketrans(
+    {'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'})
+
+
+def _re_fold(word):
+    return word.translate(_RE_ASCII_CASEFOLD).lower()
+
+
+def _word_stage(exact, folded):
+    """Step replacing whole `\\w+` tokens: `exact` maps case-sensitive words,
+    `folded` lowercased ASCII words, each to an output function."""
+    def _replace(m):
+        token = m.group(0)
+        make = exact.get(token)
+        if make is None and folded:
+            make = folded.get(_re_fold(token))
+        return token if make is None else make(token)
+
+    def _step(text):
+        return _WORD_TOKEN.sub(_replace, text)
+    return _step
+
+
+def _regex_step(pattern, flags, make):
+    compiled = re.compile(pattern, flags)
+
+    def _step(text):
+        # A function replacement keeps backref-looking output (`\1`,
+        # `\g<0>`) literal instead of a regex template.
+        return compiled.sub(lambda m: make(m.group(0)), text)
+    return _step
+
+
+def _compile_rules(entries):
+    """Compile (word, whole_word, case_sensitive, make, output_hint) entries
+    into a single text -> text function. `make(matched)` builds the
+    replacement; `output_hint` is text every replacement contains apart
+    from the matched word itself, used to decide stage boundaries."""
+    steps = []
+    exact, folded, seen = {}, {}, set()
+
+    def _flush():
+        nonlocal exact, folded, seen
+        if exact or folded:
+            steps.append(_word_stage(exact, folded))
+        exact, folded, seen = {}, {}, set()
+
+    for word, whole_word, case_sensitive, make, output_hint in entries:
+        dict_ok = (whole_word and _WORD_TOKEN.fullmatch(word) is not None
+                   and (case_sensitive or word.isascii()))
+        if not dict_ok:
+            _flush()
+            if whole_word:
+                pattern = r'\b' + re.escape(word) + r'\b'
+            else:
+                pattern = re.escape(word)
+            flags = 0 if case_sensitive else re.IGNORECASE
+            steps.append(_regex_step(pattern, flags, make))
+            continue
+        key = _re_fold(word)
+        if key in seen:
+            _flush()
+        if case_sensitive:
+            exact[word] = make
+        else:
+            folded[key] = make
+        seen.add(key)
+        seen.update(_re_fold(t) for t in _WORD_TOKEN.findall(output_hint))
+    _flush()
+
+    def _apply(text):
+        for step in steps:
+            text = step(text)
+        return text
+    return _apply
+
+
+def _rules_cache_key(rules):
+    return json.dumps(rules, sort_keys=True, default=str)
+
+
+@functools.lru_cache(maxsize=8)
+def _substitution_matcher(rules_key):
+    entries = []
+    for sub in json.loads(rules_key):
+        find = sub.get('find', '')
+        replace = sub.get('replace', '')
+        if not find:
+            continue
+        entries.append((find, sub.get('whole_word', True),
+                        sub.get('case_sensitive', False),
+                        lambda _matched, r=replace: r, replace))
+    return _compile_rules(entries)
+
+
 # --- Main entry point ---
 
 def apply_substitutions(text, substitutions):
     """Apply user-defined word substitutions.
 
     Each entry is a dict with 'find', 'replace', and optional 'case_sensitive'
-    and 'whole_word' booleans.
+    and 'whole_word' booleans. Entries apply in order; the compiled matcher
+    is built once per distinct list (see _compile_rules).
     """
     if not substitutions:
         return text
-    for sub in substitutions:
-        find = sub.get('find', '')
-        replace = sub.get('replace', '')
-        if not find:
-            continue
-        if sub.get('whole_word', True):
-            pattern = r'\b' + re.escape(find) + r'\b'
-        else:
-            pattern = re.escape(find)
-        flags = 0 if sub.get('case_sensitive', False) else re.IGNORECASE
-        # Use a lambda for the replacement so backref-looking content in the
-        # user's replace string (e.g. "\1", "\g<0>") is treated as a literal
-        # instead of a regex substitution template.
-        text = re.sub(pattern, lambda _m, r=replace: r, text, flags=flags)
-    return text
+    return _substitution_matcher(_rules_cache_key(substitutions))(text)
 
 
 # --- Phoneme overrides + acronym spellout ---
 
+@functools.lru_cache(maxsize=8)
+def _phoneme_override_matcher(rules_key):
+    entries = []
+    for entry in json.loads(rules_key):
+        if not entry.get('enabled', True):
+            continue
+        word = entry.get('word', '')
+        ipa = entry.get('ipa', '')
+        if not word or not ipa:
+            continue
+        # Dictionaries hand out canonical IPA (eɪ, aʊ, …); Kokoro's vocab keys
+        # the diphthongs as single letters (A, W, …). See _to_misaki_phonemes
+        # for why mixing the two forms makes Kokoro bleed the override audio
+        # onto neighbouring words.
+        ipa = _to_misaki_phonemes(ipa)
+        # The wrapped output repeats the matched word, so a later entry for
+        # the same word always starts a new stage (and re-wraps it, as the
+        # one-re.sub-per-entry version did).
+        entries.append((word, not re.search(r'\W', word),
+                        entry.get('case_sensitive', False),
+                        lambda matched, p=ipa: f'[{matched}](/{p}/)',
+                        f'{word} {ipa}'))
+    return _compile_rules(entries)
+
+
 def apply_phoneme_overrides(text, overrides):
     """Wrap matching words with misaki's inline-phoneme markdown.
 
@@ -709,35 +981,12 @@ def apply_phoneme_overrides(text, overrides):
 
     Emits `[word](/IPA/)` which misaki parses in G2P.preprocess. Words
     containing non-word chars (apostrophes, hyphens) match without `\\b`
-    anchors so names like O'Brien or Anne-Marie still work.
+    anchors so names like O'Brien or Anne-Marie still work. The compiled
+    matcher is built once per distinct list (see _compile_rules).
     """
     if not overrides:
         return text
-    for entry in overrides:
-        if not entry.get('enabled', True):
-            continue
-        word = entry.get('word', '')
-        ipa = entry.get('ipa', '')
-        if not word or not ipa:
-            continue
-        # Dictionaries hand out canonical IPA (eɪ, aʊ, …); Kokoro's vocab keys
-        # the diphthongs as single letters (A, W, …). See _to_misaki_phonemes
-        # for why mixing the two forms makes Kokoro bleed the override audio
-        # onto neighbouring words.
-        ipa = _to_misaki_phonemes(ipa)
-        if re.search(r'\W', word):
-            pattern = re.escape(word)
-        else:
-            pattern = r'\b' + re.escape(word) + r'\b'
-        flags = 0 if entry.get('case_sensitive', False) else re.IGNORECASE
-        # Lambda keeps backref-looking IPA (`\1`, `\g<0>`) as literal text.
-        text = re.sub(
-            pattern,
-            lambda m, p=ipa: f'[{m.group(0)}](/{p}/)',
-            text,
-            flags=flags,
-        )
-    return text
+    return _phoneme_override_matcher(_rules_cache_key(overrides))(text)
 
 
 # Roman numerals that look like acronyms but are usually section markers.
@@ -762,18 +1011,18 @@ _ACRONYM_PATTERN = re.compile(r'\b[A-Z]{2,6}\b')
 def _load_acronym_skip_set():
     """Return all-caps words misaki gold already pronounces.
 
-    Loaded lazily; a failure to read the bundled lexicon falls back to the
-    hard stoplist only so auto-acronym still runs for the obvious cases.
+    Loaded lazily from the same mmap store misaki's Lexicon uses (its
+    capitalization growth never adds all-caps keys, so the set is the same
+    as for the raw JSON); a failure to read the bundled lexicon falls back
+    to the hard stoplist only so auto-acronym still runs for the obvious
+    cases.
     """
     global _ACRONYM_GOLD_CACHE
     if _ACRONYM_GOLD_CACHE is not None:
         return _ACRONYM_GOLD_CACHE
     try:
-        import json
-        import importlib.resources
-        with importlib.resources.open_text(
-                'autiobooks.misaki.data', 'us_gold.json') as f:
-            gold = json.load(f)
+        from .lexicon_store import open_table
+        gold = open_table('autiobooks.misaki.data', 'us_gold.json')
         caps = frozenset(
             k for k in gold
             if k.isalpha() and k.isupper() and 2 <= len(k) <= 6
@@ -809,6 +1058,24 @@ def apply_acronym_spellout(text, enabled):
     return _ACRONYM_PATTERN.sub(_replace, text)
 
 
+def _normalize_before_context(text, is_english):
+    text = normalize_unicode(text, is_english=is_english)
+    if is_english:
+        text = expand_abbreviations(text)
+        text = expand_roman_numerals(text)
+    return text
+
+
+def _normalize_after_context(text, is_english, substitutions,
+                             phoneme_overrides, auto_acronyms):
+    text = clean_special_characters(text, is_english=is_english)
+    text = apply_substitutions(text, substitutions)
+    if is_english:
+        text = apply_acronym_spellout(text, auto_acronyms)
+        text = apply_phoneme_overrides(text, phoneme_overrides)
+    return text
+
+
 def normalize_text(text, lang='en-us', substitutions=None,
                     heteronyms=True, contractions=True,
                     phoneme_overrides=None, auto_acronyms=False):
@@ -827,18 +1094,116 @@ def normalize_text(text, lang='en-us', substitutions=None,
     any earlier pass.
     """
     is_english = lang.startswith('en')
-    text = normalize_unicode(text, is_english=is_english)
+    text = _normalize_before_context(text, is_english)
     if is_english:
-        text = expand_abbreviations(text)
-        text = expand_roman_numerals(text)
-        if heteronyms:
-            text = apply_contextual_overrides(text)
-            text = resolve_heteronyms(text)
-        if contractions:
-            text = resolve_contractions(text)
-    text = clean_special_characters(text, is_english=is_english)
-    text = apply_substitutions(text, substitutions)
-    if is_english:
-        text = apply_acronym_spellout(text, auto_acronyms)
-        text = apply_phoneme_overrides(text, phoneme_overrides)
-    return text
+        text = resolve_context(text, heteronyms=heteronyms,
+                               contractions=contractions)
+    return _normalize_after_context(text, is_english, substitutions,
+                                    phoneme_overrides, auto_acronyms)
+
+
+def normalize_book(texts, lang='en-us', substitutions=None,
+                   heteronyms=True, contractions=True,
+                   phoneme_overrides=None, auto_acronyms=False,
+                   batch_size=64, n_process=1):
+    """normalize_text for a whole book's chapters at once.
+
+    Returns one normalized string per input text, byte-identical to
+    calling normalize_text on each. The spaCy stage, which dominates
+    normalization time, runs every chapter through one
+    `nlp.pipe(batch_size=..., n_process=...)` stream instead of parsing
+    chapter by chapter, so it batches across chapters and, with
+    `n_process` > 1, spreads the book over that many cores. Each chapter
+    is still one Doc, as in normalize_text.
+    """
+    is_english = lang.startswith('en')
+    texts = [_normalize_before_context(t, is_english) for t in texts]
+    nlp = (_get_nlp() if is_english and HAS_SPACY
+           and (heteronyms or contractions) else None)
+    if nlp is not None:
+        texts = _resolve_texts(
+            texts, lambda ts: nlp.pipe(ts, batch_size=batch_size,
+                                       n_process=n_process),
+            heteronyms, contractions)
+    return [_normalize_after_context(t, is_english, substitutions,
+                                     phoneme_overrides, auto_acronyms)
+            for t in texts]
+
+
+# --- Chapter splitting ---
+
+# A line ending in one of these closes a sentence (closing quotes and
+# brackets may follow the mark).
+_SENTENCE_END_PATTERN = re.compile(r'[.!?…:;]["\'”’)\]]*\s*$')
+_SENTENCE_BREAK_PATTERN = re.compile(
+    r'(?<=[.!?…])\s+|(?<=[.!?…]["\'”’)\]])\s+')
+HEADING_MAX_WORDS = 8
+
+
+def _is_heading(line):
+    """A short line that does not close a sentence or continue one."""
+    line = line.strip()
+    return (bool(line) and not line[0].islower()
+            and len(line.split()) <= HEADING_MAX_WORDS
+            and not _SENTENCE_END_PATTERN.search(line))
+
+
+def _paragraph_blocks(text):
+    """Yield (separator, block) for the runs of lines between the places
+    a chapter may be cut: after a blank line or a line closing a sentence,
+    and before a heading."""
+    lines = text.split('\n')
+    block = [lines[0]]
+    for prev, line in zip(lines, lines[1:]):
+        if (not prev.strip() or _SENTENCE_END_PATTERN.search(prev)
+                or _is_heading(line)):
+            yield '\n', '\n'.join(block)
+            block = []
+        block.append(line)
+    yield '\n', '\n'.join(block)
+
+
+def _budget_blocks(text, max_words):
+    """Yield (separator, block, words) with every block within `max_words`:
+    paragraphs over the budget are cut between sentences, and sentences
+    over it between words."""
+    for sep, block in _paragraph_blocks(text):
+        words = len(block.split())
+        if words <= max_words:
+            yield sep, block, words
+            continue
+        for sentence in _SENTENCE_BREAK_PATTERN.split(block):
+            tokens = sentence.split()
+            for start in range(0, len(tokens), max_words):
+                chunk = tokens[start:start + max_words]
+                yield sep, ' '.join(chunk), len(chunk)
+                sep = ' '
+
+
+def split_chapter_text(text, max_words):
+    """Split a chapter's text into parts of at most `max_words` words.
+
+    Parts end where a paragraph does (a blank line or a line closing a
+    sentence) or before a heading, so no sentence is cut in two; only a
+    paragraph longer than the whole budget is cut between its sentences.
+    Parts are balanced rather than filled greedily: 25k words with a 10k
+    budget become three parts of about 8k, not 10k, 10k and 5k.
+
+    Returns [text] unchanged when it fits or `max_words` is 0 or None.
+    """
+    if not max_words or len(text.split()) <= max_words:
+        return [text]
+    blocks = list(_budget_blocks(text, max_words))
+    total = sum(words for _, _, words in blocks)
+    target = total / -(-total // max_words)
+    parts = []
+    current, current_words = [], 0
+    for sep, block, words in blocks:
+        if current and (current_words >= target
+                        or current_words + words > max_words):
+            parts.append(''.join(current).strip())
+            current, current_words = [], 0
+        current.append(sep + block if current else block)
+        current_words += words
+    parts.append(''.join(current).strip())
+    return [part for part in parts if part]
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Real-time-factor benchmark for batched Kokoro inference.
+
+Synthesizes the same text once per batch size through
+`autiobooks.engine.gen_audio_segments` on CPU and reports the real-time
+factor (wall seconds per second of audio — lower is faster). Batch size 1 is
+KPipeline's own per-chunk loop, i.e. the baseline every other row is
+compared against.
+
+Usage:
+    python scripts/bench_batch_rtf.py
+    python scripts/bench_batch_rtf.py --batch-sizes 1 4 8 16 --voice am_adam
+    python scripts/bench_batch_rtf.py --text-file chapter.txt --threads 8
+
+The default corpus is short dialogue lines, the case batching is meant to
+help; pass --text-file to measure on a real chapter.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure the repo root is importable when run as a script.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import torch  # noqa: E402
+
+from autiobooks.engine import (  # noqa: E402
+    SAMPLE_RATE, gen_audio_segments, get_pipeline, set_gpu_acceleration,
+)
+from autiobooks.text_processing import normalize_text  # noqa: E402
+
+
+_DIALOGUE = [
+    '"Where are you going?" she asked.',
+    '"Out."',
+    '"Out where?"',
+    'He shrugged and reached for his coat.',
+    '"Just out. I\'ll be back before dark."',
+    '"You said that last time."',
+    'The door closed behind him before she could answer.',
+    'Rain tapped at the window.',
+    '"Fine," she said to the empty room.',
+    'She picked up the letter again and read it twice.',
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--batch-sizes', type=int, nargs='+',
+                        default=[1, 2, 4, 8, 16])
+    parser.add_argument('--voice', default='af_heart')
+    parser.add_argument('--speed', type=float, default=1.0)
+    parser.add_argument('--text-file', type=Path,
+                        help='Benchmark on this text instead of the '
+                             'built-in dialogue corpus')
+    parser.add_argument('--repeat', type=int, default=8,
+                        help='Copies of the dialogue corpus (default: 8)')
+    parser.add_argument('--threads', type=int, default=0,
+                        help='torch intra-op threads (default: torch default)')
+    args = parser.parse_args()
+
+    set_gpu_acceleration(False)
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    if args.text_file:
+        raw = args.text_file.read_text(encoding='utf-8')
+    else:
+        raw = '\n'.join(_DIALOGUE * args.repeat)
+    text = normalize_text(raw)
+
+    # Load the model and voice before timing anything.
+    get_pipeline(args.voice[0])
+    gen_audio_segments(_DIALOGUE[0], args.voice, args.speed)
+
+    print(f'{"batch":>5}  {"chunks":>6}  {"audio s":>8}  {"wall s":>7}  '
+          f'{"RTF":>6}  {"speedup":>7}')
+    baseline = None
+    for batch_size in args.batch_sizes:
+        start = time.perf_counter()
+        audio = gen_audio_segments(text, args.voice, args.speed,
+                                   batch_size=batch_size)
+        wall = time.perf_counter() - start
+        audio_s = sum(len(a) for a in audio) / SAMPLE_RATE
+        rtf = wall / audio_s if audio_s else float('nan')
+        if baseline is None:
+            baseline = rtf
+        print(f'{batch_size:>5}  {len(audio):>6}  {audio_s:>8.1f}  '
+              f'{wall:>7.2f}  {rtf:>6.3f}  {baseline / rtf:>6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
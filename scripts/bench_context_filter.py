@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""Context-rule pre-filter measurement: how much text skips spaCy.
+
+resolve_context and normalize_book only parse a text when it contains a
+trigger token of the heteronym or contraction rules (see
+text_processing._candidate_pattern). The engine hands them whole chapters
+(or chapter parts), so a chapter is skipped only if none of its words is
+a trigger. For each heteronyms/contractions setting this reports how many
+chapters and what share of the book's characters still go to spaCy, and,
+for comparison, what a paragraph-level filter would send.
+
+Usage:
+    python scripts/bench_context_filter.py book.epub
+    python scripts/bench_context_filter.py book.pdf
+    python scripts/bench_context_filter.py chapter1.txt chapter2.txt ...
+
+No spaCy model is needed: only the filter runs, not the parser.
+"""
+from __future__ import annotations
+
+import argparse
+import re
+import sys
+from pathlib import Path
+
+# Ensure the repo root is importable when run as a script.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from autiobooks import text_processing  # noqa: E402
+
+_PARAGRAPH_BREAK = re.compile(r'\n\s*\n')
+
+
+def _chapters(paths):
+    if len(paths) == 1 and paths[0].suffix.lower() in ('.epub', '.pdf'):
+        if paths[0].suffix.lower() == '.pdf':
+            from autiobooks.pdf_parser import get_pdf_book
+            _, chapters, _ = get_pdf_book(str(paths[0]), resized=False)
+        else:
+            from autiobooks.epub_parser import get_book
+            _, chapters, _ = get_book(str(paths[0]), resized=False)
+        texts = [ch.extracted_text for ch in chapters]
+    else:
+        texts = [p.read_text(encoding='utf-8', errors='replace')
+                 for p in paths]
+    # The filter sees text after the passes that run before it.
+    return [text_processing._normalize_before_context(t, True)
+            for t in texts if t and t.strip()]
+
+
+def _share(parsed, everything):
+    total = sum(map(len, everything))
+    return sum(map(len, parsed)) / total if total else 0.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('inputs', nargs='+', type=Path,
+                        help='An EPUB or PDF, or one text file per chapter')
+    args = parser.parse_args()
+
+    chapters = _chapters(args.inputs)
+    if not chapters:
+        print('no chapters found')
+        return 1
+    paragraphs = [p for ch in chapters for p in _PARAGRAPH_BREAK.split(ch)
+                  if p.strip()]
+    print(f'chapters       {len(chapters):>10}')
+    print(f'paragraphs     {len(paragraphs):>10}')
+    print(f'characters     {sum(map(len, chapters)):>10}')
+    for label, heteronyms, contractions in (
+            ('heteronyms + contractions', True, True),
+            ('heteronyms only', True, False),
+            ('contractions only', False, True)):
+        pattern = text_processing._candidate_pattern(heteronyms,
+                                                     contractions)
+        parsed = [ch for ch in chapters if pattern.search(ch)]
+        parsed_paragraphs = [p for p in paragraphs if pattern.search(p)]
+        print(f'{label}:')
+        print(f'  chapters parsed   {len(parsed):>6}/{len(chapters)}  '
+              f'({_share(parsed, chapters):.1%} of characters)')
+        print(f'  paragraph filter  {len(parsed_paragraphs):>6}/'
+              f'{len(paragraphs)}  '
+              f'({_share(parsed_paragraphs, paragraphs):.1%} of characters)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""G2P benchmark for the word-level lookup memo (autiobooks.g2p_memo).
+
+Runs the bundled `autiobooks.misaki.en.G2P` over a long chapter twice, once
+with the memo disabled and once with it enabled on a fresh G2P, and reports
+wall time, the memo hit rate, and whether both runs produced identical
+phonemes.
+
+Usage:
+    python scripts/bench_g2p_memo.py
+    python scripts/bench_g2p_memo.py --text-file chapter.txt
+    python scripts/bench_g2p_memo.py --british --repeat 50
+
+The default corpus is a short passage repeated to chapter length; pass
+--text-file to measure on a real chapter. Text is fed paragraph by
+paragraph, like the engine does.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure the repo root is importable when run as a script.
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from autiobooks import g2p_memo  # noqa: E402
+from autiobooks.misaki import en  # noqa: E402
+from autiobooks.text_processing import normalize_text  # noqa: E402
+
+
+_PASSAGE = """\
+The house stood at the end of the lane, where the road gave out and the
+fields began. Nobody had lived there for years, or so the people in the
+village said, though the lamp in the upper window was sometimes lit.
+
+She had read the letter twice before she understood it. "You will come,"
+it said, "because there is no one else." She folded it, put it in her coat,
+and went out into the rain.
+
+It was a long walk, and by the time she reached the gate the light was
+going. The garden was overgrown. She could hear the wind in the trees and,
+somewhere behind the house, the sound of running water.
+"""
+
+
+def _run(text, british):
+    g2p = en.G2P(british=british)
+    paragraphs = [p for p in text.split('\n\n') if p.strip()]
+    start = time.perf_counter()
+    phonemes = [g2p(p)[0] for p in paragraphs]
+    return time.perf_counter() - start, phonemes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--text-file', type=Path,
+                        help='Benchmark on this text instead of the '
+                             'built-in passage')
+    parser.add_argument('--repeat', type=int, default=40,
+                        help='Copies of the built-in passage (default: 40)')
+    parser.add_argument('--british', action='store_true')
+    args = parser.parse_args()
+
+    if args.text_file:
+        raw = args.text_file.read_text(encoding='utf-8')
+    else:
+        raw = '\n\n'.join([_PASSAGE] * args.repeat)
+    text = normalize_text(raw)
+
+    # Load spaCy and the lexicon before timing anything.
+    en.G2P(british=args.british)('Warm up.')
+
+    g2p_memo.set_enabled(False)
+    base_s, base_ps = _run(text, args.british)
+    g2p_memo.set_enabled(True)
+    g2p_memo.reset_stats()
+    memo_s, memo_ps = _run(text, args.british)
+    st = g2p_memo.stats()
+
+    print(f'words          {len(text.split()):>10}')
+    print(f'memo off       {base_s:>9.2f}s')
+    print(f'memo on        {memo_s:>9.2f}s  ({base_s / memo_s:.2f}x)')
+    print(f'hit rate       {st["hit_rate"]:>10.1%}  '
+          f'({st["hits"]} hits, {st["misses"]} misses)')
+    print(f'identical      {"yes" if base_ps == memo_ps else "NO":>10}')
+    return 0 if base_ps == memo_ps else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
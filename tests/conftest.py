@@ -0,0 +1,23 @@
+import pytest
+
+from autiobooks import book_cache, lexicon_store
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _lexicon_store_dir(tmp_path_factory):
+    """Keep lexicon stores built during tests out of ~/.autiobooks."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(lexicon_store, 'LEXICON_DIR',
+               tmp_path_factory.mktemp('lexicon'))
+    yield
+    mp.undo()
+
+
+@pytest.fixture(autouse=True, scope='session')
+def _book_cache_dir(tmp_path_factory):
+    """Keep books parsed during tests out of ~/.autiobooks."""
+    mp = pytest.MonkeyPatch()
+    mp.setattr(book_cache, 'BOOK_CACHE_DIR',
+               tmp_path_factory.mktemp('books'))
+    yield
+    mp.undo()
@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from autiobooks import book_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the book cache at a temp dir with a fixed 1 MB budget."""
+    monkeypatch.setattr(book_cache, 'BOOK_CACHE_DIR', tmp_path / 'books')
+    monkeypatch.setattr(book_cache, 'load_config',
+                        lambda: {'book_cache_max_mb': 1})
+    return tmp_path
+
+
+@pytest.fixture
+def book(cache_dir):
+    path = cache_dir / 'book.epub'
+    path.write_bytes(b'book bytes' * 100)
+    return path
+
+
+def _record(*texts):
+    return {
+        'chapters': [book_cache.chapter_record(f'c{i}.xhtml', f'T{i}', t)
+                     for i, t in enumerate(texts)],
+        'thumbnail': b'\x89PNG thumb',
+    }
+
+
+class TestBookCache:
+    """Tests for book_cache.load/store/prune."""
+
+    def test_roundtrip(self, book):
+        book_cache.store(book, 'epub1', _record('One two.', 'Three'))
+        record = book_cache.load(book, 'epub1')
+        assert [c['text'] for c in record['chapters']] == ['One two.',
+                                                           'Three']
+        assert [c['words'] for c in record['chapters']] == [2, 1]
+        assert record['chapters'][0]['title'] == 'T0'
+        assert record['thumbnail'] == b'\x89PNG thumb'
+        assert record['cover'] is None
+
+    def test_miss_for_other_parser_version(self, book):
+        book_cache.store(book, 'epub1', _record('x'))
+        assert book_cache.load(book, 'epub2') is None
+
+    def test_changed_book_misses(self, book):
+        book_cache.store(book, 'epub1', _record('x'))
+        book.write_bytes(b'new edition')
+        assert book_cache.load(book, 'epub1') is None
+
+    def test_copied_book_hits(self, book, cache_dir):
+        book_cache.store(book, 'epub1', _record('x'))
+        copy = cache_dir / 'copy.epub'
+        copy.write_bytes(book.read_bytes())
+        assert book_cache.load(copy, 'epub1') is not None
+
+    def test_unchanged_book_hashed_once(self, book, monkeypatch):
+        calls = []
+        real = book_cache.file_digest
+        monkeypatch.setattr(book_cache, 'file_digest',
+                            lambda p: calls.append(p) or real(p))
+        book_cache.store(book, 'epub1', _record('x'))
+        for _ in range(3):
+            assert book_cache.load(book, 'epub1') is not None
+        assert len(calls) == 1
+        # Same content, new mtime: hashed again, still a hit.
+        st = os.stat(book)
+        os.utime(book, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        assert book_cache.load(book, 'epub1') is not None
+        assert len(calls) == 2
+
+    def test_corrupt_entry_is_a_miss(self, book):
+        book_cache.store(book, 'epub1', _record('x'))
+        (entry,) = [p for p, _, _ in book_cache._iter_entries()]
+        entry.write_bytes(entry.read_bytes()[:-3])
+        assert book_cache.load(book, 'epub1') is None
+
+    def test_zero_budget_disables(self, book, monkeypatch):
+        monkeypatch.setattr(book_cache, 'load_config',
+                            lambda: {'book_cache_max_mb': 0})
+        book_cache.store(book, 'epub1', _record('x'))
+        assert book_cache.stats()['entries'] == 0
+        assert book_cache.load(book, 'epub1') is None
+
+    def test_store_evicts_least_recently_used(self, cache_dir):
+        books = []
+        for i in range(3):
+            path = cache_dir / f'b{i}.epub'
+            path.write_bytes(bytes([i]) * 10)
+            books.append(path)
+            # Random hex: ~450 KB per entry once compressed, against a
+            # 1 MB budget.
+            text = os.urandom(450_000).hex()
+            book_cache.store(path, 'epub1', _record(text))
+            for p, _, _ in book_cache._iter_entries():
+                st = p.stat()
+                os.utime(p, (st.st_atime - 10, st.st_mtime - 10))
+        assert book_cache.load(books[0], 'epub1') is None
+        assert book_cache.load(books[1], 'epub1') is not None
+        assert book_cache.load(books[2], 'epub1') is not None
+
+    def test_clear(self, book):
+        book_cache.store(book, 'epub1', _record('x'))
+        assert book_cache.clear()[0] == 1
+        assert book_cache.load(book, 'epub1') is None
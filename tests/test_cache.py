@@ -0,0 +1,111 @@
+import os
+
+import pytest
+
+from autiobooks import cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Point the audio cache at a temp dir with a fixed 1 MB budget."""
+    monkeypatch.setattr(cache, 'AUDIO_CACHE_DIR', tmp_path / 'audio')
+    monkeypatch.setattr(cache, 'load_config', lambda: {'cache_max_mb': 1})
+    return tmp_path
+
+
+def _make(tmp_path, name, size):
+    path = tmp_path / name
+    path.write_bytes(b'\0' * size)
+    return path
+
+
+class TestAudioCache:
+    """Tests for cache.fetch/store/prune/stats."""
+
+    def test_store_then_fetch_roundtrip(self, cache_dir):
+        src = _make(cache_dir, 'a.wav', 100)
+        cache.store('ab' * 16, '.wav', src)
+        dest = cache_dir / 'out' / 'a.wav'
+        assert cache.fetch('ab' * 16, '.wav', dest)
+        assert dest.read_bytes() == src.read_bytes()
+
+    def test_fetch_miss(self, cache_dir):
+        assert not cache.fetch('cd' * 16, '.wav', cache_dir / 'x.wav')
+        assert not (cache_dir / 'x.wav').exists()
+
+    def test_stats_counts_entries(self, cache_dir):
+        cache.store('11' * 16, '.wav', _make(cache_dir, 'a.wav', 100))
+        cache.store('22' * 16, '.wav', _make(cache_dir, 'b.wav', 50))
+        st = cache.stats()
+        assert st['entries'] == 2
+        assert st['bytes'] == 150
+        assert st['budget'] == 1024 * 1024
+
+    def test_prune_evicts_least_recently_used(self, cache_dir):
+        for n, key in enumerate(('11', '22', '33')):
+            cache.store(key * 16, '.wav', _make(cache_dir, f'{key}.wav', 100))
+            entry = cache._entry_path(key * 16, '.wav')
+            os.utime(entry, (1000 + n, 1000 + n))
+        # A hit refreshes the oldest entry, so '22' is now the LRU one.
+        assert cache.fetch('11' * 16, '.wav', cache_dir / 'hit.wav')
+        removed, freed = cache.prune(max_bytes=200)
+        assert (removed, freed) == (1, 100)
+        assert not cache._entry_path('22' * 16, '.wav').exists()
+        assert cache._entry_path('11' * 16, '.wav').exists()
+        assert cache._entry_path('33' * 16, '.wav').exists()
+
+    def test_prune_by_age(self, cache_dir):
+        cache.store('11' * 16, '.wav', _make(cache_dir, 'a.wav', 10))
+        os.utime(cache._entry_path('11' * 16, '.wav'), (1000, 1000))
+        cache.store('22' * 16, '.wav', _make(cache_dir, 'b.wav', 10))
+        assert cache.prune(max_age_days=1) == (1, 10)
+        assert cache.stats()['entries'] == 1
+
+    def test_clear(self, cache_dir):
+        cache.store('11' * 16, '.wav', _make(cache_dir, 'a.wav', 10))
+        cache.store('22' * 16, '.wav', _make(cache_dir, 'b.wav', 10))
+        assert cache.clear() == (2, 20)
+        assert cache.stats()['entries'] == 0
+
+    def test_budget_from_config(self):
+        assert cache.cache_budget_bytes({'cache_max_mb': 0}) == 0
+        assert cache.cache_budget_bytes({'cache_max_mb': 'junk'}) == (
+            cache.DEFAULT_MAX_MB * 1024 * 1024)
+
+    def test_concurrent_stores_use_their_own_temp_files(self, cache_dir,
+                                                         monkeypatch):
+        import threading
+        src = _make(cache_dir, 'a.wav', 100)
+        barrier = threading.Barrier(2)
+        temps = []
+        real_replace = os.replace
+
+        def replace(tmp, dst):
+            temps.append(tmp)
+            # Both threads have written their temp file before either
+            # moves it into place.
+            barrier.wait(timeout=5)
+            real_replace(tmp, dst)
+        monkeypatch.setattr(cache.os, 'replace', replace)
+
+        threads = [threading.Thread(target=cache.store,
+                                    args=('ab' * 16, '.wav', src))
+                   for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        monkeypatch.setattr(cache.os, 'replace', real_replace)
+        assert len(set(temps)) == 2
+        assert cache.fetch('ab' * 16, '.wav', cache_dir / 'b.wav')
+        assert (cache_dir / 'b.wav').read_bytes() == src.read_bytes()
+        assert not list((cache_dir / 'audio').rglob('*.part'))
+
+    def test_file_key_follows_content_and_params(self, cache_dir):
+        a = _make(cache_dir, 'a.wav', 100)
+        b = _make(cache_dir, 'b.wav', 100)
+        key = cache.file_key(a, 'm4b', '64k', False)
+        assert cache.file_key(b, 'm4b', '64k', False) == key
+        assert cache.file_key(a, 'm4b', '128k', False) != key
+        b.write_bytes(b'\1' * 100)
+        assert cache.file_key(b, 'm4b', '64k', False) != key
@@ -51,3 +51,94 @@ class TestParseChapterSelection:
     def test_range_with_non_numeric_raises(self):
         with pytest.raises(ValueError):
             _parse_chapter_selection("1-abc", 10)
+
+
+class TestSingleEncoder:
+    """convert --single-encoder hands chapters to one BookEncoder."""
+
+    def test_rejects_stream(self, tmp_path):
+        from autiobooks import cli
+        book = tmp_path / 'book.epub'
+        book.write_bytes(b'')
+        with pytest.raises(SystemExit) as exc:
+            cli.main(['convert', str(book), '--single-encoder', '--stream'])
+        assert exc.value.code == 1
+
+    def test_finishes_book_with_converted_titles(self, tmp_path,
+                                                 monkeypatch):
+        pytest.importorskip('torch')
+        pytest.importorskip('kokoro')
+        from pathlib import Path
+        from types import SimpleNamespace
+        from autiobooks import cli, config, engine, epub_parser
+
+        book = tmp_path / 'book.epub'
+        book.write_bytes(b'')
+        chapters = [SimpleNamespace(extracted_text=f'Chapter {n} text.')
+                    for n in ('one', 'two', 'three')]
+        monkeypatch.setattr(cli, '_load_book',
+                            lambda path: (None, chapters, b'cover', False))
+        monkeypatch.setattr(epub_parser, 'get_chapter_titles',
+                            lambda book, chs: ['One', 'Two', 'Three'])
+        monkeypatch.setattr(config, 'load_config', lambda: {})
+
+        encoders = []
+
+        class FakeBookEncoder:
+            def __init__(self, *args):
+                self.args = args
+                self.added = {}
+                self.finished = None
+                self.aborted = False
+                encoders.append(self)
+
+            def add(self, idx, wav_files):
+                self.added[idx] = wav_files
+
+            def skip(self, idx):
+                self.added[idx] = []
+
+            def finish(self, *args, **kwargs):
+                self.finished = args
+
+            def abort(self):
+                self.aborted = True
+
+        def fake_convert(texts, voice, speed, wav_dir, stem, executor,
+                         **kwargs):
+            assert executor is None
+            encoder = kwargs['book_encoder']
+            wavs = [engine.chapter_wav_name(stem, t, wav_dir) for t in texts]
+            encoder.add(3, [wavs[2]])
+            encoder.skip(2)
+            encoder.add(1, [wavs[0]])
+            return {'wav_files': [wavs[0], wavs[2]],
+                    'encode_futures': {w: (engine._completed_future(None),
+                                           None) for w in wavs},
+                    'cancelled': False, 'part_wav_files': [],
+                    'part_enc_files': [], 'durations': {}}
+
+        def no_per_chapter_mux(*args, **kwargs):
+            raise AssertionError('per-chapter muxing used')
+
+        def no_encode_pool(*args, **kwargs):
+            raise AssertionError('chapter encode pool created')
+
+        monkeypatch.setattr(
+            engine, 'chapter_wav_name',
+            lambda stem, text, wav_dir, *key: str(Path(wav_dir) / text))
+        monkeypatch.setattr(engine, 'convert_chapters_to_wav', fake_convert)
+        monkeypatch.setattr(engine, 'BookEncoder', FakeBookEncoder)
+        monkeypatch.setattr(engine, 'EncodePool', no_encode_pool)
+        monkeypatch.setattr(engine, 'create_m4b', no_per_chapter_mux)
+        monkeypatch.setattr(engine, 'concat_audio_files', no_per_chapter_mux)
+
+        cli.main(['convert', str(book), '--single-encoder', '--no-gpu',
+                  '--chapters', '1-3', '--title', 'T', '--author', 'A',
+                  '--quiet'])
+
+        (encoder,) = encoders
+        assert encoder.args == (str(tmp_path / 'book.m4b'), 'm4b', '64k',
+                                False)
+        assert encoder.finished == ('T', 'A', 1, ['One', 'Three'], b'cover')
+        assert encoder.aborted
@@ -0,0 +1,954 @@
+import io
+import re
+import shutil
+import subprocess
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+np = pytest.importorskip('numpy')
+pytest.importorskip('soundfile')
+pytest.importorskip('torch')
+pytest.importorskip('kokoro')
+
+import soundfile  # noqa: E402
+import torch  # noqa: E402
+
+from autiobooks import engine  # noqa: E402
+
+SR = engine.SAMPLE_RATE
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which('ffmpeg') is None,
+                                  reason='ffmpeg not installed')
+
+
+class TestChapterDurations:
+    """Tests for _chapter_durations and the stream-copy framing it applies."""
+
+    def test_manifest_is_exact_without_stream_copy(self):
+        known = {'a.m4a': 56805 / SR, 'b.m4a': 85303 / SR}
+        assert engine._chapter_durations([['a.m4a'], ['b.m4a']], known) == [
+            56805 / SR, 85303 / SR]
+
+    @pytest.mark.parametrize('ext, samples, joined', [
+        ('.m4a', 56805, 58368),  # ceil((n + 1024) / 1024) frames of 1024
+        ('.m4a', 85303, 87040),
+        ('.mp3', 56805, 58176),  # ceil((n + 1105) / 576) frames of 576
+        ('.mp3', 85303, 86976),
+        ('.opus', 56805, 57120),  # ceil((n + 156) / 480) frames of 480
+        ('.opus', 85303, 85920),
+        ('.flac', 56805, 56805),
+        ('.wav', 85303, 85303),
+    ])
+    def test_stream_copy_adds_priming_and_padding(self, ext, samples,
+                                                  joined):
+        path = f'ch{ext}'
+        assert engine._chapter_durations(
+            [[path]], {path: samples / SR}, stream_copy=True) == [joined / SR]
+
+    def test_parts_are_summed(self):
+        known = {'p1.m4a': 1000 / SR, 'p2.m4a': 3000 / SR}
+        assert engine._chapter_durations(
+            [['p1.m4a', 'p2.m4a']], known, stream_copy=True) == [
+                (2048 + 4096) / SR]
+
+    @needs_ffmpeg
+    @pytest.mark.parametrize('out_format', ['m4b', 'mp3', 'opus'])
+    def test_chapter_markers_land_on_chapter_audio(self, tmp_path,
+                                                   out_format):
+        """Join noise chapters as create_m4b(preencoded) and
+        concat_audio_files do, then find each chapter's audio in the
+        decoded result and compare with the computed offsets."""
+        rng = np.random.default_rng(0)
+        lengths = [56805, 85303, 52135, 64716, 55727]
+        ext = engine._INTERMEDIATE_EXTS[out_format]
+        chapters, encoded, manifest = [], [], {}
+        for k, n in enumerate(lengths):
+            audio = (0.3 * rng.standard_normal(n)).astype('float32')
+            wav = tmp_path / f'ch{k}.wav'
+            soundfile.write(wav, audio, SR, subtype='FLOAT')
+            enc = str(tmp_path / f'ch{k}{ext}')
+            engine.encode_chapter(str(wav), enc, out_format)
+            chapters.append(audio)
+            encoded.append(enc)
+            manifest[enc] = n / SR
+        output = str(tmp_path / f'book.{out_format}')
+        if out_format == 'm4b':
+            engine.create_m4b(encoded, output, None, 'T', 'A', 1,
+                              preencoded=True, known_durations=manifest)
+        else:
+            engine.concat_audio_files(encoded, output,
+                                      known_durations=manifest)
+        decoded = np.frombuffer(subprocess.run(
+            ['ffmpeg', '-v', 'error', '-i', output, '-f', 'f32le',
+             '-ac', '1', '-ar', str(SR), '-'],
+            capture_output=True, check=True).stdout, dtype='float32')
+
+        durations = engine._chapter_durations(
+            [[f] for f in encoded], manifest, stream_copy=True)
+        expected = np.cumsum([0] + durations[:-1]) * SR
+        found = []
+        for audio, guess in zip(chapters, expected):
+            head = audio[:4800]
+            lo = max(0, int(guess) - 4000)
+            window = decoded[lo:int(guess) + 4000 + len(head)]
+            found.append(lo + int(np.argmax(
+                np.correlate(window, head, 'valid'))))
+        # Every chapter's audio sits the same distance (the book's own
+        # priming, if its decoder keeps it) after its computed start.
+        offsets = np.array(found) - expected
+        assert np.ptp(offsets) <= 2
+        assert 0 <= offsets[0] <= 1024
+
+        if out_format == 'm4b':
+            info = subprocess.run(['ffmpeg', '-i', output],
+                                  capture_output=True, text=True).stderr
+            starts = [float(s) for s in
+                      re.findall(r'Chapter #\d+:\d+: start ([\d.]+)', info)]
+            assert np.allclose(starts, expected / SR, atol=0.002)
+
+
+class _InlineExecutor:
+    """Stand-in for an EncodePool that records encodes without running
+    them."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args, **kwargs):
+        self.submitted.append(args)
+        return engine._completed_future(args[1])
+
+
+class _FakeSynth:
+    """Stand-in for convert_text_to_wav_file: writes one short wav per
+    call and records what it was asked to synthesize."""
+
+    SAMPLES = 2400
+
+    def __init__(self, fail_on=()):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def __call__(self, text, voice, speed, filename, on_segment=None,
+                 trailing_silence=0, normalized=False, **kwargs):
+        self.calls.append({'text': text, 'filename': filename,
+                           'trailing_silence': trailing_silence,
+                           'normalized': normalized, **kwargs})
+        if any(marker in text for marker in self.fail_on):
+            raise RuntimeError('synthesis failed')
+        audio = np.zeros(self.SAMPLES + int(SR * trailing_silence),
+                         dtype='float32')
+        soundfile.write(filename, audio, SR)
+        return len(audio) / SR
+
+
+@pytest.fixture
+def fake_synth(monkeypatch):
+    synth = _FakeSynth()
+    monkeypatch.setattr(engine, 'convert_text_to_wav_file', synth)
+    return synth
+
+
+def _convert(texts, wav_dir, **kwargs):
+    kwargs.setdefault('use_cache', False)
+    kwargs.setdefault('max_chapter_words', 0)
+    kwargs.setdefault('heteronyms', False)
+    kwargs.setdefault('contractions', False)
+    executor = kwargs.pop('executor', None) or _InlineExecutor()
+    return engine.convert_chapters_to_wav(
+        texts, 'af_heart', 1.0, wav_dir, 'book', executor, **kwargs)
+
+
+class TestConvertNormalizesBook:
+    """convert_chapters_to_wav normalizes its chapters with batched
+    normalize_book calls and synthesizes the result as is."""
+
+    @pytest.fixture
+    def book_calls(self, monkeypatch):
+        calls = []
+        real = engine.normalize_book
+
+        def _spy(texts, **kwargs):
+            calls.append(list(texts))
+            return real(texts, **kwargs)
+
+        monkeypatch.setattr(engine, 'normalize_book', _spy)
+        return calls
+
+    def test_one_call_for_the_book(self, tmp_path, fake_synth, book_calls):
+        _convert(['Mr. Smith left.', 'Dr. Jones stayed.'], tmp_path)
+        assert book_calls == [['Mr. Smith left.', 'Dr. Jones stayed.']]
+        assert [(c['text'], c['normalized']) for c in fake_synth.calls] == [
+            ('Mister Smith left.', True), ('Doctor Jones stayed.', True)]
+
+    def test_resumed_chapters_not_normalized(self, tmp_path, fake_synth,
+                                             book_calls):
+        _convert(['Mr. Smith left.'], tmp_path)
+        _convert(['Mr. Smith left.', 'Dr. Jones stayed.'], tmp_path)
+        assert book_calls[1] == ['Dr. Jones stayed.']
+        assert len(fake_synth.calls) == 2
+
+    def test_batches_are_bounded_by_words(self, tmp_path, fake_synth,
+                                          book_calls, monkeypatch):
+        monkeypatch.setattr(engine, '_NORMALIZE_BATCH_WORDS', 3)
+        _convert(['Mr. Smith.', 'Dr. Jones.', 'St. Paul.'], tmp_path)
+        assert book_calls == [['Mr. Smith.', 'Dr. Jones.'], ['St. Paul.']]
+        assert [c['text'] for c in fake_synth.calls] == [
+            'Mister Smith.', 'Doctor Jones.', 'Saint Paul.']
+
+    def test_cancel_between_batches(self, tmp_path, fake_synth, book_calls,
+                                    monkeypatch):
+        monkeypatch.setattr(engine, '_NORMALIZE_BATCH_WORDS', 1)
+        result = _convert(['One.', 'Two.', 'Three.'], tmp_path,
+                          cancel_check=lambda: len(fake_synth.calls) == 1)
+        assert result['cancelled']
+        assert book_calls == [['One.']]
+
+
+class _FakeModel:
+    """Stand-in for KModel: each chunk's audio is derived from its
+    phonemes, and the chunk named `fail_on` raises."""
+
+    device = 'cpu'
+
+    def __init__(self, fail_on=None):
+        self.calls = []
+        self.fail_on = fail_on
+
+    def __call__(self, ps, ref_s, speed):
+        self.calls.append(ps)
+        if ps == self.fail_on:
+            raise RuntimeError('interrupted')
+        return torch.full((len(ps) * 10,), sum(map(ord, ps)) / 1000.0)
+
+
+class _FakePipeline:
+    """Stand-in for KPipeline: one chunk per line, whose phonemes are the
+    line itself. With no model it only chunks, like KPipeline."""
+
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self, text, voice=None, speed=1, split_pattern=r'\n+'):
+        for line in re.split(split_pattern, text):
+            if not line.strip():
+                continue
+            if self.model is None:
+                yield SimpleNamespace(phonemes=line)
+            else:
+                yield line, line, self.model(line, None, speed)
+
+    def load_voice(self, voice):
+        return torch.zeros((510, 1, 256))
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    def _install(model):
+        monkeypatch.setattr(engine, 'get_pipeline',
+                            lambda lang_code: _FakePipeline(model))
+        return model
+    return _install
+
+
+def _segments(text, **kwargs):
+    return [np.asarray(a, dtype='float32') for a in
+            engine.iter_audio_segments(text, 'af_heart', 1.0, r'\n',
+                                       **kwargs)]
+
+
+class TestSegmentCheckpoints:
+    """Tests for the per-chunk checkpoints of interrupted chapters."""
+
+    TEXT = 'aaaa\nbbbb\ncccc\ndddd'
+
+    def test_segment_key_covers_phonemes_voice_and_speed(self):
+        key = engine._segment_key('hˈɛlO', 'af_heart', 1.0)
+        assert key == engine._segment_key('hˈɛlO', 'af_heart', 1)
+        assert len({key,
+                    engine._segment_key('hˈɛlOz', 'af_heart', 1.0),
+                    engine._segment_key('hˈɛlO', 'bm_daniel', 1.0),
+                    engine._segment_key('hˈɛlO', 'af_heart', 1.2)}) == 4
+
+    def test_save_then_load(self, tmp_path):
+        audio = np.linspace(-1, 1, 500)
+        engine._save_segment(tmp_path / 'segs', 'k', audio)
+        loaded = engine._load_segment(tmp_path / 'segs', 'k')
+        assert loaded.dtype == np.float32
+        np.testing.assert_array_equal(loaded, audio.astype('float32'))
+        assert [p.name for p in (tmp_path / 'segs').iterdir()] == ['k.npy']
+
+    def test_load_missing_or_unreadable(self, tmp_path):
+        assert engine._load_segment(tmp_path, 'missing') is None
+        (tmp_path / 'bad.npy').write_bytes(b'not numpy')
+        assert engine._load_segment(tmp_path, 'bad') is None
+
+    def test_save_failure_is_not_fatal(self, tmp_path):
+        (tmp_path / 'segs').mkdir()
+        (tmp_path / 'segs' / 'k.npy').mkdir()  # os.replace cannot win
+        engine._save_segment(tmp_path / 'segs', 'k', np.zeros(10))
+        assert not (tmp_path / 'segs' / 'k.npy.part').exists()
+
+    def test_same_audio_as_plain_loop(self, tmp_path, fake_pipeline):
+        fake_pipeline(_FakeModel())
+        plain = _segments(self.TEXT)
+        checkpointed = _segments(self.TEXT, checkpoint_dir=tmp_path)
+        assert len(plain) == len(checkpointed) == 4
+        for a, b in zip(plain, checkpointed):
+            np.testing.assert_array_equal(a, b)
+        # A run over complete checkpoints loads the same audio back.
+        model = fake_pipeline(_FakeModel())
+        for a, b in zip(plain, _segments(self.TEXT,
+                                         checkpoint_dir=tmp_path)):
+            np.testing.assert_array_equal(a, b)
+        assert model.calls == []
+
+    def test_interrupted_chapter_resumes_at_failed_chunk(self, tmp_path,
+                                                         fake_pipeline):
+        fake_pipeline(_FakeModel())
+        expected = _segments(self.TEXT)
+        fake_pipeline(_FakeModel(fail_on='cccc'))
+        with pytest.raises(RuntimeError):
+            _segments(self.TEXT, checkpoint_dir=tmp_path)
+        assert len(list(tmp_path.glob('*.npy'))) == 2
+
+        model = fake_pipeline(_FakeModel())
+        resumed = _segments(self.TEXT, checkpoint_dir=tmp_path)
+        assert model.calls == ['cccc', 'dddd']
+        for a, b in zip(expected, resumed):
+            np.testing.assert_array_equal(a, b)
+
+    def test_chapter_file_clears_its_checkpoints(self, tmp_path,
+                                                 fake_pipeline):
+        wav = str(tmp_path / 'ch.wav')
+        fake_pipeline(_FakeModel(fail_on='dddd'))
+        with pytest.raises(RuntimeError):
+            engine.convert_text_to_wav_file(
+                self.TEXT, 'af_heart', 1.0, wav, split_pattern=r'\n',
+                normalized=True, segment_checkpoints=True)
+        assert not (tmp_path / 'ch.wav').exists()
+        assert (tmp_path / 'ch_segments').is_dir()
+
+        model = fake_pipeline(_FakeModel())
+        engine.convert_text_to_wav_file(
+            self.TEXT, 'af_heart', 1.0, wav, split_pattern=r'\n',
+            normalized=True, segment_checkpoints=True)
+        assert model.calls == ['dddd']
+        assert soundfile.info(wav).frames == 160
+        assert not (tmp_path / 'ch_segments').exists()
+
+    def test_off_unless_configured(self, tmp_path, fake_synth, monkeypatch):
+        monkeypatch.setattr(engine, 'load_config', lambda: {})
+        _convert(['One.'], tmp_path)
+        monkeypatch.setattr(engine, 'load_config',
+                            lambda: {'segment_checkpoints': True})
+        _convert(['Two.'], tmp_path)
+        _convert(['Three.'], tmp_path, segment_checkpoints=False)
+        assert [c['segment_checkpoints'] for c in fake_synth.calls] == [
+            False, True, False]
+
+
+@pytest.fixture(scope='module')
+def random_kmodel(tmp_path_factory):
+    """A Kokoro-82M-shaped KModel with random weights (a smaller BERT),
+    built without downloading anything. Every token lasts three frames,
+    so chunks of equal length align to equal frame counts."""
+    import math
+    from kokoro.model import KModel
+    torch.manual_seed(0)
+    weights = tmp_path_factory.mktemp('kmodel') / 'empty.pth'
+    torch.save({}, weights)
+    config = {
+        'vocab': {c: i + 1 for i, c in enumerate('abcdefghijklmnopqrstuvwxyz'
+                                                 'ˈˌːəɪʊæɛɔ ,.!?')},
+        'n_token': 178, 'hidden_dim': 512, 'style_dim': 128, 'n_layer': 3,
+        'max_dur': 50, 'dropout': 0.2, 'text_encoder_kernel_size': 5,
+        'n_mels': 80,
+        'plbert': {'hidden_size': 128, 'num_attention_heads': 2,
+                   'intermediate_size': 256, 'max_position_embeddings': 512,
+                   'num_hidden_layers': 2, 'dropout': 0.1},
+        'istftnet': {'upsample_kernel_sizes': [20, 12],
+                     'upsample_rates': [10, 6], 'gen_istft_hop_size': 5,
+                     'gen_istft_n_fft': 20,
+                     'resblock_dilation_sizes': [[1, 3, 5]] * 3,
+                     'resblock_kernel_sizes': [3, 7, 11],
+                     'upsample_initial_channel': 512},
+    }
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        model = KModel(repo_id='test', config=config,
+                       model=str(weights)).eval()
+    with torch.no_grad():
+        proj = model.predictor.duration_proj.linear_layer
+        proj.weight.zero_()
+        proj.bias.fill_(math.log(3 / 47))
+    return model
+
+
+@pytest.fixture
+def no_source_noise(monkeypatch):
+    """Silence the random phase and noise of Kokoro's harmonic source, so
+    two runs over the same chunk can be compared."""
+    monkeypatch.setattr(torch, 'rand', lambda *size, **kw: torch.zeros(*size))
+    monkeypatch.setattr(torch, 'randn_like',
+                        lambda x, *a, **kw: torch.zeros_like(x))
+
+
+def _relative_error(a, b):
+    return float((a - b).norm() / a.norm())
+
+
+class TestForwardBatch:
+    """_forward_batch against KModel's own one-chunk forward pass."""
+
+    VOICE = torch.linspace(-0.1, 0.1, 510 * 256).reshape(510, 1, 256)
+
+    def _refs(self, chunks):
+        return [self.VOICE[len(ps) - 1] for ps in chunks]
+
+    def _both(self, model, chunks):
+        with torch.inference_mode():
+            single = [model(ps, ref, 1.0)
+                      for ps, ref in zip(chunks, self._refs(chunks))]
+            batched = engine._forward_batch(model, chunks,
+                                            self._refs(chunks), 1.0)
+        return single, batched
+
+    def test_unpadded_batch_matches_single_chunks(self, random_kmodel,
+                                                  no_source_noise):
+        single, batched = self._both(random_kmodel,
+                                     ['hi you', 'go now'])
+        for a, b in zip(single, batched):
+            assert a.shape == b.shape
+            assert _relative_error(a, b) < 1e-3
+
+    def test_padded_batch_keeps_lengths(self, random_kmodel,
+                                        no_source_noise):
+        chunks = ['ask', 'where to', 'out']
+        single, batched = self._both(random_kmodel, chunks)
+        assert [len(a) for a in batched] == [len(a) for a in single]
+        # The longest chunk carries no padding, so it is unchanged.
+        assert _relative_error(single[1], batched[1]) < 1e-3
+
+    def test_batches_when_layout_matches(self, random_kmodel, monkeypatch):
+        monkeypatch.setattr(engine, '_unbatchable_models',
+                            engine.weakref.WeakSet())
+        calls = []
+        monkeypatch.setattr(engine, '_forward_batch',
+                            lambda *args: calls.append(args) or ['a', 'b'])
+        assert engine._forward_chunks(random_kmodel, ['ab', 'cd'],
+                                      self._refs(['ab', 'cd']),
+                                      1.0) == ['a', 'b']
+        assert len(calls) == 1
+
+    def test_unknown_layout_runs_chunk_by_chunk(self):
+        model = _FakeModel()
+        audios = engine._forward_chunks(model, ['ab', 'cd'], [None, None],
+                                        1.0)
+        assert model.calls == ['ab', 'cd']
+        assert [len(a) for a in audios] == [20, 20]
+
+    def test_failed_batch_falls_back(self, random_kmodel, monkeypatch,
+                                     no_source_noise):
+        monkeypatch.setattr(engine, '_unbatchable_models',
+                            engine.weakref.WeakSet())
+
+        def _broken(*args):
+            raise TypeError('forward() got an unexpected keyword argument')
+
+        monkeypatch.setattr(engine, '_forward_batch', _broken)
+        chunks = ['hi you', 'go now']
+        with torch.inference_mode():
+            audios = engine._forward_chunks(random_kmodel, chunks,
+                                            self._refs(chunks), 1.0)
+            expected = [random_kmodel(ps, ref, 1.0)
+                        for ps, ref in zip(chunks, self._refs(chunks))]
+        for a, b in zip(expected, audios):
+            assert torch.equal(a, b)
+        assert not engine._can_batch(random_kmodel)
+
+    def test_batch_size_is_part_of_settings_key(self):
+        key = engine.synthesis_settings_key('af_heart', 1.0)
+        assert engine.synthesis_settings_key('af_heart', 1.0,
+                                             batch_size=1) == key
+        assert engine.synthesis_settings_key('af_heart', 1.0,
+                                             batch_size=4) != key
+
+
+class TestSplitChapters:
+    """convert_chapters_to_wav with chapters synthesized in parts."""
+
+    LONG = ('Alpha went home today.\n\nBravo went home today.\n\n'
+            'Zebra went home today.')
+    SHORT = 'Short one.'
+
+    @pytest.fixture
+    def events(self):
+        log = []
+        return log, {
+            'on_chapter_start': lambda i, total, text, resume: log.append(
+                ('start', i, resume)),
+            'on_chapter_done': lambda i, seconds: log.append(
+                ('done', i, seconds)),
+            'on_chapter_error': lambda i, exc: log.append(('error', i)),
+        }
+
+    def test_split_chapter_is_one_entry(self, tmp_path, fake_synth, events):
+        log, callbacks = events
+        result = _convert([self.SHORT, self.LONG], tmp_path,
+                          max_chapter_words=4, chapter_gap=0.5, **callbacks)
+        assert len(fake_synth.calls) == 4
+        assert len(result['wav_files']) == 2
+        future, encoded = result['encode_futures'][result['wav_files'][1]]
+        assert isinstance(encoded, tuple) and len(encoded) == 3
+        assert future.result() == list(encoded)
+        assert isinstance(
+            result['encode_futures'][result['wav_files'][0]][1], str)
+        assert len(result['part_wav_files']) == 3
+        assert list(result['part_enc_files']) == list(encoded)
+        part_seconds = _FakeSynth.SAMPLES / SR
+        assert log == [('start', 1, False), ('done', 1, part_seconds + 0.5),
+                       ('start', 2, False),
+                       ('done', 2, 3 * part_seconds + 0.5)]
+
+    def test_gap_only_after_last_part(self, tmp_path, fake_synth):
+        _convert([self.LONG], tmp_path, max_chapter_words=4, chapter_gap=0.5)
+        assert [c['trailing_silence'] for c in fake_synth.calls] == [
+            0.0, 0.0, 0.5]
+
+    def test_unit_wav_names_match_synthesis(self, tmp_path, fake_synth):
+        _convert([self.SHORT, self.LONG], tmp_path, max_chapter_words=4,
+                 chapter_gap=0.5)
+        names = engine.chapter_unit_wav_names(
+            'book', [self.SHORT, self.LONG], tmp_path, 'af_heart', 1.0, 0.5,
+            heteronyms=False, contractions=False, max_chapter_words=4)
+        assert [len(wavs) for wavs in names] == [1, 3]
+        assert [c['filename'] for c in fake_synth.calls] == [
+            wav for wavs in names for wav in wavs]
+
+    def test_failed_part_fails_chapter(self, tmp_path, monkeypatch, events):
+        log, callbacks = events
+        synth = _FakeSynth(fail_on=('Bravo',))
+        monkeypatch.setattr(engine, 'convert_text_to_wav_file', synth)
+        result = _convert([self.LONG, self.SHORT], tmp_path,
+                          max_chapter_words=4, **callbacks)
+        # The part after the failed one is not synthesized at all.
+        assert [c['text'] for c in synth.calls] == [
+            'Alpha went home today.', 'Bravo went home today.',
+            'Short one.']
+        assert log == [('start', 1, False), ('error', 1),
+                       ('start', 2, False), ('done', 2, pytest.approx(0.1))]
+        assert len(result['wav_files']) == 1
+        assert result['wav_files'][0] in result['encode_futures']
+        assert len(result['part_wav_files']) == 1
+
+    def test_resume_synthesizes_missing_parts(self, tmp_path, monkeypatch,
+                                              events):
+        log, callbacks = events
+        monkeypatch.setattr(engine, 'convert_text_to_wav_file',
+                            _FakeSynth(fail_on=('Bravo',)))
+        _convert([self.LONG], tmp_path, max_chapter_words=4)
+        synth = _FakeSynth()
+        monkeypatch.setattr(engine, 'convert_text_to_wav_file', synth)
+        result = _convert([self.LONG], tmp_path, max_chapter_words=4,
+                          **callbacks)
+        assert [c['text'] for c in synth.calls] == [
+            'Bravo went home today.', 'Zebra went home today.']
+        # Part of the chapter came from the earlier run, so this run
+        # cannot report the whole chapter's length.
+        assert log == [('start', 1, False), ('done', 1, None)]
+        (wav,) = result['wav_files']
+        assert len(result['encode_futures'][wav][1]) == 3
+        assert result['durations'] == {
+            path: pytest.approx(_FakeSynth.SAMPLES / SR)
+            for path in result['encode_futures'][wav][1]}
+
+
+class _StubWorker:
+    """Stand-in for _tts_worker_chapter, run on threads: writes 100
+    samples per chapter number, finishing later chapters first, and fails
+    for texts containing a marker."""
+
+    def __init__(self):
+        self.texts = []
+        self.fail_on = ()
+        self._lock = threading.Lock()
+
+    def __call__(self, text, voice, speed, out_filename, synth_kwargs,
+                 encode_args=None):
+        n = int(re.search(r'\d', text).group())
+        with self._lock:
+            self.texts.append(text)
+        # Chapter n sleeps longer than chapter n + 1.
+        time.sleep(0.05 * (5 - n))
+        if any(marker in text for marker in self.fail_on):
+            raise RuntimeError(f'worker failed on {text!r}')
+        soundfile.write(out_filename, np.zeros(100 * n, dtype='float32'), SR)
+        return 100 * n / SR
+
+
+class TestParallelChapters:
+    """convert_chapters_to_wav with workers > 1, on a stub worker pool."""
+
+    TEXTS = ['Chapter 1.', 'Chapter 2.', 'Chapter 3.', 'Chapter 4.']
+
+    @pytest.fixture
+    def worker(self, monkeypatch):
+        stub = _StubWorker()
+        monkeypatch.setattr(engine, '_tts_worker_chapter', stub)
+        monkeypatch.setattr(engine, '_create_tts_pool',
+                            lambda workers: ThreadPoolExecutor(workers))
+        return stub
+
+    @pytest.fixture
+    def events(self):
+        log = []
+        caller = threading.current_thread()
+
+        def _record(*event):
+            assert threading.current_thread() is caller
+            log.append(event)
+
+        return log, {
+            'on_chapter_start': lambda i, total, text, resume: _record(
+                'start', i),
+            'on_chapter_done': lambda i, seconds: _record('done', i),
+            'on_chapter_error': lambda i, exc: _record('error', i, str(exc)),
+        }
+
+    def test_chapter_order_and_callbacks(self, tmp_path, worker, events):
+        log, callbacks = events
+        result = _convert(self.TEXTS, tmp_path, workers=4, **callbacks)
+        assert [soundfile.info(w).frames for w in result['wav_files']] == [
+            100, 200, 300, 400]
+        assert [e for e in log if e[0] == 'start'] == [
+            ('start', i) for i in (1, 2, 3, 4)]
+        # Done callbacks come in completion order: the stub finishes the
+        # last chapter first.
+        assert [e for e in log if e[0] == 'done'] == [
+            ('done', i) for i in (4, 3, 2, 1)]
+        assert not result['cancelled']
+
+    def test_worker_error_fails_only_its_chapter(self, tmp_path, worker,
+                                                 events):
+        log, callbacks = events
+        worker.fail_on = ('Chapter 2',)
+        result = _convert(self.TEXTS, tmp_path, workers=2, **callbacks)
+        assert ('error', 2, "worker failed on 'Chapter 2.'") in log
+        assert ('done', 2) not in log
+        assert [soundfile.info(w).frames for w in result['wav_files']] == [
+            100, 300, 400]
+
+    def test_identical_chapters_synthesized_once(self, tmp_path, worker,
+                                                 events):
+        log, callbacks = events
+        result = _convert(['Chapter 1.', 'Chapter 1.', 'Chapter 3.'],
+                          tmp_path, workers=3, **callbacks)
+        assert sorted(worker.texts) == ['Chapter 1.', 'Chapter 3.']
+        assert sorted(e[1] for e in log if e[0] == 'done') == [1, 2, 3]
+        assert [soundfile.info(w).frames for w in result['wav_files']] == [
+            100, 100, 300]
+
+    def test_cancel_stops_handing_out_chapters(self, tmp_path, worker):
+        result = _convert(self.TEXTS, tmp_path, workers=2,
+                          cancel_check=lambda: len(worker.texts) >= 2)
+        assert result['cancelled']
+        assert len(worker.texts) == 2
+
+
+def test_tts_pool_workers_share_the_cpus(monkeypatch):
+    """_create_tts_pool's spawned workers run the initializer, which caps
+    each one's torch threads at its share of the CPUs."""
+    monkeypatch.setattr(engine.os, 'cpu_count', lambda: 8)
+    pool = engine._create_tts_pool(2)
+    try:
+        assert pool.submit(torch.get_num_threads).result(timeout=120) == 4
+    finally:
+        pool.shutdown()
+
+
+class _FakeEncoder:
+    """Stand-in for the ffmpeg Popen of convert_text_to_encoded_file: it
+    writes whatever it is fed to its output path. `fail` is None, 'exit'
+    (exits non-zero once stdin closes) or 'pipe' (dies after the first
+    write, so the next one breaks the pipe)."""
+
+    def __init__(self, argv, fail=None, **kwargs):
+        self.path = argv[-1]
+        self.fail = fail
+        self.returncode = None
+        self.killed = False
+        self._out = open(self.path, 'wb')
+        self.stdin = self
+        self.stderr = io.BytesIO(b'fake encoder error' if fail else b'')
+
+    def write(self, data):
+        if self._out.closed:
+            raise BrokenPipeError
+        self._out.write(data)
+        if self.fail == 'pipe':
+            self._out.close()
+            self.returncode = 1
+
+    def close(self):
+        self._out.close()
+        if self.returncode is None:
+            self.returncode = 1 if self.fail == 'exit' else 0
+
+    def wait(self):
+        return self.returncode
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.killed = True
+        self.close()
+
+
+class TestEncodedFile:
+    """convert_text_to_encoded_file's part file and encoder failures."""
+
+    TEXT = 'aaaa\nbbbb\ncccc'
+
+    @pytest.fixture
+    def encoders(self, monkeypatch, fake_pipeline):
+        fake_pipeline(_FakeModel())
+        monkeypatch.setattr(engine, 'normalize_text',
+                            lambda text, **kwargs: text)
+        made = []
+
+        def _install(fail=None):
+            def _popen(argv, **kwargs):
+                made.append(_FakeEncoder(argv, fail, **kwargs))
+                return made[-1]
+            monkeypatch.setattr(engine.subprocess, 'Popen', _popen)
+            return made
+        return _install
+
+    def _encode(self, path, **kwargs):
+        return engine.convert_text_to_encoded_file(
+            self.TEXT, 'af_heart', 1.0, str(path), out_format='m4a',
+            split_pattern=r'\n', **kwargs)
+
+    def test_part_file_renamed_on_success(self, tmp_path, encoders):
+        made = encoders()
+        seconds = self._encode(tmp_path / 'ch.m4a', trailing_silence=0.5)
+        assert made[0].path == str(tmp_path / 'ch.part.m4a')
+        assert [p.name for p in tmp_path.iterdir()] == ['ch.m4a']
+        # 120 float32 samples of speech, then half a second of silence.
+        samples = 120 + SR // 2
+        assert (tmp_path / 'ch.m4a').stat().st_size == samples * 4
+        assert seconds == samples / SR
+
+    @pytest.mark.parametrize('fail', ['exit', 'pipe'])
+    def test_failed_encoder_leaves_no_file(self, tmp_path, encoders, fail):
+        encoders(fail)
+        with pytest.raises(RuntimeError, match='fake encoder error'):
+            self._encode(tmp_path / 'ch.m4a')
+        assert list(tmp_path.iterdir()) == []
+
+    def test_failed_encoder_keeps_previous_file(self, tmp_path, encoders):
+        (tmp_path / 'ch.m4a').write_bytes(b'old')
+        encoders('exit')
+        with pytest.raises(RuntimeError):
+            self._encode(tmp_path / 'ch.m4a')
+        assert [p.name for p in tmp_path.iterdir()] == ['ch.m4a']
+        assert (tmp_path / 'ch.m4a').read_bytes() == b'old'
+
+    def test_synthesis_error_kills_encoder(self, tmp_path, encoders,
+                                           fake_pipeline):
+        made = encoders()
+        fake_pipeline(_FakeModel(fail_on='bbbb'))
+        with pytest.raises(RuntimeError, match='interrupted'):
+            self._encode(tmp_path / 'ch.m4a')
+        assert made[0].killed
+        assert list(tmp_path.iterdir()) == []
+
+    def test_no_audio_starts_no_encoder(self, tmp_path, encoders):
+        made = encoders()
+        assert engine.convert_text_to_encoded_file(
+            '\n\n', 'af_heart', 1.0, str(tmp_path / 'ch.m4a'),
+            split_pattern=r'\n') is None
+        assert made == []
+        assert list(tmp_path.iterdir()) == []
+
+    @needs_ffmpeg
+    def test_real_encoder_failure(self, tmp_path, monkeypatch,
+                                  fake_pipeline):
+        fake_pipeline(_FakeModel())
+        monkeypatch.setattr(engine, 'normalize_text',
+                            lambda text, **kwargs: text)
+        with pytest.raises(RuntimeError, match='Chapter encoding failed'):
+            self._encode(tmp_path / 'ch.m4a', bitrate='not-a-bitrate')
+        assert list(tmp_path.iterdir()) == []
+
+
+def _write_noise(path, samples, seed):
+    audio = 0.1 * np.random.default_rng(seed).standard_normal(samples)
+    soundfile.write(path, audio.astype('float32'), SR, subtype='FLOAT')
+    return str(path)
+
+
+def _probe_chapters(path):
+    info = subprocess.run(['ffmpeg', '-i', str(path)], capture_output=True,
+                          text=True).stderr
+    starts = [float(s) for s in
+              re.findall(r'Chapter #\d+:\d+: start ([\d.]+)', info)]
+    titles = re.findall(r'Chapter #.*\n\s+Metadata:\n\s+title\s+: (.*)',
+                        info)
+    return starts, titles
+
+
+@needs_ffmpeg
+class TestBookEncoder:
+    """Tests for BookEncoder, against a real ffmpeg."""
+
+    LENGTHS = [12000, 30000, 18000]
+
+    @pytest.fixture
+    def wavs(self, tmp_path):
+        return [_write_noise(tmp_path / f'ch{k}.wav', n, k)
+                for k, n in enumerate(self.LENGTHS, start=1)]
+
+    def test_chapters_added_out_of_order(self, tmp_path, wavs):
+        output = tmp_path / 'book.flac'
+        encoder = engine.BookEncoder(output, 'flac')
+        encoder.add(3, [wavs[2]])
+        encoder.add(1, [wavs[0]])
+        encoder.add(2, [wavs[1]])
+        durations = encoder.finish()
+        assert durations == [n / SR for n in self.LENGTHS]
+        decoded, _ = soundfile.read(output, dtype='float32')
+        expected = np.concatenate(
+            [soundfile.read(w, dtype='float32')[0] for w in wavs])
+        np.testing.assert_allclose(decoded, expected, atol=1e-4)
+        assert [p.name for p in tmp_path.glob('book*')] == ['book.flac']
+
+    def test_parts_feed_one_chapter(self, tmp_path, wavs):
+        encoder = engine.BookEncoder(tmp_path / 'book.flac', 'flac')
+        encoder.add(1, wavs[:2])
+        encoder.add(2, [wavs[2]])
+        assert encoder.finish() == [
+            (self.LENGTHS[0] + self.LENGTHS[1]) / SR, self.LENGTHS[2] / SR]
+
+    def test_skipped_chapter_keeps_titles_aligned(self, tmp_path, wavs):
+        output = tmp_path / 'book.m4b'
+        encoder = engine.BookEncoder(output, 'm4b')
+        encoder.add(3, [wavs[2]])
+        encoder.skip(2)
+        encoder.add(1, [wavs[0]])
+        durations = encoder.finish('T', 'A', 1, ['One', 'Three'])
+        assert durations == [self.LENGTHS[0] / SR, self.LENGTHS[2] / SR]
+        starts, titles = _probe_chapters(output)
+        assert titles == ['One', 'Three']
+        assert starts == pytest.approx([0, self.LENGTHS[0] / SR],
+                                       abs=0.002)
+
+    def test_chapter_never_added_is_passed_over(self, tmp_path, wavs):
+        encoder = engine.BookEncoder(tmp_path / 'book.mp3', 'mp3')
+        encoder.add(1, [wavs[0]])
+        encoder.add(3, [wavs[2]])
+        assert encoder.finish() == [self.LENGTHS[0] / SR,
+                                    self.LENGTHS[2] / SR]
+
+    def test_nothing_fed_fails_and_leaves_no_file(self, tmp_path):
+        encoder = engine.BookEncoder(tmp_path / 'book.m4b', 'm4b')
+        encoder.skip(1)
+        with pytest.raises(RuntimeError, match='No chapters'):
+            encoder.finish()
+        encoder.abort()
+        assert list(tmp_path.iterdir()) == []
+
+    def test_abort_discards_output(self, tmp_path, wavs):
+        encoder = engine.BookEncoder(tmp_path / 'book.m4b', 'm4b')
+        encoder.add(1, [wavs[0]])
+        encoder.abort()
+        encoder.abort()
+        assert not list(tmp_path.glob('book*'))
+
+
+class TestEncodeWorkerCount:
+    """Tests for encode_worker_count."""
+
+    def test_explicit_value_wins(self):
+        assert engine.encode_worker_count(3, {'encode_workers': 1}) == 3
+
+    def test_config_value(self):
+        assert engine.encode_worker_count(None, {'encode_workers': 2}) == 2
+
+    @pytest.mark.parametrize('cpus, expected', [
+        (None, 1), (1, 1), (4, 1), (8, 2), (16, 4), (64, 4)])
+    def test_auto_is_a_quarter_of_the_cpus(self, monkeypatch, cpus,
+                                           expected):
+        monkeypatch.setattr(engine.os, 'cpu_count', lambda: cpus)
+        assert engine.encode_worker_count(0, {}) == expected
+        assert engine.encode_worker_count(None, {}) == expected
+        assert engine.encode_worker_count(
+            None, {'encode_workers': 'many'}) == expected
+        assert engine.encode_worker_count(
+            None, {'encode_workers': -2}) == expected
+
+
+class TestEncodePool:
+    """EncodePool.submit blocks at max_pending until an encode settles."""
+
+    def _submit_in_thread(self, pool, fn):
+        submitted = threading.Event()
+        holder = []
+
+        def _run():
+            holder.append(pool.submit(fn))
+            submitted.set()
+
+        threading.Thread(target=_run, daemon=True).start()
+        return submitted, holder
+
+    def test_blocks_until_an_encode_finishes(self):
+        release = threading.Event()
+        with engine.EncodePool(workers=1, max_pending=2) as pool:
+            first = pool.submit(release.wait)
+            second = pool.submit(lambda: 'queued')
+            submitted, holder = self._submit_in_thread(pool, lambda: 'third')
+            assert not submitted.wait(0.2)
+            release.set()
+            assert submitted.wait(5)
+            assert holder[0].result(timeout=5) == 'third'
+            assert first.result() is True
+            assert second.result() == 'queued'
+
+    def test_cancel_frees_a_slot(self):
+        release = threading.Event()
+        with engine.EncodePool(workers=1, max_pending=2) as pool:
+            pool.submit(release.wait)
+            queued = pool.submit(lambda: 'queued')
+            submitted, _ = self._submit_in_thread(pool, lambda: 'third')
+            assert not submitted.wait(0.2)
+            assert queued.cancel()
+            assert submitted.wait(5)
+            release.set()
+
+    def test_failed_encode_frees_its_slot(self):
+        def _boom():
+            raise RuntimeError('encode failed')
+
+        with engine.EncodePool(workers=1, max_pending=1) as pool:
+            failed = pool.submit(_boom)
+            with pytest.raises(RuntimeError):
+                failed.result(timeout=5)
+            assert pool.submit(lambda: 'next').result(timeout=5) == 'next'
+
+    def test_default_bound_is_twice_the_workers(self):
+        release = threading.Event()
+        with engine.EncodePool(workers=2) as pool:
+            for _ in range(4):
+                pool.submit(release.wait)
+            submitted, _ = self._submit_in_thread(pool, lambda: None)
+            assert not submitted.wait(0.2)
+            release.set()
+            assert submitted.wait(5)
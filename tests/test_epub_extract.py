@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('ebooklib')
+pytest.importorskip('bs4')
+pytest.importorskip('lxml')
+
+from autiobooks import epub_parser  # noqa: E402
+
+
+GOLDEN_DIR = Path(__file__).parent / 'golden' / 'epub_text'
+GOLDEN_CASES = sorted(GOLDEN_DIR.glob('*.html'))
+
+
+def _expected(html_path):
+    return html_path.with_suffix('.txt').read_text(encoding='utf-8')[:-1]
+
+
+@pytest.mark.parametrize('html_path', GOLDEN_CASES, ids=lambda p: p.stem)
+class TestGoldenCorpus:
+    """The lxml extractor reproduces the golden text for every chapter."""
+
+    def test_bytes(self, html_path):
+        raw = html_path.read_bytes()
+        assert epub_parser.extract_text_from_html(raw) == _expected(html_path)
+
+    def test_matches_reference_extractor(self, html_path):
+        raw = html_path.read_bytes()
+        assert (epub_parser.extract_text_from_html(raw)
+                == epub_parser._extract_text_from_html_bs4(raw))
+
+
+class TestEncodings:
+    """Byte input is decoded the way BeautifulSoup would decode it."""
+
+    def test_str_input(self):
+        html = '\ufeff<p>Café</p><p>two</p>'
+        assert epub_parser.extract_text_from_html(html) == 'Café\ntwo'
+
+    def test_utf8_bom(self):
+        raw = b'\xef\xbb\xbf<p>na\xc3\xafve</p>'
+        assert epub_parser.extract_text_from_html(raw) == 'naïve'
+
+    def test_utf16_bom(self):
+        raw = '<p>“quoted”</p>'.encode('utf-16')
+        assert epub_parser.extract_text_from_html(raw) == '“quoted”'
+
+    def test_xml_declaration(self):
+        raw = ('<?xml version="1.0" encoding="iso-8859-1"?>'
+               '<html><body><p>Café</p></body></html>').encode('latin-1')
+        assert epub_parser.extract_text_from_html(raw) == 'Café'
+
+    def test_bogus_declared_charset(self):
+        raw = b'<meta charset="no-such-codec"><p>plain</p>'
+        assert epub_parser.extract_text_from_html(raw) == 'plain'
+
+    def test_empty(self):
+        assert epub_parser.extract_text_from_html(b'') == ''
@@ -0,0 +1,255 @@
+import zipfile
+
+import pytest
+
+pytest.importorskip('ebooklib')
+pytest.importorskip('bs4')
+
+from autiobooks import epub_parser  # noqa: E402
+
+
+_CONTAINER = """<?xml version="1.0"?>
+<container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">
+  <rootfiles>
+    <rootfile full-path="OEBPS/content.opf"
+              media-type="application/oebps-package+xml"/>
+  </rootfiles>
+</container>"""
+
+_OPF = """<?xml version="1.0" encoding="utf-8"?>
+<package xmlns="http://www.idpf.org/2007/opf" version="3.0"
+         unique-identifier="id">
+  <metadata xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <dc:identifier id="id">test-book</dc:identifier>
+    <dc:title>Lazy Book</dc:title>
+    <dc:creator>A. Writer</dc:creator>
+  </metadata>
+  <manifest>
+    <item id="nav" href="nav.xhtml" media-type="application/xhtml+xml"
+          properties="nav"/>
+    <item id="c1" href="ch1.xhtml" media-type="application/xhtml+xml"/>
+    <item id="c2" href="ch%202.xhtml" media-type="application/xhtml+xml"/>
+    <item id="img" href="images/plate.png" media-type="image/png"/>
+  </manifest>
+  <spine>
+    <itemref idref="c1"/>
+    <itemref idref="c2"/>
+  </spine>
+</package>"""
+
+_NAV = """<?xml version="1.0" encoding="utf-8"?>
+<html xmlns="http://www.w3.org/1999/xhtml"
+      xmlns:epub="http://www.idpf.org/2007/ops">
+<body><nav epub:type="toc"><ol>
+  <li><a href="ch1.xhtml">The Beginning</a></li>
+  <li><a href="ch 2.xhtml">The End</a></li>
+</ol></nav></body></html>"""
+
+
+def _chapter(heading, body):
+    return (f'<?xml version="1.0" encoding="utf-8"?>'
+            f'<html xmlns="http://www.w3.org/1999/xhtml"><body>'
+            f'<h1>{heading}</h1><p>{body}</p></body></html>')
+
+
+@pytest.fixture
+def epub_path(tmp_path):
+    path = tmp_path / 'book.epub'
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr('mimetype', 'application/epub+zip')
+        zf.writestr('META-INF/container.xml', _CONTAINER)
+        zf.writestr('OEBPS/content.opf', _OPF)
+        zf.writestr('OEBPS/nav.xhtml', _NAV)
+        zf.writestr('OEBPS/ch1.xhtml', _chapter('One', 'It was dark.'))
+        zf.writestr('OEBPS/ch 2.xhtml', _chapter('Two', 'Then light.'))
+        zf.writestr('OEBPS/images/plate.png', b'\x89PNG' + b'\0' * 4096)
+    return path
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    """Record every member the lazy loader reads from the archive."""
+    seen = []
+    real_read = epub_parser._EpubArchive.read
+
+    def read(self, name):
+        seen.append(name)
+        return real_read(self, name)
+    monkeypatch.setattr(epub_parser._EpubArchive, 'read', read)
+    return seen
+
+
+class TestLazyEpubLoader:
+    """Tests for read_epub_lazy / get_book."""
+
+    def test_open_reads_no_content(self, epub_path, reads):
+        book = epub_parser.read_epub_lazy(epub_path)
+        assert reads == []
+        assert epub_parser.get_title(book) == 'Lazy Book'
+        assert epub_parser.get_author(book) == 'A. Writer'
+
+    def test_chapters_extract_on_demand(self, epub_path, reads):
+        book = epub_parser.read_epub_lazy(epub_path)
+        (chapter,) = [i for i in book.get_items()
+                      if i.file_name == 'ch 2.xhtml']
+        assert chapter.extracted_text == 'Two\nThen light.'
+        assert reads == ['OEBPS/ch 2.xhtml']
+        # Extracted once, then kept.
+        assert chapter.extracted_text == 'Two\nThen light.'
+        assert chapter.heading == 'Two'
+        assert reads == ['OEBPS/ch 2.xhtml']
+
+    def test_get_book_reads_no_chapters(self, epub_path, reads):
+        book, chapters, cover = epub_parser.get_book(epub_path, False)
+        names = [ch.file_name for ch in chapters]
+        assert names[-2:] == ['ch1.xhtml', 'ch 2.xhtml']
+        assert reads == []
+        assert chapters[-1].extracted_text == 'Two\nThen light.'
+        assert reads == ['OEBPS/ch 2.xhtml']
+
+    def test_extract_all_texts_reads_each_chapter_once(self, epub_path,
+                                                       reads, monkeypatch):
+        monkeypatch.setattr(epub_parser, 'PARALLEL_MIN_CHAPTERS', 0)
+        monkeypatch.setattr(epub_parser, 'PARALLEL_MIN_BYTES', 0)
+        monkeypatch.setattr(epub_parser.os, 'cpu_count', lambda: 2)
+        _, chapters, _ = epub_parser.get_book(epub_path, False)
+        chapters[-1].extracted_text
+        epub_parser.extract_all_texts(chapters)
+        assert sorted(r for r in reads if r.endswith('.xhtml')) == [
+            'OEBPS/ch 2.xhtml', 'OEBPS/ch1.xhtml']
+        assert [ch.heading for ch in chapters[-2:]] == ['One', 'Two']
+        assert chapters[-2].extracted_text == 'One\nIt was dark.'
+
+    def test_images_only_read_when_used(self, epub_path, reads):
+        book, chapters, _ = epub_parser.get_book(epub_path, False)
+        for ch in chapters:
+            ch.extracted_text
+        assert not any(r.endswith('.png') for r in reads)
+        (image,) = [i for i in book.get_items() if i.file_name.endswith('png')]
+        assert image.get_content().startswith(b'\x89PNG')
+
+    def test_titles_from_toc(self, epub_path):
+        book, chapters, _ = epub_parser.get_book(epub_path, False)
+        titles = epub_parser.get_chapter_titles(book, chapters[-2:])
+        assert titles == ['The Beginning', 'The End']
+
+    def test_matches_eager_reader(self, epub_path):
+        from ebooklib import epub
+        eager = epub.read_epub(str(epub_path), options={'ignore_ncx': True})
+        expected = [(ch.file_name, ch.extracted_text) for ch in
+                    epub_parser.find_document_chapters_and_extract_texts(
+                        eager)]
+        _, chapters, _ = epub_parser.get_book(epub_path, False)
+        assert [(ch.file_name, ch.extracted_text)
+                for ch in chapters] == expected
+
+
+class TestChapterExtraction:
+    """Tests for _extract_chapters and the headings it records."""
+
+    HTMLS = [_chapter(f'Heading {i}', f'Body text {i}.').encode('utf-8')
+             for i in range(6)]
+
+    def test_text_and_heading_in_one_parse(self):
+        assert epub_parser._extract_chapter(self.HTMLS[0]) == (
+            'Heading 0\nBody text 0.', 'Heading 0')
+        assert epub_parser._extract_chapter(b'<p>No heading</p>') == (
+            'No heading', None)
+
+    def test_heading_order_matches_reference(self):
+        html = (b'<html><head><title>T</title></head><body><h3>Three</h3>'
+                b'<h2> </h2><h2>Two<script>x</script></h2><h1>'
+                b'<a epub:type="noteref">1</a>One <em>A</em></h1></body>'
+                b'</html>')
+        expected = epub_parser._extract_chapter_bs4(html)
+        assert epub_parser._extract_chapter(html) == expected
+        assert expected[1] == '1OneA'
+
+    def test_process_pool_keeps_spine_order(self, monkeypatch):
+        monkeypatch.setattr(epub_parser, 'PARALLEL_MIN_BYTES', 0)
+        monkeypatch.setattr(epub_parser.os, 'cpu_count', lambda: 2)
+        results = epub_parser._extract_chapters(self.HTMLS)
+        assert results == [epub_parser._extract_chapter(h)
+                           for h in self.HTMLS]
+
+    def test_titles_use_recorded_heading(self, epub_path, monkeypatch):
+        book, chapters, _ = epub_parser.get_book(epub_path, False)
+        epub_parser.extract_all_texts(chapters)
+        book.toc = []
+
+        def no_parse(html_content):
+            raise AssertionError('chapter parsed twice')
+        monkeypatch.setattr(epub_parser, '_extract_chapter', no_parse)
+        assert epub_parser.get_chapter_titles(book, chapters[-2:]) == [
+            'One', 'Two']
+
+
+@pytest.fixture
+def book_cache_dir(tmp_path, monkeypatch):
+    from autiobooks import book_cache
+    monkeypatch.setattr(book_cache, 'BOOK_CACHE_DIR', tmp_path / 'books')
+    return tmp_path / 'books'
+
+
+class TestDiskCachedBook:
+    """Tests for get_book_cached's on-disk book cache."""
+
+    def test_second_load_reads_no_chapters(self, epub_path, book_cache_dir,
+                                           reads):
+        _, first, _ = epub_parser.get_book_cached(epub_path, False)
+        first_texts = [(ch.file_name, ch.extracted_text) for ch in first]
+        epub_parser.clear_chapter_cache()
+        del reads[:]
+        book, chapters, _ = epub_parser.get_book_cached(epub_path, False)
+        assert [(ch.file_name, ch.extracted_text)
+                for ch in chapters] == first_texts
+        assert reads == []
+        assert chapters[-1].word_count == 3
+        book.toc = []
+        assert epub_parser.get_chapter_titles(book, chapters[-2:]) == [
+            'One', 'Two']
+        assert reads == []
+
+    def test_parser_version_bump_reparses(self, epub_path, book_cache_dir,
+                                          reads, monkeypatch):
+        epub_parser.get_book_cached(epub_path, False)
+        epub_parser.clear_chapter_cache()
+        monkeypatch.setattr(epub_parser, 'PARSER_VERSION',
+                            epub_parser.PARSER_VERSION + 1)
+        del reads[:]
+        epub_parser.get_book_cached(epub_path, False)
+        assert 'OEBPS/ch1.xhtml' in reads
+
+    def test_hit_does_not_open_book(self, epub_path, book_cache_dir,
+                                    monkeypatch):
+        epub_parser.get_book_cached(epub_path, False)
+        epub_parser.clear_chapter_cache()
+
+        def no_open(file_path):
+            raise AssertionError('book opened on a cache hit')
+        monkeypatch.setattr(epub_parser, 'read_epub_lazy', no_open)
+        book, chapters, cover = epub_parser.get_book_cached(epub_path, False)
+        assert epub_parser.get_title(book) == 'Lazy Book'
+        assert epub_parser.get_author(book) == 'A. Writer'
+        assert epub_parser.get_chapter_titles(book, chapters[-2:]) == [
+            'The Beginning', 'The End']
+        assert cover is None
+        assert epub_parser.get_cover_image(book, False) is None
+
+    def test_hit_keeps_cover(self, tmp_path, book_cache_dir, monkeypatch):
+        path = tmp_path / 'covered.epub'
+        with zipfile.ZipFile(path, 'w') as zf:
+            zf.writestr('mimetype', 'application/epub+zip')
+            zf.writestr('META-INF/container.xml', _CONTAINER)
+            zf.writestr('OEBPS/content.opf',
+                        _OPF.replace('images/plate.png', 'images/cover.png'))
+            zf.writestr('OEBPS/nav.xhtml', _NAV)
+            zf.writestr('OEBPS/ch1.xhtml', _chapter('One', 'It was dark.'))
+            zf.writestr('OEBPS/ch 2.xhtml', _chapter('Two', 'Then light.'))
+            zf.writestr('OEBPS/images/cover.png', b'\x89PNG' + b'\1' * 64)
+        _, _, first = epub_parser.get_book_cached(path, False)
+        epub_parser.clear_chapter_cache()
+        monkeypatch.setattr(epub_parser, 'read_epub_lazy', None)
+        book, _, cover = epub_parser.get_book_cached(path, False)
+        assert cover == first == b'\x89PNG' + b'\1' * 64
+        assert epub_parser.get_cover_image(book, False) == cover
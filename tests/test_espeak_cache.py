@@ -0,0 +1,109 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from autiobooks import espeak_cache
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(espeak_cache, 'ESPEAK_CACHE_DIR', tmp_path)
+    monkeypatch.setattr(espeak_cache, '_caches', {})
+    return tmp_path
+
+
+class _FakeBackend:
+    def __init__(self):
+        self.batches = []
+
+    @staticmethod
+    def version():
+        return (1, 51)
+
+    def phonemize(self, texts):
+        self.batches.append(list(texts))
+        return [f' {t.lower()}^ ' for t in texts]
+
+
+@pytest.fixture
+def fallback_cls():
+    """A stand-in for misaki.espeak.EspeakFallback."""
+    class FakeFallback:
+        def __init__(self, british=False, version=None):
+            self.british = british
+            self.version = version
+            self.backend = _FakeBackend()
+
+        def __call__(self, token):
+            ps = self.backend.phonemize([token.text])
+            if not ps:
+                return None, None
+            return ps[0].strip().replace('^', ''), 2
+
+    espeak_cache.memoize_fallback(FakeFallback)
+    return FakeFallback
+
+
+class _FakeLexicon:
+    cap_stresses = (0.5, 2)
+    known = {'the', 'dragon', 'said'}
+
+    def get_word(self, word, tag, stress, ctx):
+        return (word, 4) if word.lower() in self.known else (None, None)
+
+
+def _tk(text):
+    return SimpleNamespace(text=text)
+
+
+class TestEspeakCache:
+    """Tests for memoize_fallback / prefetch."""
+
+    def test_call_is_cached(self, cache_dir, fallback_cls):
+        fb = fallback_cls()
+        assert fb(_tk('Zorblax')) == ('zorblax', 2)
+        assert fb(_tk('Zorblax')) == ('zorblax', 2)
+        assert fb.backend.batches == [['Zorblax']]
+
+    def test_prefetch_batches_oov_words(self, cache_dir, fallback_cls):
+        fb = fallback_cls()
+        g2p = SimpleNamespace(lexicon=_FakeLexicon(), fallback=fb)
+        text = ("The dragon Zorblax said [Qwerty](/kwˈɜɹti/) to Vexmoor. "
+                "Zorblax left.")
+        # One espeak call; known words, repeats and markdown-wrapped
+        # words are left out.
+        assert espeak_cache.prefetch(g2p, text) == 4
+        assert fb.backend.batches == [['Zorblax', 'to', 'Vexmoor', 'left']]
+        # Later per-token lookups are served from the cache.
+        batches = len(fb.backend.batches)
+        assert fb(_tk('Vexmoor')) == ('vexmoor', 2)
+        assert len(fb.backend.batches) == batches
+
+    def test_prefetch_persists_across_processes(self, cache_dir,
+                                                fallback_cls):
+        fb = fallback_cls(british=True)
+        g2p = SimpleNamespace(lexicon=_FakeLexicon(), fallback=fb)
+        espeak_cache.prefetch(g2p, 'Zorblax')
+        (path,) = cache_dir.glob('gb-default-espeak1.51.json')
+        assert json.loads(path.read_text(encoding='utf-8')) == {
+            'Zorblax': 'zorblax'}
+        espeak_cache._caches.clear()
+        fresh = fallback_cls(british=True)
+        assert fresh(_tk('Zorblax')) == ('zorblax', 2)
+        assert fresh.backend.batches == []
+
+    def test_cache_keyed_by_british_and_version(self, cache_dir,
+                                                fallback_cls):
+        fallback_cls()(_tk('Zorblax'))
+        other = fallback_cls(british=True)
+        other(_tk('Zorblax'))
+        v2 = fallback_cls(version='2.0')
+        v2(_tk('Zorblax'))
+        assert other.backend.batches == [['Zorblax']]
+        assert v2.backend.batches == [['Zorblax']]
+
+    def test_prefetch_without_fallback(self, cache_dir):
+        g2p = SimpleNamespace(lexicon=_FakeLexicon(), fallback=None)
+        assert espeak_cache.prefetch(g2p, 'Zorblax') == 0
+        assert espeak_cache.prefetch(None, 'Zorblax') == 0
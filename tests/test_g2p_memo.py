@@ -0,0 +1,89 @@
+from types import SimpleNamespace
+
+import pytest
+
+from autiobooks import g2p_memo
+
+
+def _tk(text, tag='NN', **underscore):
+    fields = dict(alias=None, currency=None, stress=None, is_head=True,
+                  num_flags=None)
+    fields.update(underscore)
+    return SimpleNamespace(text=text, tag=tag, _=SimpleNamespace(**fields))
+
+
+def _ctx(future_vowel=None, future_to=False):
+    return SimpleNamespace(future_vowel=future_vowel, future_to=future_to)
+
+
+@pytest.fixture
+def lexicon_cls():
+    """A stand-in for misaki.en.Lexicon that counts real lookups."""
+    class FakeLexicon:
+        def __init__(self):
+            self.calls = 0
+
+        def __call__(self, tk, ctx):
+            self.calls += 1
+            return f'{tk.text}/{tk.tag}/{ctx.future_vowel}', 4
+
+    g2p_memo.memoize_lexicon(FakeLexicon)
+    g2p_memo.reset_stats()
+    yield FakeLexicon
+    g2p_memo.set_enabled(True)
+
+
+class TestWordMemo:
+    """Tests for memoize_lexicon / WordMemo."""
+
+    def test_repeat_lookup_hits(self, lexicon_cls):
+        lex = lexicon_cls()
+        for _ in range(3):
+            assert lex(_tk('read'), _ctx()) == ('read/NN/None', 4)
+        assert lex.calls == 1
+        assert g2p_memo.stats() == {'hits': 2, 'misses': 1,
+                                    'hit_rate': 2 / 3}
+
+    @pytest.mark.parametrize('tk, ctx', [
+        (_tk('read', tag='VBD'), _ctx()),
+        (_tk('read', stress=1), _ctx()),
+        (_tk('read', currency='$'), _ctx()),
+        (_tk('read', is_head=False), _ctx()),
+        (_tk('read', alias='red'), _ctx()),
+        (_tk('read'), _ctx(future_vowel=True)),
+        (_tk('read'), _ctx(future_to=True)),
+    ])
+    def test_key_covers_every_input(self, lexicon_cls, tk, ctx):
+        lex = lexicon_cls()
+        lex(_tk('read'), _ctx())
+        lex(tk, ctx)
+        assert lex.calls == 2
+
+    def test_memo_is_per_lexicon(self, lexicon_cls):
+        a, b = lexicon_cls(), lexicon_cls()
+        a(_tk('read'), _ctx())
+        b(_tk('read'), _ctx())
+        assert (a.calls, b.calls) == (1, 1)
+
+    def test_disabled_bypasses_memo(self, lexicon_cls):
+        g2p_memo.set_enabled(False)
+        lex = lexicon_cls()
+        lex(_tk('read'), _ctx())
+        lex(_tk('read'), _ctx())
+        assert lex.calls == 2
+        assert g2p_memo.stats()['hits'] == 0
+
+    def test_patch_is_idempotent(self, lexicon_cls):
+        patched = lexicon_cls.__call__
+        g2p_memo.memoize_lexicon(lexicon_cls)
+        assert lexicon_cls.__call__ is patched
+
+    def test_lru_bound(self):
+        memo = g2p_memo.WordMemo(maxsize=2)
+        memo.get('a', lambda: 1)
+        memo.get('b', lambda: 2)
+        memo.get('a', lambda: 0)  # refresh 'a'
+        memo.get('c', lambda: 3)  # evicts 'b'
+        assert len(memo) == 2
+        assert memo.get('a', lambda: 'recomputed') == 1
+        assert memo.get('b', lambda: 'recomputed') == 'recomputed'
@@ -0,0 +1,109 @@
+import json
+
+import pytest
+
+from autiobooks import lexicon_store
+
+
+@pytest.fixture
+def store_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(lexicon_store, 'LEXICON_DIR', tmp_path)
+    return tmp_path
+
+
+_TABLE = {
+    'cat': 'kˈæt',
+    'Paris': 'pˈɛɹəs',
+    'used': {'DEFAULT': 'jˈuzd', 'VBD': 'jˈust', 'None': None},
+    'naïve': 'nˈIiv',
+    'a': 'ˈA',
+}
+
+
+class TestMappedLexicon:
+    """Tests for build + MappedLexicon."""
+
+    def _open(self, tmp_path, table=_TABLE):
+        path = tmp_path / 't.lex'
+        digest = lexicon_store.source_digest(b'src')
+        lexicon_store.build(path, table, digest)
+        return lexicon_store.MappedLexicon(path, digest)
+
+    def test_roundtrip(self, tmp_path):
+        lex = self._open(tmp_path)
+        assert dict(lex.items()) == _TABLE
+        assert len(lex) == len(_TABLE)
+
+    def test_lookups(self, tmp_path):
+        lex = self._open(tmp_path)
+        assert lex['naïve'] == 'nˈIiv'
+        assert lex.get('used')['VBD'] == 'jˈust'
+        assert 'Paris' in lex
+        assert 'paris' not in lex
+        assert lex.get('dog') is None
+        assert lex.get(None, 'x') == 'x'
+        with pytest.raises(KeyError):
+            lex['dog']
+
+    def test_tagged_values_are_copies(self, tmp_path):
+        lex = self._open(tmp_path)
+        lex['used']['DEFAULT'] = 'junk'
+        assert lex['used']['DEFAULT'] == 'jˈuzd'
+
+    def test_empty_table(self, tmp_path):
+        lex = self._open(tmp_path, {})
+        assert len(lex) == 0
+        assert 'cat' not in lex
+
+    def test_rejects_other_source(self, tmp_path):
+        self._open(tmp_path)
+        with pytest.raises(lexicon_store.LexiconStoreError):
+            lexicon_store.MappedLexicon(
+                tmp_path / 't.lex', lexicon_store.source_digest(b'other'))
+
+    def test_rejects_truncated_file(self, tmp_path):
+        self._open(tmp_path)
+        path = tmp_path / 't.lex'
+        path.write_bytes(path.read_bytes()[:-3])
+        with pytest.raises(lexicon_store.LexiconStoreError):
+            lexicon_store.MappedLexicon(path)
+
+
+class TestValidate:
+
+    def test_phoneme_outside_vocab(self):
+        with pytest.raises(lexicon_store.LexiconStoreError):
+            lexicon_store.validate({'cat': 'kæt'}, frozenset('kt'))
+
+    def test_tagged_entry_needs_default(self):
+        with pytest.raises(lexicon_store.LexiconStoreError):
+            lexicon_store.validate({'used': {'VBD': 'a'}}, frozenset('a'))
+
+
+class TestOpenTable:
+    """open_table against the bundled misaki data."""
+
+    def test_matches_grown_json(self, store_dir):
+        from importlib.resources import files
+        raw = files('autiobooks.misaki.data').joinpath(
+            'us_silver.json').read_bytes()
+        expected = lexicon_store.grow_dictionary(json.loads(raw))
+        lex = lexicon_store.open_table('autiobooks.misaki.data',
+                                       'us_silver.json')
+        assert len(lex) == len(expected)
+        for word in ('the', 'The', 'Abacus', 'abacus', 'zebra'):
+            assert lex.get(word) == expected.get(word)
+        assert len(list(store_dir.glob('us_silver-*.lex'))) == 1
+
+    def test_reuses_built_store(self, store_dir, monkeypatch):
+        lexicon_store.open_table('autiobooks.misaki.data', 'us_silver.json')
+        monkeypatch.setattr(lexicon_store, 'build', None)
+        lex = lexicon_store.open_table('autiobooks.misaki.data',
+                                       'us_silver.json')
+        assert len(lex) > 0
+
+    def test_validation_upgrades_unvalidated_store(self, store_dir):
+        lexicon_store.open_table('autiobooks.misaki.data', 'us_silver.json')
+        with pytest.raises(lexicon_store.LexiconStoreError):
+            lexicon_store.open_table('autiobooks.misaki.data',
+                                     'us_silver.json', frozenset('x'))
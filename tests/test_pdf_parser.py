@@ -0,0 +1,290 @@
+import pytest
+
+pytest.importorskip('pypdf')
+
+from autiobooks import pdf_parser  # noqa: E402
+
+
+def make_pdf(path, pages):
+    """Write a minimal PDF with one page of Helvetica text per entry of
+    `pages` (a list of lists of lines)."""
+    objects = [b'<< /Type /Catalog /Pages 2 0 R >>', None,
+               b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for lines in pages:
+        ops = [b'BT /F1 12 Tf 14 TL 72 720 Td']
+        for line in lines:
+            escaped = (line.replace('\\', '\\\\').replace('(', '\\(')
+                       .replace(')', '\\)'))
+            ops.append(b'(' + escaped.encode('latin-1') + b') Tj T*')
+        ops.append(b'ET')
+        stream = b'\n'.join(ops)
+        objects.append(b'<< /Length %d >>\nstream\n' % len(stream)
+                       + stream + b'\nendstream')
+        objects.append(b'<< /Type /Page /Parent 2 0 R '
+                       b'/MediaBox [0 0 612 792] '
+                       b'/Resources << /Font << /F1 3 0 R >> >> '
+                       b'/Contents %d 0 R >>' % (len(objects)))
+        kids.append(len(objects))
+    objects[1] = (b'<< /Type /Pages /Kids [%s] /Count %d >>'
+                  % (b' '.join(b'%d 0 R' % k for k in kids), len(kids)))
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for i, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % i + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    for off in offsets:
+        out += b'%010d 00000 n \n' % off
+    out += (b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n'
+            % (len(objects) + 1, xref))
+    path.write_bytes(bytes(out))
+    return path
+
+
+@pytest.fixture
+def pdf_path(tmp_path):
+    pages = [[f'Page {i} opens here.', f'Some text for page {i}.']
+             for i in range(1, 13)]
+    return make_pdf(tmp_path / 'book.pdf', pages)
+
+
+@pytest.fixture
+def book_cache_dir(tmp_path, monkeypatch):
+    from autiobooks import book_cache
+    monkeypatch.setattr(book_cache, 'BOOK_CACHE_DIR', tmp_path / 'books')
+    return tmp_path / 'books'
+
+
+class TestPdfBook:
+    """Tests for get_pdf_book without an outline."""
+
+    def test_page_groups(self, pdf_path):
+        book, chapters, cover = pdf_parser.get_pdf_book(pdf_path, False)
+        assert [ch.display_title for ch in chapters] == ['Pages 1-10',
+                                                         'Pages 11-12']
+        assert [ch.page_range for ch in chapters] == [(1, 10), (11, 12)]
+        assert 'Some text for page 3.' in chapters[0].extracted_text
+        assert book.toc == []
+        assert cover is None
+
+    def test_process_pool_matches_serial(self, tmp_path, monkeypatch):
+        path = make_pdf(tmp_path / 'long.pdf',
+                        [[f'Line on page {i}.'] for i in range(40)])
+        _, expected, _ = pdf_parser.get_pdf_book(path, False)
+        monkeypatch.setattr(pdf_parser, 'PARALLEL_MIN_PAGES', 0)
+        monkeypatch.setattr(pdf_parser.os, 'cpu_count', lambda: 2)
+        _, chapters, _ = pdf_parser.get_pdf_book(path, False)
+        assert ([(ch.file_name, ch.extracted_text) for ch in chapters]
+                == [(ch.file_name, ch.extracted_text) for ch in expected])
+
+
+class TestLazyPdfBook:
+    """Tests for get_pdf_book(lazy=True)."""
+
+    @pytest.fixture
+    def extracted(self, monkeypatch):
+        """Record the pages extract_text() is called on."""
+        from pypdf import PageObject
+        seen = []
+        real = PageObject.extract_text
+
+        def extract_text(page, *args, **kwargs):
+            seen.append(page.page_number)
+            return real(page, *args, **kwargs)
+        monkeypatch.setattr(PageObject, 'extract_text', extract_text)
+        return seen
+
+    def test_no_text_until_read(self, pdf_path, extracted):
+        _, chapters, _ = pdf_parser.get_pdf_book(pdf_path, False, lazy=True)
+        assert [ch.page_range for ch in chapters] == [(1, 10), (11, 12)]
+        assert extracted == []
+        assert 'Some text for page 12.' in chapters[1].extracted_text
+        # A book no longer than the running-line sample is extracted
+        # whole on the first read, once.
+        assert extracted == list(range(12))
+        chapters[0].extracted_text
+        assert extracted == list(range(12))
+
+    def test_same_text_as_eager(self, pdf_path):
+        _, eager, _ = pdf_parser.get_pdf_book(pdf_path, False)
+        _, lazy, _ = pdf_parser.get_pdf_book(pdf_path, False, lazy=True)
+        assert ([ch.extracted_text for ch in lazy]
+                == [ch.extracted_text for ch in eager])
+
+    def test_list_chapters_page_ranges(self, pdf_path, book_cache_dir,
+                                       extracted, capsys):
+        from autiobooks import cli
+        cli.main(['list-chapters', '--page-ranges', str(pdf_path)])
+        out = capsys.readouterr().out.splitlines()
+        assert out == ['    1. [     pp. 1-10] Pages 1-10',
+                       '    2. [    pp. 11-12] Pages 11-12']
+        assert extracted == []
+
+
+class TestPdfBookCache:
+    """Tests for get_pdf_book_cached."""
+
+    def test_hit_does_not_open_pdf(self, pdf_path, book_cache_dir,
+                                   monkeypatch):
+        _, first, _ = pdf_parser.get_pdf_book_cached(pdf_path, False)
+
+        def no_reader(*args, **kwargs):
+            raise AssertionError('PDF re-parsed')
+        monkeypatch.setattr(pdf_parser, 'PdfReader', no_reader)
+        book, chapters, cover = pdf_parser.get_pdf_book_cached(pdf_path,
+                                                               False)
+        assert ([(ch.display_title, ch.extracted_text) for ch in chapters]
+                == [(ch.display_title, ch.extracted_text) for ch in first])
+        assert chapters[1].word_count == len(
+            chapters[1].extracted_text.split())
+        assert chapters[1].page_range == (11, 12)
+        assert book.toc == []
+        assert cover is None
+
+    def test_matches_uncached_parse(self, pdf_path, book_cache_dir):
+        _, expected, _ = pdf_parser.get_pdf_book(pdf_path, False)
+        for _ in range(2):
+            _, chapters, _ = pdf_parser.get_pdf_book_cached(pdf_path, False)
+            assert ([(ch.file_name, ch.extracted_text) for ch in chapters]
+                    == [(ch.file_name, ch.extracted_text)
+                        for ch in expected])
+
+
+_PROSE = ('the wind rose over the grey water and every sail on the '
+          'harbour strained at its ropes while gulls wheeled above the '
+          'masts crying into the rain').split()
+
+
+def _prose(n, k):
+    return ' '.join(_PROSE[(n * 7 + k * 3 + j) % len(_PROSE)]
+                    for j in range(9)).capitalize() + '.'
+
+
+def _book_pages(n):
+    """Pages with alternating running heads and a page-number footer."""
+    pages = []
+    for i in range(1, n + 1):
+        head = (f'{i}   THE LONG VOYAGE' if i % 2 == 0
+                else f'Chapter Two: Storms   {i}')
+        pages.append('\n'.join([head] + [_prose(i, k) for k in range(4)]
+                               + [f'Page {i} of {n}']))
+    return pages
+
+
+class TestRunningLines:
+    """Tests for running header/footer removal."""
+
+    def test_headers_and_footers_removed(self):
+        stripped = pdf_parser._strip_running_lines(_book_pages(8))
+        assert stripped[2] == '\n'.join(_prose(3, k) for k in range(4))
+        assert all('VOYAGE' not in p and 'Storms' not in p
+                   and 'of 8' not in p for p in stripped)
+
+    def test_sparse_repeats_kept(self):
+        pages = [f'Line {i} of prose.\nMore prose {i}.' for i in range(30)]
+        for i in (0, 14, 29):
+            pages[i] = '"Yes."\n' + pages[i]
+        stripped = pdf_parser._strip_running_lines(pages)
+        assert stripped[14].startswith('"Yes."')
+
+    def test_too_few_pages_kept(self):
+        pages = _book_pages(8)[:2]
+        assert pdf_parser._strip_running_lines(pages) == pages
+
+    def test_templated_pages_kept(self):
+        pages = [f'Item {i}\nPrice {i}.00' for i in range(10)]
+        assert pdf_parser._strip_running_lines(pages) == pages
+
+    def test_missing_text(self):
+        assert pdf_parser._strip_running_lines([None, '', 'x']) == [
+            '', '', 'x']
+
+    @pytest.mark.parametrize('heads', [
+        ['CHAPTER'],
+        ['Chapter {i}'],
+        ['Part {i}', 'Chapter {i}'],
+    ])
+    def test_repeated_chapter_heads_kept(self, heads):
+        """One-page chapters all open with the same kind of head; the heads
+        stay while the running footer goes."""
+        pages = []
+        for i in range(1, 9):
+            lines = [h.format(i=i) for h in heads]
+            pages.append('\n'.join(lines + [_prose(i, k) for k in range(4)]
+                                   + [f'Page {i} of 8']))
+        stripped = pdf_parser._strip_running_lines(pages)
+        for page, expected in zip(stripped, pages):
+            assert page == expected.rsplit('\n', 1)[0]
+
+    @pytest.mark.parametrize('line, is_head', [
+        ('chapter', True),
+        ('chapter #', True),
+        ('chapter twenty-one.', True),
+        ('part iv', True),
+        ('book three:', True),
+        ('chapter two: storms #', False),
+        ('part of the sea', False),
+    ])
+    def test_chapter_head_pattern(self, line, is_head):
+        assert bool(pdf_parser._RE_CHAPTER_HEAD.fullmatch(line)) == is_head
+
+    def test_removed_before_chapters_assembled(self, tmp_path):
+        path = make_pdf(tmp_path / 'heads.pdf',
+                        [p.split('\n') for p in _book_pages(12)])
+        for lazy in (False, True):
+            _, chapters, _ = pdf_parser.get_pdf_book(path, False, lazy=lazy)
+            text = chapters[0].extracted_text
+            assert text.startswith(_prose(1, 0) + '\n')
+            assert _prose(9, 3) in text
+            assert 'VOYAGE' not in text and 'Storms' not in text
+            assert 'Page 3 of 12' not in text
+
+    def test_lazy_chapter_uses_whole_book(self, tmp_path):
+        """A two-page chapter has too few pages to detect running lines on
+        its own; a lazy load still strips them, like an eager one."""
+        path = make_pdf(tmp_path / 'heads.pdf',
+                        [p.split('\n') for p in _book_pages(12)])
+        _, eager, _ = pdf_parser.get_pdf_book(path, False)
+        _, lazy, _ = pdf_parser.get_pdf_book(path, False, lazy=True)
+        assert lazy[1].page_range == (11, 12)
+        assert lazy[1].extracted_text == eager[1].extracted_text
+        assert 'VOYAGE' not in lazy[1].extracted_text
+
+    def test_lazy_long_book_extracts_per_chapter(self, tmp_path,
+                                                 monkeypatch):
+        """Past the sample size, a lazy read extracts a sample of the book
+        once and then only its own chapter's pages."""
+        from pypdf import PageObject
+        path = make_pdf(tmp_path / 'long.pdf',
+                        [p.split('\n') for p in _book_pages(60)])
+        _, eager, _ = pdf_parser.get_pdf_book(path, False)
+        seen = []
+        real = PageObject.extract_text
+
+        def extract_text(page, *args, **kwargs):
+            seen.append(page.page_number)
+            return real(page, *args, **kwargs)
+        monkeypatch.setattr(PageObject, 'extract_text', extract_text)
+
+        _, lazy, _ = pdf_parser.get_pdf_book(path, False, lazy=True)
+        sample = pdf_parser._running_line_sample(list(range(60)))
+        assert len(sample) < 60
+        assert lazy[2].page_range == (21, 30)
+        assert lazy[2].extracted_text == eager[2].extracted_text
+        assert 'VOYAGE' not in lazy[2].extracted_text
+        assert sorted(seen) == sorted(set(sample) | set(range(20, 30)))
+        seen.clear()
+        assert lazy[3].extracted_text == eager[3].extracted_text
+        assert sorted(seen) == sorted(set(range(30, 40)) - set(sample))
+
+    def test_running_line_sample(self):
+        pages = list(range(100))
+        sample = pdf_parser._running_line_sample(pages)
+        size = pdf_parser.RUNNING_LINE_SAMPLE_PAGES
+        assert len(sample) == pdf_parser.RUNNING_LINE_SAMPLE_RUNS * size
+        assert sample[:size] == list(range(size))
+        assert sample[-size:] == list(range(100 - size, 100))
+        assert len(set(sample)) == len(sample)
+        assert pdf_parser._running_line_sample(pages[:10]) == pages[:10]
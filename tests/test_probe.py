@@ -0,0 +1,88 @@
+import json
+import os
+import subprocess
+
+import pytest
+
+from autiobooks import probe
+
+
+_OUTPUT = {
+    'format': {'duration': '12.500000', 'tags': {'title': 'A Book'}},
+    'streams': [{'codec_type': 'audio', 'codec_name': 'aac'}],
+    'chapters': [{'id': 0, 'time_base': '1/1000', 'start': 0,
+                  'end': 12500, 'tags': {'title': 'One'}}],
+}
+
+
+@pytest.fixture
+def ffprobe(monkeypatch):
+    """Stand in for ffprobe and record the files it was run on."""
+    runs = []
+
+    def run(args, **kwargs):
+        runs.append(args[-1])
+        if not os.path.getsize(args[-1]):
+            raise subprocess.CalledProcessError(1, args)
+        return subprocess.CompletedProcess(args, 0, json.dumps(_OUTPUT), '')
+    monkeypatch.setattr(probe.subprocess, 'run', run)
+    probe.clear()
+    yield runs
+    probe.clear()
+
+
+@pytest.fixture
+def media(tmp_path):
+    path = tmp_path / 'book.m4b'
+    path.write_bytes(b'\0' * 64)
+    return str(path)
+
+
+class TestProbe:
+    """Tests for the shared, cached ffprobe."""
+
+    def test_one_ffprobe_answers_everything(self, ffprobe, media):
+        assert probe.duration(media) == 12.5
+        assert probe.chapters(media)[0]['tags']['title'] == 'One'
+        assert probe.format_tags(media) == {'title': 'A Book'}
+        assert probe.probe(media)['streams'][0]['codec_name'] == 'aac'
+        assert ffprobe == [media]
+
+    def test_changed_file_is_probed_again(self, ffprobe, media):
+        probe.duration(media)
+        with open(media, 'ab') as f:
+            f.write(b'\0')
+        probe.duration(media)
+        assert ffprobe == [media, media]
+
+    def test_failures_raise_and_are_not_cached(self, ffprobe, tmp_path):
+        empty = tmp_path / 'empty.m4b'
+        empty.write_bytes(b'')
+        for _ in range(2):
+            with pytest.raises(subprocess.CalledProcessError):
+                probe.duration(str(empty))
+        assert len(ffprobe) == 2
+        with pytest.raises(FileNotFoundError):
+            probe.duration(str(tmp_path / 'missing.m4b'))
+
+    def test_prefetch_fills_the_cache(self, ffprobe, tmp_path):
+        paths = []
+        for i in range(5):
+            path = tmp_path / f'ch{i}.m4a'
+            path.write_bytes(b'\0' * (i + 1))
+            paths.append(str(path))
+        probe.prefetch(paths + paths)
+        assert sorted(ffprobe) == sorted(paths)
+        assert [probe.duration(p) for p in paths] == [12.5] * 5
+        assert len(ffprobe) == 5
+
+    def test_cache_is_bounded(self, ffprobe, tmp_path, monkeypatch):
+        monkeypatch.setattr(probe, 'CACHE_MAX_ENTRIES', 2)
+        paths = []
+        for i in range(3):
+            path = tmp_path / f'ch{i}.m4a'
+            path.write_bytes(b'\0')
+            paths.append(str(path))
+            probe.probe(str(path))
+        probe.probe(paths[0])
+        assert ffprobe == paths + [paths[0]]
@@ -11,6 +11,7 @@ from autiobooks.text_processing import (
     apply_acronym_spellout,
     apply_contextual_overrides,
     normalize_text,
+    split_chapter_text,
     _to_misaki_phonemes,
     HETERONYMS,
     FRACTION_REPLACEMENTS,
@@ -1095,3 +1096,470 @@ class TestMisakiPreprocessWhitespacePatch:
                 continue
             assert t.phonemes != 'bˈWd', (
                 f"IPA leaked onto non-target token text={t.text!r}")
+
+
+# ---------------------------------------------------------------------------
+# 14. resolve_context — one spaCy parse drives every English context pass
+# ---------------------------------------------------------------------------
+
+class _FakeToken:
+    def __init__(self, text, idx, i, tag='NN', pos='NOUN'):
+        self.text = text
+        self.lower_ = text.lower()
+        self.idx = idx
+        self.i = i
+        self.tag_ = tag
+        self.pos_ = pos
+        self.dep_ = ''
+        self.is_punct = not any(c.isalnum() for c in text)
+
+
+class _FakeDoc(list):
+    """Just enough of spacy.tokens.Doc for the rule functions."""
+
+
+class _CountingNlp:
+    """Regex-tokenizing stand-in for the spaCy pipeline that counts parses.
+
+    Tags are fixed per word so results don't depend on a real model:
+    `'s`/`'d` followed by a VBG/VBN token exercise both contraction branches.
+    """
+
+    _TAGS = {'going': ('VBG', 'VERB'), 'gone': ('VBN', 'VERB'),
+             'left': ('VBD', 'VERB')}
+
+    def __init__(self):
+        self.calls = 0
+        self.pipe_calls = []
+        self.parsed = []
+
+    def pipe(self, texts, batch_size=1000, n_process=1):
+        self.pipe_calls.append((batch_size, n_process))
+        for text in texts:
+            yield self(text)
+
+    def __call__(self, text):
+        import re
+        self.calls += 1
+        self.parsed.append(text)
+        doc = _FakeDoc()
+        for m in re.finditer(r"'[sd]\b|\w+|[^\w\s]", text):
+            tag, pos = self._TAGS.get(m.group().lower(), ('NN', 'NOUN'))
+            doc.append(_FakeToken(m.group(), m.start(), len(doc), tag, pos))
+        return doc
+
+
+@pytest.fixture
+def counting_nlp(monkeypatch):
+    from autiobooks import text_processing
+    nlp = _CountingNlp()
+    monkeypatch.setattr(text_processing, 'HAS_SPACY', True)
+    monkeypatch.setattr(text_processing, '_get_nlp', lambda: nlp,
+                        raising=False)
+    return nlp
+
+
+class TestResolveContextSingleParse:
+    """normalize_text parses the text once, not once per English pass, and
+    the single-parse result matches running the passes in sequence."""
+
+    TEXT = ("She will lead the team. He was poisoned by lead paint.\n"
+            "He's going home. She'd gone. He took a bow after the show.")
+
+    def test_normalize_text_parses_once(self, counting_nlp):
+        normalize_text(self.TEXT, lang="en-us")
+        assert counting_nlp.calls == 1
+
+    def test_lines_parsed_together(self, counting_nlp):
+        # The tagger reads context across line breaks, so the text is one
+        # Doc rather than one per paragraph.
+        normalize_text("She will lead.\n\n\n   \nHe's going.", lang="en-us")
+        assert counting_nlp.parsed == ["She will lead.\n\n\n   \nHe's going."]
+
+    def test_sequential_passes_parse_three_times(self, counting_nlp):
+        from autiobooks.text_processing import (
+            resolve_heteronyms, resolve_contractions)
+        resolve_contractions(resolve_heteronyms(
+            apply_contextual_overrides(self.TEXT)))
+        assert counting_nlp.calls == 3
+
+    def test_matches_sequential_passes(self, counting_nlp):
+        from autiobooks.text_processing import (
+            resolve_context, resolve_heteronyms, resolve_contractions)
+        sequential = resolve_contractions(resolve_heteronyms(
+            apply_contextual_overrides(self.TEXT)))
+        combined = resolve_context(self.TEXT)
+        assert combined == sequential
+        assert "[lead](/lˈɛd/) paint" in combined
+        assert "leed the team" in combined
+        assert "He is going" in combined
+        assert "She had gone" in combined
+
+    def test_flags_select_rule_families(self, counting_nlp):
+        from autiobooks.text_processing import resolve_context
+        only_contractions = resolve_context(self.TEXT, heteronyms=False)
+        assert "leed" not in only_contractions
+        assert "He is going" in only_contractions
+        only_heteronyms = resolve_context(self.TEXT, contractions=False)
+        assert "leed the team" in only_heteronyms
+        assert "He's going" in only_heteronyms
+
+    def test_no_parse_when_both_disabled(self, counting_nlp):
+        normalize_text(self.TEXT, lang="en-us", heteronyms=False,
+                       contractions=False)
+        assert counting_nlp.calls == 0
+
+
+# ---------------------------------------------------------------------------
+# 15. normalize_book — whole-book nlp.pipe batching
+# ---------------------------------------------------------------------------
+
+class TestNormalizeBook:
+    """normalize_book must match normalize_text chapter for chapter."""
+
+    CHAPTERS = [
+        "Mr. Smith will lead the team.\nHe's going home.",
+        "",
+        "Chapter IV\n\n\nShe'd gone. He was poisoned by lead paint.",
+        "She took a bow after the show & left.",
+    ]
+
+    def test_matches_normalize_text(self, counting_nlp):
+        from autiobooks.text_processing import normalize_book
+        expected = [normalize_text(t, lang="en-us") for t in self.CHAPTERS]
+        assert normalize_book(self.CHAPTERS, lang="en-us") == expected
+
+    def test_matches_without_spacy(self):
+        from autiobooks.text_processing import normalize_book
+        expected = [normalize_text(t, lang="en-us") for t in self.CHAPTERS]
+        assert normalize_book(self.CHAPTERS, lang="en-us") == expected
+
+    def test_matches_non_english(self, counting_nlp):
+        from autiobooks.text_processing import normalize_book
+        expected = [normalize_text(t, lang="fr-fr") for t in self.CHAPTERS]
+        assert normalize_book(self.CHAPTERS, lang="fr-fr") == expected
+        assert counting_nlp.calls == 0
+
+    def test_single_pipe_stream(self, counting_nlp):
+        from autiobooks.text_processing import normalize_book
+        normalize_book(self.CHAPTERS, lang="en-us", batch_size=8,
+                       n_process=2)
+        assert counting_nlp.pipe_calls == [(8, 2)]
+        # Each chapter with a trigger word is parsed whole; the empty one
+        # is not parsed at all.
+        assert counting_nlp.calls == 3
+        assert counting_nlp.parsed[1] == (
+            "Chapter 4\n\n\nShe'd gone. He was poisoned by lead paint.")
+
+    def test_passes_user_rules_through(self, counting_nlp):
+        from autiobooks.text_processing import normalize_book
+        subs = [{"find": "Mister", "replace": "Mr"}]
+        result = normalize_book(["Mr. Smith"], lang="en-us",
+                                substitutions=subs)
+        assert result == [normalize_text("Mr. Smith", lang="en-us",
+                                         substitutions=subs)]
+
+
+# ---------------------------------------------------------------------------
+# 16. Candidate pre-filter — texts without trigger words skip spaCy
+# ---------------------------------------------------------------------------
+
+class TestCandidatePrefilter:
+    """Only texts that could produce an edit reach the parser."""
+
+    def test_plain_text_not_parsed(self, counting_nlp):
+        text = ("The dog barked loudly at the mailman.\n"
+                "Rain tapped at the window.")
+        assert normalize_text(text, lang="en-us") == text
+        assert counting_nlp.calls == 0
+
+    def test_one_trigger_parses_whole_text(self, counting_nlp):
+        text = ("The dog barked loudly at the mailman.\n"
+                "Rain tapped at the window.\n"
+                "She will lead the team.")
+        result = normalize_text(text, lang="en-us")
+        assert counting_nlp.parsed == [text]
+        assert "leed the team" in result
+
+    def test_trigger_words_match_case_insensitively(self, counting_nlp):
+        normalize_text("LEAD the way.", lang="en-us")
+        normalize_text("Took a Bow.", lang="en-us")
+        assert counting_nlp.calls == 2
+
+    def test_trigger_inside_longer_word_ignored(self, counting_nlp):
+        # `row` inside `throw`/`arrow`/`tomorrow`, `lead` inside
+        # `Misleading` — none can be a standalone spaCy token.
+        normalize_text("He will throw the arrow tomorrow.\nMisleading.",
+                       lang="en-us")
+        assert counting_nlp.calls == 0
+
+    def test_trigger_next_to_digits_or_punctuation(self, counting_nlp):
+        for text in ("5row", "(content)", "lead-lined"):
+            normalize_text(text, lang="en-us")
+        assert counting_nlp.calls == 3
+
+    def test_contractions_only_look_for_apostrophes(self, counting_nlp):
+        normalize_text("She will lead.", lang="en-us", heteronyms=False)
+        assert counting_nlp.calls == 0
+        normalize_text("He's going.", lang="en-us", heteronyms=False)
+        assert counting_nlp.calls == 1
+
+    def test_heteronyms_only_ignore_apostrophes(self, counting_nlp):
+        normalize_text("He's going.", lang="en-us", contractions=False)
+        assert counting_nlp.calls == 0
+        normalize_text("She will lead.", lang="en-us", contractions=False)
+        assert counting_nlp.calls == 1
+
+
+# ---------------------------------------------------------------------------
+# 17. Compiled normalization plan — equivalence with the per-entry passes
+# ---------------------------------------------------------------------------
+
+def _naive_normalize_unicode(text, is_english=True):
+    """The original one-replace-per-entry normalize_unicode."""
+    import re
+    from autiobooks.text_processing import UNICODE_REPLACEMENTS
+    for char, replacement in UNICODE_REPLACEMENTS.items():
+        text = text.replace(char, replacement)
+    if is_english:
+        for char, replacement in FRACTION_REPLACEMENTS.items():
+            text = text.replace(char, ' ' + replacement + ' ')
+        text = text.replace('⁄', '/')
+        text = re.sub(r'(\d)–(\d)', r'\1 to \2', text)
+    text = text.replace('–', ' - ')
+    if is_english:
+        text = strip_diacritics(text)
+    return text
+
+
+def _naive_expand_abbreviations(text):
+    """The original one-re.sub-per-entry expand_abbreviations."""
+    import re
+    from autiobooks.text_processing import ABBREVIATIONS
+    for abbr, expansion in ABBREVIATIONS.items():
+        pattern = re.escape(abbr)
+        text = re.sub(r'(?<!\w)' + pattern + r'(?=\s|$)', expansion, text)
+    return text
+
+
+def _naive_clean_special_characters(text, is_english=True):
+    """The original one-replace-per-entry clean_special_characters."""
+    import re
+    from autiobooks.text_processing import (
+        SYMBOL_REPLACEMENTS, URL_PATTERN, EMAIL_PATTERN)
+    text = URL_PATTERN.sub('', text)
+    text = EMAIL_PATTERN.sub('', text)
+    text = re.sub(r'[\*\-\~\=\_\#\+\.]{3,}', '', text)
+    for symbol, replacement in SYMBOL_REPLACEMENTS.items():
+        text = text.replace(symbol, replacement if is_english else ' ')
+    text = re.sub(r' {2,}', ' ', text)
+    text = re.sub(r'\n{3,}', '\n\n', text)
+    return '\n'.join(line.rstrip() for line in text.split('\n'))
+
+
+def _fuzz_corpus(n=300, seed=1234):
+    """Random strings built from every table key plus the characters the
+    surrounding regexes care about (digits, dashes, whitespace, dots)."""
+    import random
+    from autiobooks.text_processing import (
+        ABBREVIATIONS, SYMBOL_REPLACEMENTS, UNICODE_REPLACEMENTS)
+    pieces = (list(ABBREVIATIONS) + list(SYMBOL_REPLACEMENTS)
+              + list(UNICODE_REPLACEMENTS) + list(FRACTION_REPLACEMENTS)
+              + ['–', '⁄', '1', '2', 'x', 'é', 'St', '.', '...',
+                 ' ', ' ', '  ', '\n', '\n\n\n', 'word', 'e', 'g', '-',
+                 '***', 'Chapter IV'])
+    rng = random.Random(seed)
+    return [''.join(rng.choice(pieces) for _ in range(rng.randint(1, 40)))
+            for _ in range(n)]
+
+
+class TestCompiledNormalizationPlan:
+    """The translate tables and the abbreviation alternation must behave
+    exactly like the per-entry loops they replace."""
+
+    @pytest.mark.parametrize("is_english", [True, False])
+    def test_normalize_unicode_equivalent(self, is_english):
+        for text in _fuzz_corpus():
+            assert normalize_unicode(text, is_english=is_english) == \
+                _naive_normalize_unicode(text, is_english=is_english), text
+
+    def test_expand_abbreviations_equivalent(self):
+        for text in _fuzz_corpus():
+            assert expand_abbreviations(text) == \
+                _naive_expand_abbreviations(text), text
+
+    @pytest.mark.parametrize("is_english", [True, False])
+    def test_clean_special_characters_equivalent(self, is_english):
+        for text in _fuzz_corpus():
+            assert clean_special_characters(text, is_english=is_english) == \
+                _naive_clean_special_characters(text, is_english), text
+
+    def test_superscript_digit_then_en_dash(self):
+        # Superscripts become digits before the en-dash rule runs.
+        assert normalize_unicode("²–3") == "2 to 3"
+
+    def test_abbreviation_at_end_of_text(self):
+        assert expand_abbreviations("Ask Dr.") == "Ask Doctor"
+
+
+# ---------------------------------------------------------------------------
+# 18. Compiled substitution / phoneme-override matcher
+# ---------------------------------------------------------------------------
+
+def _naive_apply_substitutions(text, substitutions):
+    """The original one-re.sub-per-entry apply_substitutions."""
+    import re
+    for sub in substitutions:
+        find = sub.get('find', '')
+        replace = sub.get('replace', '')
+        if not find:
+            continue
+        if sub.get('whole_word', True):
+            pattern = r'\b' + re.escape(find) + r'\b'
+        else:
+            pattern = re.escape(find)
+        flags = 0 if sub.get('case_sensitive', False) else re.IGNORECASE
+        text = re.sub(pattern, lambda _m, r=replace: r, text, flags=flags)
+    return text
+
+
+def _naive_apply_phoneme_overrides(text, overrides):
+    """The original one-re.sub-per-entry apply_phoneme_overrides."""
+    import re
+    for entry in overrides:
+        if not entry.get('enabled', True):
+            continue
+        word = entry.get('word', '')
+        ipa = entry.get('ipa', '')
+        if not word or not ipa:
+            continue
+        ipa = _to_misaki_phonemes(ipa)
+        if re.search(r'\W', word):
+            pattern = re.escape(word)
+        else:
+            pattern = r'\b' + re.escape(word) + r'\b'
+        flags = 0 if entry.get('case_sensitive', False) else re.IGNORECASE
+        text = re.sub(pattern, lambda m, p=ipa: f'[{m.group(0)}](/{p}/)',
+                      text, flags=flags)
+    return text
+
+
+# Words chosen to collide: case variants, words that are each other's
+# output, substrings, punctuation, and the characters re.IGNORECASE folds
+# to ASCII (İ ı ſ K).
+_RULE_WORDS = ['cat', 'Cat', 'CAT', 'dog', 'hot', 'dog', 'hotdog', 'a',
+               'O\'Brien', 'Anne-Marie', 'café', 'CAFÉ', 'ſun', 'sun',
+               'Kelvin', 'kelvin', 'İt', 'it', 'x_1', '42', 'th', '']
+
+
+def _fuzz_rules(rng, n):
+    return [{'find': rng.choice(_RULE_WORDS),
+             'replace': rng.choice(_RULE_WORDS + ['\\1', '\\g<0>']),
+             'whole_word': rng.random() < 0.8,
+             'case_sensitive': rng.random() < 0.3}
+            for _ in range(n)]
+
+
+def _fuzz_rule_text(rng):
+    pieces = _RULE_WORDS + [' ', ' ', '. ', '\n', '-', "'", 'SUN', 'ıt']
+    return ''.join(rng.choice(pieces) for _ in range(rng.randint(1, 30)))
+
+
+class TestCompiledRuleMatcher:
+    """The compiled matchers must give exactly the sequential per-entry
+    result, including entries that feed into each other."""
+
+    def test_substitutions_equivalent(self):
+        import random
+        rng = random.Random(99)
+        for _ in range(300):
+            rules = _fuzz_rules(rng, rng.randint(1, 12))
+            text = _fuzz_rule_text(rng)
+            assert apply_substitutions(text, rules) == \
+                _naive_apply_substitutions(text, rules), (text, rules)
+
+    def test_phoneme_overrides_equivalent(self):
+        import random
+        rng = random.Random(7)
+        for _ in range(300):
+            overrides = [{'word': r['find'],
+                          'ipa': rng.choice(['kæt', 'eɪ', 'dog', 'sun', '']),
+                          'case_sensitive': r['case_sensitive'],
+                          'enabled': rng.random() < 0.9}
+                         for r in _fuzz_rules(rng, rng.randint(1, 8))]
+            text = _fuzz_rule_text(rng)
+            assert apply_phoneme_overrides(text, overrides) == \
+                _naive_apply_phoneme_overrides(text, overrides), \
+                (text, overrides)
+
+    def test_chained_substitutions_apply_in_order(self):
+        subs = [{'find': 'cat', 'replace': 'dog'},
+                {'find': 'dog', 'replace': 'wolf'}]
+        assert apply_substitutions("cat and dog", subs) == "wolf and wolf"
+
+    def test_large_dictionary(self):
+        overrides = [{'word': f'name{i}', 'ipa': 'nAm'} for i in range(3000)]
+        text = "Ask name1234 and NAME7 about name99999."
+        assert apply_phoneme_overrides(text, overrides) == (
+            "Ask [name1234](/nAm/) and [NAME7](/nAm/) about name99999.")
+
+    def test_matcher_compiled_once_per_list(self):
+        from autiobooks import text_processing as tp
+        subs = [{'find': 'zzq', 'replace': 'quux'}]
+        apply_substitutions("zzq", subs)
+        before = tp._substitution_matcher.cache_info()
+        apply_substitutions("zzq zzq", [dict(s) for s in subs])
+        after = tp._substitution_matcher.cache_info()
+        assert after.hits == before.hits + 1
+        assert after.misses == before.misses
+
+
+class TestSplitChapterText:
+    """Tests for split_chapter_text."""
+
+    PARAGRAPH = ' '.join(['word'] * 49) + ' end.'
+
+    def test_short_chapter_unchanged(self):
+        text = f'Title\n{self.PARAGRAPH}'
+        assert split_chapter_text(text, 1000) == [text]
+        assert split_chapter_text(text, 0) == [text]
+        assert split_chapter_text(text, None) == [text]
+
+    def test_cuts_between_paragraphs(self):
+        text = '\n'.join([self.PARAGRAPH] * 10)
+        parts = split_chapter_text(text, 120)
+        assert [len(p.split()) for p in parts] == [100, 100, 100, 100, 100]
+        assert '\n'.join(parts) == text
+
+    def test_parts_are_balanced(self):
+        text = '\n'.join([self.PARAGRAPH] * 5)
+        # Greedy filling would give 200 + 50 words.
+        assert [len(p.split()) for p in split_chapter_text(text, 200)] == [
+            150, 100]
+
+    def test_never_cuts_inside_a_wrapped_sentence(self):
+        # Hard-wrapped lines, as PDF pages give them.
+        sentence = ('this sentence runs on\nacross several short lines\n'
+                    'before it finally ends.')
+        text = '\n'.join([sentence] * 20)
+        for part in split_chapter_text(text, 40):
+            assert part.startswith('this') and part.endswith('ends.')
+
+    def test_cuts_before_headings(self):
+        lines = ['Part One'] + ['no stop here'] * 10
+        lines += ['Part Two'] + ['no stop here'] * 10
+        parts = split_chapter_text('\n'.join(lines), 40)
+        assert [p.split('\n')[0] for p in parts] == ['Part One', 'Part Two']
+
+    def test_long_paragraph_cut_between_sentences(self):
+        text = ' '.join(['One two three four.'] * 10)
+        parts = split_chapter_text(text, 10)
+        assert all(len(p.split()) <= 10 for p in parts)
+        assert all(p.endswith('four.') for p in parts)
+        assert ' '.join(parts) == text
+
+    def test_every_part_within_budget(self):
+        text = ' '.join(['word'] * 95)
+        parts = split_chapter_text(text, 20)
+        assert all(len(p.split()) <= 20 for p in parts)
+        assert ' '.join(parts) == text